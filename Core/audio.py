@@ -0,0 +1,322 @@
+"""Synthesized speech as PCM audio, and playing it with word timing.
+
+The live pyttsx3 engine reports each word as it speaks it. Audio rendered
+ahead of time (see :mod:`Core.synthesis`) has to carry that information
+itself, so an :class:`AudioClip` holds the PCM frames together with, for each
+word of its text, the character offset and length and the frame at which the
+word starts. Sinks play a clip and call back as each word's frame is reached,
+which is what keeps the GUI highlight in step with rendered speech.
+
+A sink's ``play(clip, on_word, more)`` blocks until the clip has played
+(True) or ``stop`` was called (False). ``more`` says another clip may follow
+at once, and a later ``flush`` says that none did. :class:`StreamSink`
+keeps one output stream open for every clip and crossfades each into the
+next, so chunk boundaries have neither a click nor a device-open gap;
+:class:`NullSink` is the same sink writing a WAV file, for headless use and
+tests.
+"""
+import os
+import tempfile
+import threading
+import time
+import wave
+from array import array
+from dataclasses import dataclass, field
+
+from Core.text_processing import WORD
+
+# Overlap between consecutive clips on a stream.
+DEFAULT_CROSSFADE = 0.005
+# Audio handed to the output stream per write.
+BLOCK_SECONDS = 0.02
+# Output stream sample formats by sample width (8-bit WAV is unsigned).
+STREAM_DTYPES = {1: 'uint8', 2: 'int16', 3: 'int24', 4: 'int32'}
+
+
+@dataclass
+class AudioClip:
+    """PCM audio for one utterance plus where each of its words starts."""
+
+    frames: bytes
+    sample_rate: int
+    channels: int = 1
+    sample_width: int = 2
+    word_starts: array = field(default_factory=lambda: array('I'))  # character offsets
+    word_lengths: array = field(default_factory=lambda: array('I'))
+    word_frames: array = field(default_factory=lambda: array('I'))  # first frame of each word
+
+    @property
+    def frame_size(self):
+        return self.channels * self.sample_width
+
+    @property
+    def frame_count(self):
+        return len(self.frames) // self.frame_size
+
+    @property
+    def duration(self):
+        return self.frame_count / self.sample_rate
+
+
+def estimate_word_frames(text, frame_count):
+    """Word offsets, lengths and start frames for ``text`` spread over the audio.
+
+    Engines do not report word times when rendering to a file, so each word
+    is placed in proportion to its character offset, which is close enough
+    for highlighting and is refined by the post-processing stages that know
+    where the pauses are.
+    """
+    starts, lengths, frames = array('I'), array('I'), array('I')
+    total = max(len(text), 1)
+    for match in WORD.finditer(text):
+        starts.append(match.start())
+        lengths.append(match.end() - match.start())
+        frames.append(min(frame_count * match.start() // total, max(frame_count - 1, 0)))
+    return starts, lengths, frames
+
+
+def read_wav(path, text=None):
+    """Load a PCM WAV file; with ``text``, estimate where its words start."""
+    with wave.open(path, "rb") as handle:
+        clip = AudioClip(handle.readframes(handle.getnframes()), handle.getframerate(),
+                         handle.getnchannels(), handle.getsampwidth())
+    if text is not None:
+        clip.word_starts, clip.word_lengths, clip.word_frames = estimate_word_frames(
+            text, clip.frame_count)
+    return clip
+
+
+def write_wav(path, clip):
+    """Write ``clip``'s PCM to a WAV file (word timing is not stored)."""
+    with wave.open(path, "wb") as handle:
+        handle.setnchannels(clip.channels)
+        handle.setsampwidth(clip.sample_width)
+        handle.setframerate(clip.sample_rate)
+        handle.writeframes(clip.frames)
+
+
+def pace_words(clip, on_word, stopped, started):
+    """Call ``on_word(index)`` as playback reaches each word, then wait out the clip.
+
+    ``started`` is the ``time.monotonic()`` at which the clip's first frame
+    was played. Returns False as soon as ``stopped`` is set.
+    """
+    for index, frame in enumerate(clip.word_frames):
+        delay = started + frame / clip.sample_rate - time.monotonic()
+        if delay > 0 and stopped.wait(delay):
+            return False
+        if stopped.is_set():
+            return False
+        if on_word is not None:
+            on_word(index)
+    remaining = started + clip.duration - time.monotonic()
+    return not (stopped.wait(remaining) if remaining > 0 else stopped.is_set())
+
+
+class WinsoundSink:
+    """Plays clips through the Windows sound API, one clip at a time.
+
+    ``play`` blocks until the clip has finished (True) or :meth:`stop` was
+    called (False), calling ``on_word(index)`` as each word is reached.
+    """
+
+    def __init__(self):
+        import winsound
+        self._winsound = winsound
+        self._stopped = threading.Event()
+
+    def play(self, clip, on_word=None, more=False):
+        self._stopped.clear()
+        handle, path = tempfile.mkstemp(suffix=".wav")
+        os.close(handle)
+        try:
+            write_wav(path, clip)
+            self._winsound.PlaySound(
+                path, self._winsound.SND_FILENAME | self._winsound.SND_ASYNC
+                | self._winsound.SND_NODEFAULT)
+            return pace_words(clip, on_word, self._stopped, time.monotonic())
+        finally:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass  # still held by the sound API; the temp dir is cleaned eventually
+
+    def flush(self):
+        pass  # nothing is held back
+
+    def stop(self):
+        self._stopped.set()
+        self._winsound.PlaySound(None, self._winsound.SND_PURGE)
+
+
+def crossfade(tail, head, channels):
+    """16-bit PCM fading from ``tail`` into ``head`` (equal lengths in bytes)."""
+    fading_out, fading_in = array('h'), array('h')
+    fading_out.frombytes(tail)
+    fading_in.frombytes(head)
+    frames = len(fading_in) // channels
+    mixed = array('h', (
+        int(a + (b - a) * ((i // channels + 0.5) / frames))
+        for i, (a, b) in enumerate(zip(fading_out, fading_in))))
+    return mixed.tobytes()
+
+
+def _sounddevice_stream(sample_rate, channels, sample_width):
+    import sounddevice
+    stream = sounddevice.RawOutputStream(
+        samplerate=sample_rate, channels=channels, dtype=STREAM_DTYPES[sample_width])
+    stream.start()
+    return stream
+
+
+class StreamSink:
+    """Plays clips back to back on one long-lived output stream.
+
+    The stream (``open_stream(sample_rate, channels, sample_width)``, a
+    sounddevice stream by default) is opened for the first clip and only
+    reopened if the audio format changes, so there is no per-clip device
+    set-up. PCM is written straight from the clip in ``memoryview`` slices.
+    When ``play`` is told ``more`` clips may follow, the last ``crossfade``
+    seconds are held back and mixed into the start of the next clip (or
+    written by :meth:`flush`), so the boundary neither clicks nor gaps.
+    Words are reported as the block holding their first frame is written;
+    writes block while the stream's buffer is full, which keeps that in step
+    with what is heard.
+    """
+
+    def __init__(self, open_stream=None, crossfade=DEFAULT_CROSSFADE, block_seconds=BLOCK_SECONDS):
+        if open_stream is None:
+            import sounddevice  # fail here, not on the first clip, if it is missing
+            open_stream = _sounddevice_stream
+        self._open_stream = open_stream
+        self.crossfade = crossfade
+        self.block_seconds = block_seconds
+        self.opened = 0  # output streams opened so far
+        self._stream = None
+        self._format = None
+        self._tail = b""
+        self._stopped = threading.Event()
+
+    def play(self, clip, on_word=None, more=False):
+        self._stopped.clear()
+        audio_format = (clip.sample_rate, clip.channels, clip.sample_width)
+        if audio_format != self._format:
+            self.close()
+            self._stream = self._open_stream(*audio_format)
+            self._format = audio_format
+            self.opened += 1
+        size = clip.frame_size
+        fade = 0
+        if clip.sample_width == 2:
+            fade = min(int(clip.sample_rate * self.crossfade), clip.frame_count // 2)
+        end = clip.frame_count - (fade if more else 0)
+        words = clip.word_frames
+        reported = 0
+        block = max(int(clip.sample_rate * self.block_seconds), 1)
+        with memoryview(clip.frames) as view:
+            position = 0
+            tail, self._tail = self._tail, b""
+            if tail:
+                overlap = min(len(tail) // size, fade, end)
+                self._stream.write(tail[:len(tail) - overlap * size])
+                if overlap:
+                    while reported < len(words) and words[reported] < overlap:
+                        self._report(on_word, reported)
+                        reported += 1
+                    self._stream.write(crossfade(tail[len(tail) - overlap * size:],
+                                                 view[:overlap * size], clip.channels))
+                    position = overlap
+            while position < end:
+                if self._stopped.is_set():
+                    return False
+                stop_at = min(position + block, end)
+                while reported < len(words) and words[reported] < stop_at:
+                    self._report(on_word, reported)
+                    reported += 1
+                self._stream.write(view[position * size:stop_at * size])
+                position = stop_at
+            if self._stopped.is_set():
+                return False
+            while reported < len(words):
+                self._report(on_word, reported)
+                reported += 1
+            if more:
+                self._tail = bytes(view[end * size:])
+        return True
+
+    @staticmethod
+    def _report(on_word, index):
+        if on_word is not None:
+            on_word(index)
+
+    def flush(self):
+        """Play out the audio held back for a crossfade."""
+        tail, self._tail = self._tail, b""
+        if tail and self._stream is not None:
+            self._stream.write(tail)
+
+    def stop(self):
+        self._stopped.set()
+        self._tail = b""
+
+    def close(self):
+        """Play out any held-back audio and close the stream."""
+        if self._stream is None:
+            return
+        self.flush()
+        self._stream.close()
+        self._stream = None
+        self._format = None
+
+
+class _WavStream:
+    """An output "stream" appending to a WAV file, optionally at real-time pace."""
+
+    def __init__(self, path, sample_rate, channels, sample_width, realtime):
+        self._wav = wave.open(path, "wb")
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(sample_width)
+        self._wav.setframerate(sample_rate)
+        self._bytes_per_second = sample_rate * channels * sample_width
+        self._realtime = realtime
+        self.writes = 0
+
+    def write(self, data):
+        self._wav.writeframes(data)
+        self.writes += 1
+        if self._realtime:
+            time.sleep(len(data) / self._bytes_per_second)
+
+    def close(self):
+        self._wav.close()
+
+
+class NullSink(StreamSink):
+    """A :class:`StreamSink` whose stream is the WAV file at ``path``.
+
+    For running rendered speech headless and testing it: everything played
+    is in the file (rewritten if the audio format changes) once the sink is
+    closed. With ``realtime``, writes take as long as playing them would.
+    """
+
+    def __init__(self, path, crossfade=DEFAULT_CROSSFADE, realtime=False):
+        self.path = path
+        self.realtime = realtime
+        super().__init__(open_stream=self._open_file, crossfade=crossfade)
+
+    def _open_file(self, sample_rate, channels, sample_width):
+        return _WavStream(self.path, sample_rate, channels, sample_width, self.realtime)
+
+
+def default_sink():
+    """The audio output available on this platform, or ``None``.
+
+    A streaming sink when the optional ``sounddevice`` package is installed,
+    else the Windows sound API, else nothing.
+    """
+    for sink in (StreamSink, WinsoundSink):
+        try:
+            return sink()
+        except ImportError:
+            pass
+    return None
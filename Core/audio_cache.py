@@ -0,0 +1,95 @@
+"""On-disk cache of rendered speech, addressed by what was rendered.
+
+Agents repeat the same short phrases ("Build succeeded", "Waiting for
+review") and readers replay the same passages, yet every repeat used to be
+synthesized again. Each rendered :class:`~Core.audio.AudioClip` is stored
+here under a hash of the spoken text, voice id, rate and engine version, so a
+repeat is read back from disk and starts playing at once.
+
+Each entry is a small header followed by the word timing arrays and the raw
+PCM. Storage is a :class:`~Core.file_cache.FileCache`, as for
+:class:`~Core.document_cache.DocumentCache`: entries are written atomically,
+loaded through a memory map and evicted least-recently-used once the
+directory grows past ``max_bytes``.
+"""
+import hashlib
+import os
+import struct
+from array import array
+
+from Core.audio import AudioClip
+from Core.file_cache import FileCache
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".speedreader", "cache", "audio")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+FORMAT_VERSION = 1
+SUFFIX = ".srclip"
+# magic, format version, sample rate, channels, sample width, word count,
+# PCM byte size; then word starts, lengths and frames, then the PCM.
+HEADER = struct.Struct("<4sIIHHQQ")
+MAGIC = b"SRAC"
+
+
+class AudioCache(FileCache):
+    """A directory of rendered clips with an LRU size cap.
+
+    Safe to share between threads. A corrupt or unreadable entry is treated
+    as a miss; ``hits`` and ``misses`` count :meth:`get` results.
+    """
+
+    suffix = SUFFIX
+    name = "Audio cache"
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(directory, max_bytes)
+
+    @staticmethod
+    def key(text, voice, rate, engine_version):
+        """Cache key for ``text`` rendered by ``engine_version`` in ``voice`` at ``rate``."""
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=20)
+        for part in (voice or "", str(int(rate)), engine_version):
+            digest.update(b"\0" + part.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Load the clip stored under ``key``, or ``None`` if absent or unreadable."""
+        clip = self._load(key, _decode)
+        if clip is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return clip
+
+    def put(self, key, clip):
+        """Store ``clip`` under ``key`` atomically, then enforce the cap."""
+        self._store(key, _encode(clip))
+
+
+def _encode(clip):
+    words = [clip.word_starts.tobytes(), clip.word_lengths.tobytes(), clip.word_frames.tobytes()]
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, clip.sample_rate, clip.channels,
+                         clip.sample_width, len(clip.word_starts), len(clip.frames))
+    return b"".join([header] + words + [bytes(clip.frames)])
+
+
+def _decode(buffer):
+    if len(buffer) < HEADER.size:
+        raise ValueError("truncated cache entry")
+    magic, version, sample_rate, channels, sample_width, count, size = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("not an audio cache entry")
+    pos = HEADER.size
+    if pos + 3 * 4 * count + size != len(buffer):
+        raise ValueError("truncated cache entry")
+    words = []
+    with memoryview(buffer) as view:
+        for _ in range(3):
+            values = array('I')
+            # Released before returning so the caller can close the mmap.
+            with view[pos:pos + 4 * count] as part:
+                values.frombytes(part)
+            words.append(values)
+            pos += 4 * count
+        frames = bytes(view[pos:pos + size])
+    return AudioClip(frames, sample_rate, channels, sample_width, *words)
@@ -0,0 +1,148 @@
+"""NumPy post-processing of rendered speech.
+
+Stages here take an :class:`~Core.audio.AudioClip` and return a new one, and
+always move the clip's word start frames along with the audio, so word
+highlighting stays in step with what is heard. They run in the rendering
+worker processes, after synthesis and before the clip is cached.
+
+:func:`time_stretch` speeds speech up without raising its pitch, by WSOLA
+(waveform-similarity overlap-add): the output is built from overlapping,
+windowed frames of the input, read ``factor`` times faster than they are
+written, each frame shifted by up to half a hop to the position that best
+continues the waveform written so far. That keeps the pitch periods intact,
+where resampling would turn the voice into a chipmunk.
+
+:func:`compress_silence` shortens the pauses the engine leaves between
+sentences and after commas: frames whose energy is far below the loudest one
+are silent, and each silent run longer than ``max_pause`` loses its middle.
+Speech itself is untouched, so it gets faster to listen to without sounding
+faster.
+"""
+import numpy as np
+
+from Core.audio import AudioClip
+
+# Length of the WSOLA frames; long enough to hold a few pitch periods.
+FRAME_SECONDS = 0.02
+# Candidate offsets are compared on every Nth sample: a quarter of the work
+# for practically the same choice at speech frequencies.
+CORRELATION_STEP = 4
+# Energy frames for silence detection.
+ENERGY_FRAME_SECONDS = 0.01
+# Frames this far below the loudest frame count as silence.
+DEFAULT_SILENCE_DB = -40.0
+
+
+def _samples(clip):
+    """The clip's PCM as a ``(frames, channels)`` int16 view (no copy)."""
+    if clip.sample_width != 2:
+        raise ValueError("Only 16-bit audio can be processed, not {}-bit.".format(
+            8 * clip.sample_width))
+    return np.frombuffer(clip.frames, dtype=np.int16).reshape(-1, clip.channels)
+
+
+def _with_samples(clip, samples, word_frames):
+    """A copy of ``clip`` holding ``samples`` with its words at ``word_frames``."""
+    count = len(samples)
+    frames = np.clip(np.rint(word_frames), 0, max(count - 1, 0)).astype(np.uint32)
+    if samples.dtype != np.int16:
+        samples = np.clip(np.rint(samples), -32768, 32767).astype(np.int16)
+    processed = AudioClip(samples.tobytes(), clip.sample_rate, clip.channels, clip.sample_width,
+                          clip.word_starts, clip.word_lengths)
+    processed.word_frames.frombytes(frames.tobytes())
+    return processed
+
+
+def time_stretch(clip, factor):
+    """``clip`` played ``factor`` times faster at the same pitch (WSOLA).
+
+    ``factor`` 2.0 halves the duration. Word start frames are mapped through
+    the same input-to-output positions the frames were taken from.
+    """
+    if factor <= 0:
+        raise ValueError("Time-stretch factor must be positive, not {}.".format(factor))
+    samples = _samples(clip).astype(np.float32)
+    length = len(samples)
+    frame = max(int(clip.sample_rate * FRAME_SECONDS) // 2 * 2, 4)
+    out_hop = frame // 2
+    if abs(factor - 1.0) < 1e-3 or length < 2 * frame:
+        return _with_samples(clip, samples, np.asarray(clip.word_frames, dtype=np.float64))
+    in_hop = out_hop * factor
+    tolerance = out_hop // 2
+    # Mono mix-down used only to choose where each frame is read from.
+    guide = samples.mean(axis=1)
+    padded = np.concatenate([np.zeros(tolerance, np.float32), guide,
+                             np.zeros(frame + tolerance + out_hop, np.float32)])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, frame)[:, ::CORRELATION_STEP]
+
+    count = int(np.ceil(length / factor / out_hop)) + 1
+    starts = np.empty(count, dtype=np.int64)  # input frame start per output frame
+    starts[0] = 0
+    for m in range(1, count):
+        # The frame that would naturally follow the previous one, against
+        # every candidate within the tolerance of where this one should start.
+        natural = windows[starts[m - 1] + out_hop + tolerance]
+        centre = min(int(round(m * in_hop)), length)
+        candidates = windows[centre:centre + 2 * tolerance + 1]
+        starts[m] = centre - tolerance + int(np.argmax(candidates @ natural))
+    starts = np.clip(starts, 0, max(length - 1, 0))
+
+    # Overlap-add with a periodic Hann window, which sums to one at 50% overlap.
+    window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(frame) / frame)).astype(np.float32)
+    source = np.concatenate([samples, np.zeros((frame, clip.channels), np.float32)])
+    gather = source[starts[:, None] + np.arange(frame)] * window[None, :, None]
+    output = np.zeros(((count - 1) * out_hop + frame, clip.channels), np.float32)
+    for phase in range(2):
+        # Frames of one phase do not overlap, so each phase adds in one go.
+        chosen = gather[phase::2]
+        span = chosen.shape[0] * frame
+        output[phase * out_hop:phase * out_hop + span] += chosen.reshape(span, clip.channels)
+    output = output[:int(round(length / factor))]
+
+    # Input position each output frame started from, for moving the words.
+    out_positions = np.arange(count) * out_hop
+    word_frames = np.interp(np.asarray(clip.word_frames, dtype=np.float64),
+                            np.maximum.accumulate(starts), out_positions)
+    return _with_samples(clip, output, word_frames)
+
+
+def compress_silence(clip, max_pause, threshold_db=DEFAULT_SILENCE_DB):
+    """``clip`` with every pause longer than ``max_pause`` seconds cut down to it.
+
+    Half of the kept pause stays at each end of the silent run, so speech
+    still fades in and out naturally. Word start frames move back by the
+    audio removed before them.
+    """
+    samples = _samples(clip)
+    size = max(int(clip.sample_rate * ENERGY_FRAME_SECONDS), 1)
+    count = len(samples) // size
+    keep = int(clip.sample_rate * max_pause)
+    if count == 0:
+        return clip
+    # Mean square energy of each frame of the mono mix-down.
+    guide = samples[:count * size].astype(np.float32).mean(axis=1)
+    energy = np.square(guide).reshape(count, size).mean(axis=1)
+    silent = energy <= energy.max() * 10 ** (threshold_db / 10)
+    # Silent runs as [start, end) frame pairs.
+    edges = np.flatnonzero(np.diff(np.concatenate([[False], silent, [False]]).astype(np.int8)))
+    run_starts, run_ends = edges[0::2] * size, edges[1::2] * size
+    # A run reaching the end of the frames also covers the partial frame after it.
+    run_ends[run_ends == count * size] = len(samples)
+    long_runs = run_ends - run_starts > keep
+    cut_starts = run_starts[long_runs] + keep // 2
+    cut_ends = run_ends[long_runs] - (keep - keep // 2)
+    if not len(cut_starts):
+        return clip
+    # Mark each cut's edges (+1 in, -1 out); a running sum is 1 inside cuts.
+    marks = np.zeros(len(samples) + 1, dtype=np.int32)
+    np.add.at(marks, cut_starts, 1)
+    np.add.at(marks, cut_ends, -1)
+    kept = np.cumsum(marks[:-1]) == 0
+
+    words = np.asarray(clip.word_frames, dtype=np.int64)
+    removed_before = np.concatenate([[0], np.cumsum(cut_ends - cut_starts)])
+    index = np.searchsorted(cut_starts, words, side="right")
+    inside = np.minimum(words - np.where(index > 0, cut_starts[index - 1], 0),
+                        np.where(index > 0, (cut_ends - cut_starts)[index - 1], 0))
+    moved = words - removed_before[np.maximum(index - 1, 0)] - np.maximum(inside, 0)
+    return _with_samples(clip, samples[kept], moved)
@@ -0,0 +1,97 @@
+"""Per-document reading positions, so a long book can be resumed later.
+
+A bookmark is stored against a hash of the document's content (not its file
+name), so the same text pasted again or the same file opened from another
+folder resumes where it was left, and an edited text starts over. The stored
+position is a character offset into the *source* text rather than into the
+normalized spoken text, so it survives changes to the normalization rules or
+the lexicon.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+DEFAULT_BOOKMARKS_PATH = os.path.join(os.path.expanduser("~"), ".speedreader", "bookmarks.json")
+# Oldest bookmarks are dropped beyond this many documents.
+MAX_BOOKMARKS = 500
+HASH_BLOCK = 1024 * 1024
+
+
+def text_key(text):
+    """Bookmark key for a pasted text."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def file_key(path):
+    """Bookmark key for a document file, hashed a block at a time."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BookmarkStore:
+    """A small JSON file of ``key -> {offset, title, updated}`` entries.
+
+    Thread-safe; every change is written through atomically (temp file +
+    rename), which is cheap because bookmarks are only saved when reading
+    stops, not on every word. An unreadable file is treated as empty.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or DEFAULT_BOOKMARKS_PATH
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as handle:
+                    data = json.load(handle)
+                self._entries = data if isinstance(data, dict) else {}
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key):
+        """The saved source offset for ``key``, or ``None``."""
+        with self._lock:
+            entry = self._load().get(key)
+        return int(entry["offset"]) if entry else None
+
+    def set(self, key, offset, title=None):
+        """Remember ``offset`` (a source character offset) for ``key``."""
+        with self._lock:
+            entries = self._load()
+            entries[key] = {"offset": int(offset), "title": title, "updated": time.time()}
+            if len(entries) > MAX_BOOKMARKS:
+                for old in sorted(entries, key=lambda k: entries[k].get("updated", 0))[
+                        :len(entries) - MAX_BOOKMARKS]:
+                    del entries[old]
+            self._write(entries)
+
+    def clear(self, key):
+        """Forget ``key`` (e.g. once the document has been read to the end)."""
+        with self._lock:
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    def _write(self, entries):
+        try:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "w", encoding="utf-8") as temp:
+                    json.dump(entries, temp)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            print(f"Saving bookmarks failed: {e}")
@@ -2,6 +2,12 @@ import json
 import os
 from dataclasses import dataclass, field
 
+from Core.audio_cache import DEFAULT_MAX_BYTES as DEFAULT_AUDIO_MAX_BYTES, AudioCache
+from Core.document_cache import DEFAULT_MAX_BYTES, DEFAULT_MIN_CHARS, DocumentCache
+from Core.lexicon import LEXICON_FILENAME, lexicon_file
+from Core.speak_service import DEFAULT_MAX_QUEUE
+from Core.text_processing import DEFAULT_RULES, NormalizationRule, RuleSet
+
 
 @dataclass
 class McpConfig:
@@ -13,6 +19,21 @@ class McpConfig:
     voices: list = field(default_factory=list)  # enabled voice IDs; empty = all
     pause_when_mic_in_use: bool = False  # skip agent speech while the mic is in use
     pause_media_when_speaking: bool = False # pause media playback when speaking
+    max_queue_depth: int = DEFAULT_MAX_QUEUE  # utterances one agent may have waiting
+
+
+@dataclass
+class SpeechConfig:
+    """How the app synthesizes its own reading."""
+
+    # "live" (pyttsx3 in real time), "rendered" (pyttsx3 in a process pool)
+    # or "espeak" (libespeak-ng in the process pool, Linux)
+    backend: str = "live"
+    workers: int = 0  # rendering processes; 0 = one per core, less one
+    look_ahead: int = 2  # chunks rendered ahead of the one playing
+    look_ahead_mb: int = 64  # memory rendered-ahead audio may hold
+    max_native_rate: int = 450  # faster rates are rendered at this and time-stretched; 0 = never
+    max_pause_ms: int = 250  # longer pauses in rendered speech are shortened; 0 = never
 
 
 def load_mcp_config(path=None):
@@ -44,9 +65,129 @@ def load_mcp_config(path=None):
             cfg.pause_when_mic_in_use = bool(mcp["pause_when_mic_in_use"])
         if "pause_media_when_speaking" in mcp:
             cfg.pause_media_when_speaking = bool(mcp["pause_media_when_speaking"])
+        if "max_queue_depth" in mcp:
+            cfg.max_queue_depth = int(mcp["max_queue_depth"])
+    return cfg
+
+
+def load_speech_config(path=None):
+    """Load the speech backend settings from the ``speech`` section.
+
+    Same lookup order as :func:`load_mcp_config`; live speech by default:
+        {"speech": {"backend": "rendered", "workers": 3, "look_ahead": 2,
+                    "look_ahead_mb": 64, "max_native_rate": 450, "max_pause_ms": 250}}
+    Raises ``ValueError`` for an unknown backend.
+    """
+    path = path or os.environ.get("SPEEDREADER_CONFIG") or "config.json"
+    cfg = SpeechConfig()
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle) or {}
+        section = data.get("speech") or {}
+        if "backend" in section:
+            cfg.backend = str(section["backend"])
+        if "workers" in section:
+            cfg.workers = int(section["workers"])
+        if "look_ahead" in section:
+            cfg.look_ahead = max(int(section["look_ahead"]), 0)
+        if "look_ahead_mb" in section:
+            cfg.look_ahead_mb = int(section["look_ahead_mb"])
+        if "max_native_rate" in section:
+            cfg.max_native_rate = int(section["max_native_rate"])
+        if "max_pause_ms" in section:
+            cfg.max_pause_ms = max(int(section["max_pause_ms"]), 0)
+    if cfg.backend not in ("live", "rendered", "espeak"):
+        raise ValueError("Unknown speech backend {!r}; use 'live', 'rendered' or 'espeak'.".format(
+            cfg.backend))
     return cfg
 
 
+def load_normalization_rules(path=None):
+    """Load the text-normalization rules from the config file as a ``RuleSet``.
+
+    Same lookup order as :func:`load_mcp_config`. Rules are listed in order
+    under ``normalization.rules``; each has a ``pattern`` plus optional
+    ``name``, ``replace``, ``flags`` and ``enabled``:
+        {"normalization": {"rules": [
+            {"name": "url", "pattern": "http\\S+", "replace": " [URL] "}]}}
+    Without that section the built-in URL rule is used. The user lexicon
+    (``lexicon.json`` next to the config file) is always attached; it may be
+    absent. Raises ``ValueError`` for a rule with an invalid pattern.
+    """
+    path = path or os.environ.get("SPEEDREADER_CONFIG") or "config.json"
+    lexicon = lexicon_file(os.path.join(os.path.dirname(path), LEXICON_FILENAME))
+    entries = None
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle) or {}
+        entries = (data.get("normalization") or {}).get("rules")
+    if not isinstance(entries, list):
+        return RuleSet(DEFAULT_RULES.rules, lexicon=lexicon)
+    rules = []
+    for index, entry in enumerate(entries):
+        rules.append(NormalizationRule(
+            name=str(entry.get("name", "rule{}".format(index))),
+            pattern=str(entry["pattern"]),
+            replace=str(entry.get("replace") or ""),
+            flags=str(entry.get("flags", "")),
+            enabled=bool(entry.get("enabled", True)),
+        ))
+    return RuleSet(rules, lexicon=lexicon)
+
+
+def load_document_cache(path=None):
+    """Build the preprocessed-document cache from the config file.
+
+    Same lookup order as :func:`load_mcp_config`. Settings live under
+    ``document_cache``; all are optional and the cache is on by default:
+        {"document_cache": {"enabled": true, "directory": "D:/cache",
+                            "max_mb": 256, "min_chars": 2000}}
+    Returns a :class:`~Core.document_cache.DocumentCache`, or ``None`` when
+    disabled.
+    """
+    path = path or os.environ.get("SPEEDREADER_CONFIG") or "config.json"
+    section = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle) or {}
+        section = data.get("document_cache") or {}
+    if not section.get("enabled", True):
+        return None
+    kwargs = {}
+    if section.get("directory"):
+        kwargs["directory"] = os.path.expanduser(str(section["directory"]))
+    max_mb = section.get("max_mb")
+    return DocumentCache(
+        max_bytes=int(max_mb * 1024 * 1024) if max_mb is not None else DEFAULT_MAX_BYTES,
+        min_chars=int(section.get("min_chars", DEFAULT_MIN_CHARS)), **kwargs)
+
+
+def load_audio_cache(path=None):
+    """Build the rendered-speech audio cache from the config file.
+
+    Same lookup order as :func:`load_mcp_config`. Settings live under
+    ``audio_cache``; all are optional and the cache is on by default (it is
+    only used by the ``rendered`` speech backend):
+        {"audio_cache": {"enabled": true, "directory": "D:/cache", "max_mb": 512}}
+    Returns an :class:`~Core.audio_cache.AudioCache`, or ``None`` when disabled.
+    """
+    path = path or os.environ.get("SPEEDREADER_CONFIG") or "config.json"
+    section = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle) or {}
+        section = data.get("audio_cache") or {}
+    if not section.get("enabled", True):
+        return None
+    kwargs = {}
+    if section.get("directory"):
+        kwargs["directory"] = os.path.expanduser(str(section["directory"]))
+    max_mb = section.get("max_mb")
+    return AudioCache(
+        max_bytes=int(max_mb * 1024 * 1024) if max_mb is not None else DEFAULT_AUDIO_MAX_BYTES,
+        **kwargs)
+
+
 def _update_mcp_config(updates, path=None):
     """Merge ``updates`` into the ``mcp`` section of the config file.
 
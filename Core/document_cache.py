@@ -0,0 +1,149 @@
+"""On-disk cache of preprocessed (normalized + indexed) documents.
+
+Normalizing a textbook, mapping its offsets and indexing its words and
+sentences is repeated from scratch every time it is read. This cache stores
+the result of that work in one file per document, keyed by a hash of the
+source text and the :attr:`~Core.text_processing.RuleSet.version` of the
+rules used, so an edited rule or lexicon entry never serves stale text.
+
+Each entry is a small header followed by the spoken text (UTF-8) and the raw
+bytes of the ``array`` buffers behind :class:`~Core.text_processing.OffsetMap`
+and :class:`~Core.text_processing.WordIndex`. Loading memory-maps the file and
+copies each section straight into its array, so a reopened book costs a file
+read rather than a regex pass per rule plus two indexing passes. Storage is
+a :class:`~Core.file_cache.FileCache`: entries are written atomically (temp
+file + rename) and evicted least-recently-used once the directory grows past
+``max_bytes``.
+"""
+import hashlib
+import os
+import struct
+from array import array
+from dataclasses import dataclass
+
+from Core.file_cache import FileCache
+from Core.text_processing import (
+    DEFAULT_RULES, OffsetMap, WordIndex, normalize_with_offsets)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".speedreader", "cache", "documents")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Shorter texts (most agent utterances) are cheaper to normalize than to
+# hash, write and read back.
+DEFAULT_MIN_CHARS = 2000
+
+FORMAT_VERSION = 1
+SUFFIX = ".srdoc"
+# magic, format version, source length, spoken length, then the byte size of
+# each section in SECTIONS order.
+SECTIONS = ("spoken", "spoken_starts", "source_starts", "replaced", "line_starts",
+            "word_starts", "word_ends", "sentence_starts")
+HEADER = struct.Struct("<4sIQQ" + "Q" * len(SECTIONS))
+MAGIC = b"SRDC"
+
+
+@dataclass
+class PreparedText:
+    """Everything the reader needs to speak a text: produced once, cached.
+
+    ``spoken`` is the normalized single-line text handed to the engine,
+    ``offsets`` maps it back to the source, and ``words`` indexes its words
+    and sentences.
+    """
+
+    spoken: str
+    offsets: OffsetMap
+    words: WordIndex
+
+
+def prepare_text(text, rules=None):
+    """Normalize and index ``text`` without any caching."""
+    spoken, offsets = normalize_with_offsets(text, rules)
+    return PreparedText(spoken, offsets, WordIndex(spoken))
+
+
+class DocumentCache(FileCache):
+    """A directory of preprocessed documents with an LRU size cap.
+
+    Use :meth:`prepare` as a drop-in for :func:`prepare_text`: texts shorter
+    than ``min_chars`` are prepared directly, longer ones are loaded from the
+    cache or prepared once and stored. A corrupt or unreadable entry is
+    treated as a miss. Safe to share between the GUI and the MCP server
+    threads.
+    """
+
+    suffix = SUFFIX
+    name = "Document cache"
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 min_chars=DEFAULT_MIN_CHARS):
+        super().__init__(directory, max_bytes)
+        self.min_chars = int(min_chars)
+
+    @staticmethod
+    def key(text, rules=None):
+        """Cache key for ``text`` normalized by ``rules``."""
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=20)
+        digest.update((rules or DEFAULT_RULES).version.encode("ascii"))
+        return digest.hexdigest()
+
+    def prepare(self, text, rules=None):
+        """Return the :class:`PreparedText` for ``text``, from cache if possible."""
+        if len(text) < self.min_chars:
+            return prepare_text(text, rules)
+        key = self.key(text, rules)
+        prepared = self.get(key)
+        if prepared is None:
+            self.misses += 1
+            prepared = prepare_text(text, rules)
+            self.put(key, prepared)
+        else:
+            self.hits += 1
+        return prepared
+
+    def get(self, key):
+        """Load the entry for ``key``, or ``None`` if absent or unreadable."""
+        return self._load(key, _decode)
+
+    def put(self, key, prepared):
+        """Store ``prepared`` under ``key`` atomically, then enforce the cap."""
+        self._store(key, _encode(prepared))
+
+
+def _encode(prepared):
+    offsets, words = prepared.offsets, prepared.words
+    sections = [
+        prepared.spoken.encode("utf-8", "surrogatepass"),
+        offsets.spoken_starts.tobytes(), offsets.source_starts.tobytes(),
+        offsets.replaced.tobytes(), offsets.line_starts.tobytes(),
+        words.starts.tobytes(), words.ends.tobytes(), words.sentence_starts.tobytes(),
+    ]
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, offsets.source_length, words.length,
+                         *(len(section) for section in sections))
+    return b"".join([header] + sections)
+
+
+def _decode(buffer):
+    if len(buffer) < HEADER.size:
+        raise ValueError("truncated cache entry")
+    magic, version, source_length, spoken_length, *sizes = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("not a document cache entry")
+    if HEADER.size + sum(sizes) != len(buffer):
+        raise ValueError("truncated cache entry")
+    arrays = []
+    pos = HEADER.size
+    with memoryview(buffer) as view:
+        spoken = str(view[pos:pos + sizes[0]], "utf-8", "surrogatepass")
+        pos += sizes[0]
+        for typecode, size in zip("IIBIIII", sizes[1:]):
+            values = array(typecode)
+            # Released before returning so the caller can close the mmap.
+            with view[pos:pos + size] as part:
+                values.frombytes(part)
+            arrays.append(values)
+            pos += size
+    if len(spoken) != spoken_length:
+        raise ValueError("corrupt cache entry")
+    offsets = OffsetMap.from_arrays(source_length, *arrays[:4])
+    words = WordIndex.from_arrays(spoken_length, *arrays[4:])
+    return PreparedText(spoken, offsets, words)
@@ -0,0 +1,308 @@
+"""Stream plain text, HTML and EPUB documents into the chunked reading pipeline.
+
+Nothing here loads a whole book into one Python string (or the Tk Text
+widget): ``.txt`` files are memory-mapped and decoded block by block, HTML is
+fed through :class:`html.parser.HTMLParser` a block at a time, and EPUB
+chapters are streamed straight out of the zip in spine order. Each document
+exposes its text as a sequence of pieces, which
+:func:`~Core.text_processing.iter_stream_chunks` turns into utterance-sized
+chunks with global offsets. Headings are collected on the way: from
+``<h1>``-``<h6>`` tags for HTML/EPUB, and by :func:`~Core.sections.find_headings`
+for plain text. Stdlib only.
+"""
+import codecs
+import io
+from abc import ABC, abstractmethod
+import mmap
+import os
+import posixpath
+import re
+import zipfile
+from html.parser import HTMLParser
+from urllib.parse import unquote
+from xml.etree import ElementTree
+
+from Core.sections import Section, find_headings
+from Core.text_processing import DEFAULT_CHUNK_CHARS, iter_stream_chunks
+
+BLOCK_SIZE = 64 * 1024
+
+TEXT_EXTENSIONS = (".txt", ".text", ".md")
+HTML_EXTENSIONS = (".html", ".htm", ".xhtml")
+EPUB_EXTENSIONS = (".epub",)
+
+# Tags whose start/end separates paragraphs; their content is read normally.
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "figcaption", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr",
+    "li", "main", "nav", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}
+# Tags whose content is never spoken.
+SKIP_TAGS = {"head", "script", "style", "template", "svg", "math"}
+SPACES = re.compile(r"\s+")
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+
+class Document(ABC):
+    """A readable document: a title, a size hint and a stream of text pieces.
+
+    ``size_hint`` approximates the length of the extracted text in characters
+    (exact for ASCII text files) so callers can show progress without reading
+    ahead.
+    """
+
+    def __init__(self, path, title=None, size_hint=0):
+        self.path = path
+        self.title = title or os.path.basename(path)
+        self.size_hint = size_hint
+
+    # True when headings come from markup tags rather than text heuristics.
+    markup = False
+
+    @abstractmethod
+    def pieces(self, headings=None):
+        """Yield the document's text in order, in arbitrarily sized pieces.
+
+        Markup documents append a :class:`~Core.sections.Section` to
+        ``headings`` (when given) for each heading tag as they stream past it.
+        """
+
+    def iter_chunks(self, max_chars=DEFAULT_CHUNK_CHARS, headings=None):
+        """Lazily yield :class:`~Core.text_processing.Chunk` objects.
+
+        With a ``headings`` list, the document's headings are appended to it
+        (in order, global offsets) by the time the chunk holding them is
+        yielded.
+        """
+        chunks = iter_stream_chunks(self.pieces(headings), max_chars)
+        if headings is None or self.markup:
+            return chunks
+        return self._find_headings(chunks, headings)
+
+    @staticmethod
+    def _find_headings(chunks, headings):
+        for chunk in chunks:
+            headings.extend(find_headings(chunk.text, chunk.start))
+            yield chunk
+
+
+class TextDocument(Document):
+    """A plain-text file, memory-mapped and decoded one block at a time.
+
+    Line endings are normalized to ``\\n`` so paragraph detection works on
+    Windows files too.
+    """
+
+    def __init__(self, path, encoding="utf-8-sig"):
+        super().__init__(path, size_hint=os.path.getsize(path))
+        self.encoding = encoding
+
+    def pieces(self, headings=None):
+        if self.size_hint == 0:
+            return
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        with open(self.path, "rb") as handle, \
+                mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            carry = ""
+            for offset in range(0, len(mapped), BLOCK_SIZE):
+                text = carry + decoder.decode(mapped[offset:offset + BLOCK_SIZE])
+                # Hold back a trailing '\r' in case its '\n' is in the next block.
+                carry = "\r" if text.endswith("\r") else ""
+                if carry:
+                    text = text[:-1]
+                yield text.replace("\r\n", "\n").replace("\r", "\n")
+            tail = carry + decoder.decode(b"", final=True)
+            if tail:
+                yield tail.replace("\r", "\n")
+
+
+class _TextExtractor(HTMLParser):
+    """Collects the readable text of (X)HTML fed to it incrementally.
+
+    Whitespace inside text runs is collapsed (source formatting is not
+    meaningful), block-level tags become paragraph breaks and ``<br>`` a line
+    break, and script/style/head content is dropped. Headings are appended to
+    ``headings`` with offsets counted from ``base``.
+    """
+
+    def __init__(self, headings=None, base=0):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.title = None
+        self.headings = headings
+        self.length = base
+        self._heading = None
+        self._skip = 0
+        self._in_title = False
+
+    def _emit(self, text):
+        self.out.append(text)
+        self.length += len(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "br":
+            self._emit("\n")
+        elif tag in BLOCK_TAGS:
+            self._emit("\n\n")
+            if tag in HEADING_TAGS and not self._skip:
+                self._heading = (self.length, HEADING_TAGS[tag], [])
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "br":
+            self._emit("\n")
+        elif tag in BLOCK_TAGS:
+            self._emit("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif tag == "title":
+            self._in_title = False
+        elif tag in BLOCK_TAGS:
+            if tag in HEADING_TAGS and self._heading is not None:
+                offset, level, parts = self._heading
+                self._heading = None
+                title = SPACES.sub(" ", "".join(parts)).strip()
+                if title and self.headings is not None:
+                    self.headings.append(Section(offset, title, level))
+            self._emit("\n\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title = (self.title or "") + data.strip()
+        elif not self._skip:
+            if self._heading is not None:
+                self._heading[2].append(data)
+            self._emit(SPACES.sub(" ", data))
+
+    def drain(self):
+        """Return (and forget) the text extracted so far."""
+        text = "".join(self.out)
+        self.out = []
+        return text
+
+
+def _stream_html(handle, extractor=None):
+    """Feed a text stream through an extractor, yielding text as it appears."""
+    extractor = extractor or _TextExtractor()
+    while True:
+        block = handle.read(BLOCK_SIZE)
+        if not block:
+            break
+        extractor.feed(block)
+        text = extractor.drain()
+        if text:
+            yield text
+    extractor.close()
+    text = extractor.drain()
+    if text:
+        yield text
+
+
+class HtmlDocument(Document):
+    """A single (X)HTML file streamed through the text extractor."""
+
+    markup = True
+
+    def __init__(self, path):
+        super().__init__(path, size_hint=os.path.getsize(path) // 2)
+
+    def pieces(self, headings=None):
+        extractor = _TextExtractor(headings)
+        with open(self.path, "r", encoding="utf-8", errors="replace") as handle:
+            for text in _stream_html(handle, extractor):
+                yield text
+        if extractor.title:
+            self.title = extractor.title
+
+
+class EpubDocument(Document):
+    """An EPUB book: its spine's XHTML chapters streamed from the zip in order."""
+
+    CONTAINER = "META-INF/container.xml"
+    markup = True
+
+    def __init__(self, path):
+        super().__init__(path)
+        try:
+            with zipfile.ZipFile(path) as book:
+                opf_path = self._rootfile(book)
+                title, self.chapters = self._spine(book, opf_path)
+                self.size_hint = sum(book.getinfo(name).file_size for name in self.chapters) // 2
+        except (zipfile.BadZipFile, ElementTree.ParseError) as exc:
+            raise ValueError("Not a readable EPUB: {}".format(exc))
+        if title:
+            self.title = title
+
+    @classmethod
+    def _rootfile(cls, book):
+        try:
+            container = ElementTree.fromstring(book.read(cls.CONTAINER))
+        except KeyError:
+            raise ValueError("Not an EPUB: missing {}".format(cls.CONTAINER))
+        for element in container.iter():
+            if element.tag.endswith("rootfile") and element.get("full-path"):
+                return element.get("full-path")
+        raise ValueError("EPUB container lists no rootfile")
+
+    @staticmethod
+    def _spine(book, opf_path):
+        """Return ``(title, [chapter zip names in reading order])``."""
+        package = ElementTree.fromstring(book.read(opf_path))
+        base = posixpath.dirname(opf_path)
+        manifest = {}
+        title = None
+        spine = []
+        for element in package.iter():
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "item":
+                manifest[element.get("id")] = element.get("href")
+            elif tag == "itemref":
+                spine.append(element.get("idref"))
+            elif tag == "title" and title is None and element.text:
+                title = element.text.strip()
+        names = set(book.namelist())
+        chapters = []
+        for idref in spine:
+            href = manifest.get(idref)
+            if not href:
+                continue
+            name = posixpath.normpath(posixpath.join(base, unquote(href.split("#", 1)[0])))
+            if name in names:
+                chapters.append(name)
+        return title, chapters
+
+    def pieces(self, headings=None):
+        position = 0
+        with zipfile.ZipFile(self.path) as book:
+            for name in self.chapters:
+                with book.open(name) as raw:
+                    handle = io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+                    for text in _stream_html(handle, _TextExtractor(headings, position)):
+                        position += len(text)
+                        yield text
+                # Chapters always start a new paragraph.
+                position += 2
+                yield "\n\n"
+
+
+def open_document(path):
+    """Open ``path`` as a :class:`Document` chosen by its extension.
+
+    Raises ``ValueError`` for an unsupported file type or a malformed EPUB,
+    and ``OSError`` if the file cannot be read.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in TEXT_EXTENSIONS:
+        return TextDocument(path)
+    if extension in HTML_EXTENSIONS:
+        return HtmlDocument(path)
+    if extension in EPUB_EXTENSIONS:
+        return EpubDocument(path)
+    raise ValueError("Unsupported document type: {}".format(extension or path))
@@ -0,0 +1,183 @@
+"""Direct espeak-ng synthesis for the rendered speech backend on Linux.
+
+pyttsx3 drives espeak-ng through its own polling run loop, re-applies
+properties through the driver for every utterance and plays through
+espeak's audio output, which on headless hosts is slow to start and
+unpredictable. :class:`EspeakSynth` calls libespeak-ng itself instead, in
+synchronous mode: text goes in, 16-bit PCM and word events come back
+through the synth callback, and nothing is played. It is the engine of the
+long-running :class:`~Core.synthesis.SynthesisPool` worker processes (the
+text is fed to them over the pool's pipe), so each worker initializes
+espeak-ng once and rate and voice changes are a parameter call, not a new
+engine. Playback then streams through the rendered backend's sink.
+
+The ``espeak-ng`` command line reports neither word positions nor where
+one utterance's audio ends when it is kept running on stdin, hence the
+library rather than the program. Word events carry exact positions, so
+clips rendered here need no estimated word timings.
+"""
+import ctypes
+import ctypes.util
+from types import SimpleNamespace
+
+from Core.audio import AudioClip
+
+LIBRARY_NAMES = ("espeak-ng", "espeak")
+
+# From espeak-ng/speak_lib.h.
+AUDIO_OUTPUT_SYNCHRONOUS = 2
+INITIALIZE_DONT_EXIT = 0x8000
+POS_CHARACTER = 1
+CHARS_UTF8 = 1
+ENDPAUSE = 0x1000
+EVENT_LIST_TERMINATED = 0
+EVENT_WORD = 1
+PARAMETER_RATE = 1
+PARAMETER_VOLUME = 2
+
+
+class _Event(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("unique_identifier", ctypes.c_uint),
+        ("text_position", ctypes.c_int),  # characters, counted from 1
+        ("length", ctypes.c_int),
+        ("audio_position", ctypes.c_int),  # milliseconds
+        ("sample", ctypes.c_int),
+        ("user_data", ctypes.c_void_p),
+        ("id", ctypes.c_void_p),  # union of number, name and string
+    ]
+
+
+class _Voice(ctypes.Structure):
+    _fields_ = [
+        ("name", ctypes.c_char_p),
+        ("languages", ctypes.c_char_p),
+        ("identifier", ctypes.c_char_p),
+        ("gender", ctypes.c_ubyte),
+        ("age", ctypes.c_ubyte),
+        ("variant", ctypes.c_ubyte),
+        ("xx1", ctypes.c_ubyte),
+        ("score", ctypes.c_int),
+        ("spare", ctypes.c_void_p),
+    ]
+
+
+SYNTH_CALLBACK = ctypes.CFUNCTYPE(
+    ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.POINTER(_Event))
+
+
+def find_library():
+    """Path of the espeak-ng shared library, or ``None`` if it is not installed."""
+    for name in LIBRARY_NAMES:
+        path = ctypes.util.find_library(name)
+        if path:
+            return path
+    return None
+
+
+def _bind(library):
+    library.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+    library.espeak_Initialize.restype = ctypes.c_int
+    library.espeak_SetSynthCallback.argtypes = [SYNTH_CALLBACK]
+    library.espeak_SetSynthCallback.restype = None
+    library.espeak_Synth.argtypes = [
+        ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int, ctypes.c_uint,
+        ctypes.c_uint, ctypes.POINTER(ctypes.c_uint), ctypes.c_void_p]
+    library.espeak_Synth.restype = ctypes.c_int
+    library.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+    library.espeak_SetParameter.restype = ctypes.c_int
+    library.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+    library.espeak_SetVoiceByName.restype = ctypes.c_int
+    library.espeak_ListVoices.argtypes = [ctypes.c_void_p]
+    library.espeak_ListVoices.restype = ctypes.POINTER(ctypes.POINTER(_Voice))
+    return library
+
+
+class EspeakSynth:
+    """One initialized espeak-ng, rendering text to :class:`~Core.audio.AudioClip`.
+
+    Offers the part of pyttsx3's engine interface a rendering worker uses
+    (``setProperty`` and the ``voices`` property) plus :meth:`render`.
+    Properties take effect on the next render; setting one to its current
+    value costs nothing. ``library`` is the loaded libespeak-ng (found and
+    loaded by default); raises ``OSError`` when it is not installed.
+    """
+
+    def __init__(self, library=None):
+        if library is None:
+            path = find_library()
+            if path is None:
+                raise OSError("espeak-ng is not installed.")
+            library = ctypes.CDLL(path)
+        self._library = _bind(library)
+        self.sample_rate = self._library.espeak_Initialize(
+            AUDIO_OUTPUT_SYNCHRONOUS, 0, None, INITIALIZE_DONT_EXIT)
+        if self.sample_rate <= 0:
+            raise OSError("espeak-ng failed to initialize.")
+        # Kept referenced: ctypes frees the C callback with its Python object.
+        self._callback = SYNTH_CALLBACK(self._on_synth)
+        self._library.espeak_SetSynthCallback(self._callback)
+        self._properties = {"rate": None, "voice": None, "volume": None}
+        self._pcm = None
+        self._words = None
+
+    def getProperty(self, name):
+        if name == 'voices':
+            voices = []
+            listed = self._library.espeak_ListVoices(None)
+            index = 0
+            while listed[index]:
+                voice = listed[index].contents.name.decode("utf-8", "replace")
+                voices.append(SimpleNamespace(id=voice, name=voice))
+                index += 1
+            return voices
+        return self._properties[name]
+
+    def setProperty(self, name, value):
+        if value is None or self._properties.get(name) == value:
+            return
+        if name == 'rate':
+            self._library.espeak_SetParameter(PARAMETER_RATE, int(value), 0)
+        elif name == 'volume':
+            self._library.espeak_SetParameter(PARAMETER_VOLUME, int(value * 100), 0)
+        elif name == 'voice':
+            if self._library.espeak_SetVoiceByName(str(value).encode("utf-8")) != 0:
+                raise ValueError("espeak-ng has no voice {!r}.".format(value))
+        else:
+            raise KeyError(name)
+        self._properties[name] = value
+
+    def render(self, text):
+        """``text`` spoken at the current properties, with its words' exact start frames."""
+        self._pcm = bytearray()
+        self._words = []
+        encoded = text.encode("utf-8", "surrogatepass") + b"\0"
+        try:
+            status = self._library.espeak_Synth(
+                encoded, len(encoded), 0, POS_CHARACTER, 0, CHARS_UTF8 | ENDPAUSE, None, None)
+            if status != 0:
+                raise OSError("espeak-ng failed to synthesize (error {}).".format(status))
+            frames, words = bytes(self._pcm), self._words
+        finally:
+            self._pcm = self._words = None
+        clip = AudioClip(frames, self.sample_rate)
+        frame_count = clip.frame_count
+        for start, length, frame in words:
+            clip.word_starts.append(start)
+            clip.word_lengths.append(length)
+            clip.word_frames.append(min(frame, max(frame_count - 1, 0)))
+        return clip
+
+    def _on_synth(self, samples, count, events):
+        if samples and count > 0:
+            self._pcm += ctypes.string_at(samples, count * 2)
+        index = 0
+        while events and events[index].type != EVENT_LIST_TERMINATED:
+            event = events[index]
+            if event.type == EVENT_WORD:
+                self._words.append((max(event.text_position - 1, 0), event.length,
+                                    event.audio_position * self.sample_rate // 1000))
+            index += 1
+        return 0
+
@@ -0,0 +1,91 @@
+"""A directory of cache entry files with an LRU size cap.
+
+The storage shared by :class:`~Core.document_cache.DocumentCache` and
+:class:`~Core.audio_cache.AudioCache`: one file per key, written atomically
+(temp file + rename, so a reader never sees half an entry), loaded through a
+memory map and evicted least-recently-used once the directory grows past
+``max_bytes``. Reading an entry touches its modification time, which is what
+eviction orders by. The subclasses own the keys and the entry formats.
+"""
+import mmap
+import os
+import tempfile
+import threading
+
+
+class FileCache:
+    """Entries ``<key><suffix>`` in ``directory``, at most ``max_bytes`` in all.
+
+    Subclasses set ``suffix`` (only such files are counted and evicted) and
+    ``name`` (for error messages). Safe to share between threads; ``hits``
+    and ``misses`` are for the subclass to count.
+    """
+
+    suffix = ".cache"
+    name = "Cache"
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _load(self, key, decode):
+        """``decode(buffer)`` of the entry for ``key``, or ``None`` if absent or unreadable."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle, \
+                    mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                value = decode(mapped)
+            # Mark as recently used for LRU eviction.
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return value
+
+    def _store(self, key, data):
+        """Write ``data`` as the entry for ``key`` atomically, then enforce the cap."""
+        if len(data) > self.max_bytes:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "wb") as temp:
+                    temp.write(data)
+                os.replace(temp_path, self._path(key))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            self._evict()
+        except OSError as e:
+            print(f"{self.name} write failed: {e}")
+
+    def _evict(self):
+        """Delete least-recently-used entries until the cache fits ``max_bytes``."""
+        with self._lock:
+            entries = []
+            total = 0
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if not entry.name.endswith(self.suffix):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
@@ -0,0 +1,92 @@
+"""Painting a fast stream of updates at a capped frame rate.
+
+Word callbacks arrive at 10-15 a second at 600-900 WPM, more with agent
+speech on top, and painting one (three labels, the 120pt word, the Text
+tag, scrolling and the progress bar) can take longer than the gap to the
+next. :class:`FrameLimiter` decouples the two: callbacks only record the
+latest update, and a paint scheduled on the UI loop draws whatever is
+latest when it runs, at most ``fps`` times a second. Updates superseded
+before they were painted are skipped, and counted.
+"""
+import threading
+import time
+
+DEFAULT_FPS = 30
+
+
+class FrameLimiter:
+    """Calls ``paint(*args)`` with the latest :meth:`post`, at most ``fps`` times a second.
+
+    ``schedule(milliseconds, callback)`` runs a callback on the UI thread
+    later (a Tk widget's ``after``); :meth:`post` is safe to call from any
+    thread. ``posted``, ``painted`` and ``dropped`` count updates;
+    ``paint_seconds`` and ``max_paint_seconds`` time the paints.
+    """
+
+    def __init__(self, paint, schedule, fps=DEFAULT_FPS, clock=time.perf_counter):
+        self.paint = paint
+        self.schedule = schedule
+        self.interval = 1.0 / fps
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pending = None  # args of the update not painted yet
+        self._scheduled = False
+        self._last_paint = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.posted = 0
+        self.painted = 0
+        self.dropped = 0
+        self.paint_seconds = 0.0
+        self.max_paint_seconds = 0.0
+
+    def post(self, *args):
+        """Make ``args`` the next update to paint, replacing one not painted yet."""
+        with self._lock:
+            self.posted += 1
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = args
+            if self._scheduled:
+                return
+            self._scheduled = True
+            delay = 0.0
+            if self._last_paint is not None:
+                delay = max(self._last_paint + self.interval - self.clock(), 0.0)
+        self.schedule(int(delay * 1000), self._run)
+
+    def _run(self):
+        with self._lock:
+            self._scheduled = False
+        self.flush()
+
+    def flush(self):
+        """Paint the pending update now, if there is one."""
+        with self._lock:
+            args, self._pending = self._pending, None
+        if args is None:
+            return
+        start = self.clock()
+        try:
+            self.paint(*args)
+        finally:
+            end = self.clock()
+            with self._lock:
+                self._last_paint = end
+                self.painted += 1
+                self.paint_seconds += end - start
+                self.max_paint_seconds = max(self.max_paint_seconds, end - start)
+
+    def cancel(self):
+        """Drop the pending update without painting it."""
+        with self._lock:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = None
+
+    def summary(self):
+        """One line of frame statistics since the last :meth:`reset_stats`."""
+        average = self.paint_seconds / self.painted if self.painted else 0.0
+        return "{} of {} updates painted, {} skipped; paint {:.1f} ms avg, {:.1f} ms max".format(
+            self.painted, self.posted, self.dropped, average * 1000, self.max_paint_seconds * 1000)
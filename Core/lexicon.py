@@ -0,0 +1,117 @@
+"""User pronunciation lexicon for abbreviations, acronyms and domain terms.
+
+The lexicon is a JSON object mapping a term to how it should be spoken, kept
+in ``lexicon.json`` next to ``config.json``:
+
+    {"SAPI": "sappy", "e.g.": "for example", "kubectl": "cube control"}
+
+All terms are folded into a prefix trie, and the trie is emitted as a single
+regular expression (each node becomes one alternation over its children), so
+the C regex engine walks the trie once per text position instead of trying
+10k separate patterns. Terms only match as whole words. The compiled lexicon
+is cached per file and rebuilt only when the file's mtime or size changes.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+
+LEXICON_FILENAME = "lexicon.json"
+
+
+class Lexicon:
+    """An immutable set of term -> spoken-form entries plus its trie regex."""
+
+    def __init__(self, entries=None):
+        self.entries = {str(k): str(v) for k, v in (entries or {}).items() if k}
+        self.pattern = trie_pattern(self.entries)
+        # Identifies the entries' content, so caches of lexicon-normalized
+        # text can tell when the lexicon changed.
+        self.digest = hashlib.blake2b(
+            json.dumps(self.entries, sort_keys=True).encode("utf-8"), digest_size=8).hexdigest()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def replacement(self, term):
+        return self.entries.get(term, term)
+
+
+
+def trie_pattern(terms):
+    """Regex source matching any of ``terms`` as a whole word, or ``""``.
+
+    Where one term is a prefix of another the continuation is tried first, so
+    the longest term wins; the trailing ``(?!\\w)`` falls back to a shorter
+    term when the longer one would end mid-word.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    if not trie:
+        return ""
+    return r"(?<!\w)" + _node_pattern(trie) + r"(?!\w)"
+
+
+def _node_pattern(node):
+    branches = [re.escape(char) + _node_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return "(?:" + body + ")?" if "" in node else body
+
+
+EMPTY_LEXICON = Lexicon()
+
+
+class LexiconFile:
+    """A lexicon file whose compiled :class:`Lexicon` is rebuilt on change.
+
+    ``get`` costs one ``os.stat`` when nothing changed. A missing or invalid
+    file yields the empty lexicon, so a bad edit never stops speech.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._lexicon = EMPTY_LEXICON
+
+    def get(self):
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._lexicon = self._load() if stamp is not None else EMPTY_LEXICON
+                    self._stamp = stamp
+        return self._lexicon
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return EMPTY_LEXICON
+        return Lexicon(data) if isinstance(data, dict) else EMPTY_LEXICON
+
+
+_files = {}
+_files_lock = threading.Lock()
+
+
+def lexicon_file(path):
+    """Shared :class:`LexiconFile` for ``path`` (one compiled cache per file)."""
+    key = os.path.abspath(path)
+    with _files_lock:
+        if key not in _files:
+            _files[key] = LexiconFile(key)
+        return _files[key]
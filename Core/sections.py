@@ -0,0 +1,93 @@
+"""Chapter and heading detection, and section navigation.
+
+Headings come from the document's own structure where it has one (``<h1>``
+to ``<h6>`` in HTML/EPUB, recorded by the loader while it streams) and from
+line heuristics for plain text: markdown ``#`` headings and short lines such
+as "Chapter 12", "PART IV" or "Book One". :class:`SectionIndex` keeps the
+section starts in a sorted ``array('I')`` so finding the section around a
+word, the next one or the previous one is a bisect.
+"""
+import re
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+
+MARKDOWN_HEADING = re.compile(r'^[ \t]{0,3}(#{1,6})[ \t]+(\S[^\n]*?)[ \t#]*$', re.M)
+CHAPTER_HEADING = re.compile(
+    r'^[ \t]*((?:chapter|part|book|section)[ \t]+'
+    r'(?:\d+|[ivxlcdm]+|one|two|three|four|five|six|seven|eight|nine|ten|'
+    r'eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|'
+    r'nineteen|twenty)\b[^\n]{0,60})$', re.M | re.I)
+# "Chapter" lines are top-level; "Part"/"Book" sit above them but are rarer
+# than chapters in practice, so they share the level.
+CHAPTER_LEVEL = 1
+# Within this many characters of a section start, "previous section" goes to
+# the section before rather than back to the start of the current one.
+PREVIOUS_GRACE = 40
+
+
+@dataclass(frozen=True)
+class Section:
+    """A heading: where its section starts, its text and its level (1 = top)."""
+
+    offset: int
+    title: str
+    level: int
+
+
+def find_headings(text, base=0):
+    """Headings found by the plain-text heuristics, offsets shifted by ``base``."""
+    found = []
+    for match in MARKDOWN_HEADING.finditer(text):
+        found.append(Section(base + match.start(), match.group(2), len(match.group(1))))
+    for match in CHAPTER_HEADING.finditer(text):
+        found.append(Section(base + match.start(1), match.group(1).strip(), CHAPTER_LEVEL))
+    found.sort(key=lambda section: section.offset)
+    return found
+
+
+class SectionIndex:
+    """Section starts of one document, in offset order.
+
+    ``offsets`` are in whatever space the headings were given in (source
+    offsets for an opened document, spoken offsets for pasted text); the
+    caller converts. Sections may be added while the index is being read, as
+    long as they arrive in order.
+    """
+
+    def __init__(self, sections=()):
+        self.offsets = array('I')
+        self.sections = []
+        for section in sections:
+            self.add(section)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def add(self, section):
+        if self.offsets and section.offset <= self.offsets[-1]:
+            return  # the same heading seen twice (or out of order)
+        self.sections.append(section)
+        self.offsets.append(section.offset)
+
+    def section_at(self, offset):
+        """The :class:`Section` containing ``offset``, or ``None`` before the first."""
+        index = bisect_right(self.offsets, offset) - 1
+        return self.sections[index] if index >= 0 else None
+
+    def next_start(self, offset):
+        """Start of the first section after ``offset``, or ``None``."""
+        index = bisect_right(self.offsets, offset)
+        return self.offsets[index] if index < len(self.offsets) else None
+
+    def previous_start(self, offset, grace=PREVIOUS_GRACE):
+        """Where "previous section" goes from ``offset``.
+
+        Like a media player's back button: the start of the current section,
+        or of the one before it when ``offset`` is already within ``grace``
+        characters of the current start. 0 before the first heading.
+        """
+        index = bisect_right(self.offsets, offset) - 1
+        if index >= 0 and offset - self.offsets[index] <= grace:
+            index -= 1
+        return self.offsets[index] if index >= 0 else 0
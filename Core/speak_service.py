@@ -1,6 +1,16 @@
-from Core.speech import speak_blocking
+import threading
+from collections import OrderedDict
+
+from Core.speech import EngineWorker
+from Core.speech_engine import (
+    CANCELLED, DEFAULT_COALESCE_CHARS, DONE, FAILED, SpeechScheduler, Utterance, merge_utterances)
 from Core.text_processing import preprocess_text
 
+# Finished utterances kept for ``get`` lookups; older ones are forgotten.
+MAX_TRACKED = 256
+# Utterances each agent may have waiting before ``submit`` pushes back.
+DEFAULT_MAX_QUEUE = 16
+
 
 class SpeakService:
     """Shared text-to-speech entry point for both the GUI host and MCP server.
@@ -8,12 +18,45 @@ class SpeakService:
     Holds the current speech rate so agent requests speak at the same words per
     minute the user has set in the UI. The GUI keeps ``rate`` in sync via
     ``set_rate``; the int read/write is atomic, so it is safe to read from the
-    MCP server thread. ``speak_fn`` is injectable for testing.
+    MCP server thread. ``speak_fn`` is injectable for testing; by default
+    (the standalone MCP server) one :class:`~Core.speech.EngineWorker` engine
+    is kept for the life of the service. It returns the state its speech
+    ended in, so an utterance stopped while playing ends ``cancelled``, and
+    raises if speaking failed. For a merged run (below) it is also passed
+    ``on_word``, to call with each word's ``(location, length)`` as it is
+    spoken.
+
+    ``rules`` is the :class:`~Core.text_processing.RuleSet` used to strip
+    unspeakable noise (code, paths, hashes...) from agent text before speaking;
+    it defaults to the built-in URL rule. With a
+    :class:`~Core.document_cache.DocumentCache`, long texts an agent sends
+    again (a README, a report) are normalized once and then read from disk.
+
+    Utterances are spoken one at a time by a worker thread that calls
+    ``speak_fn``; :meth:`submit` queues one and returns its
+    :class:`~Core.speech_engine.Utterance` handle straight away, so a caller
+    (an agent) need not wait for speech to finish. :meth:`speak` is the
+    blocking form. Handles stay available from :meth:`get` by id. Waiting
+    utterances are ordered by a :class:`~Core.speech_engine.SpeechScheduler`,
+    so several agents take fair turns, each in its own order, and an agent
+    with ``max_queue`` utterances already waiting is refused
+    (:class:`~Core.speech_engine.SpeechQueueFull`). When an agent sends a
+    burst of short texts, the ones waiting together are spoken as one call
+    to ``speak_fn`` (up to ``coalesce_chars``); each handle still finishes on
+    its own, as soon as its words have been spoken.
     """
 
-    def __init__(self, rate=500, speak_fn=None):
+    def __init__(self, rate=500, speak_fn=None, rules=None, cache=None,
+                 max_queue=DEFAULT_MAX_QUEUE, coalesce_chars=DEFAULT_COALESCE_CHARS):
         self._rate = int(rate)
-        self._speak_fn = speak_fn or speak_blocking
+        self._speak_fn = speak_fn or EngineWorker()
+        self.rules = rules
+        self.cache = cache
+        self._jobs = SpeechScheduler(max_depth=max_queue)
+        self.coalesce_chars = coalesce_chars
+        self._tracked = OrderedDict()
+        self._lock = threading.Condition()
+        self._worker = None
 
     @property
     def rate(self):
@@ -22,12 +65,84 @@ class SpeakService:
     def set_rate(self, rate):
         self._rate = int(rate)
 
-    def speak(self, text, rate=None, voice=None):
+    def speak(self, text, rate=None, voice=None, agent=None):
         """Speak ``text`` aloud, using the UI rate unless ``rate`` overrides it.
 
         ``voice`` is an optional per-call voice id (used by the MCP server to
-        speak in an agent's claimed voice). Returns the rate actually used.
+        speak in an agent's claimed voice). Blocks until spoken and returns
+        the rate actually used; an exception from ``speak_fn`` is re-raised.
+        """
+        utterance = self.submit(text, rate, voice, agent=agent)
+        utterance.wait()
+        if utterance.error is not None:
+            raise utterance.error
+        return utterance.rate
+
+    def submit(self, text, rate=None, voice=None, agent=None):
+        """Queue ``text`` to be spoken and return its handle without waiting.
+
+        ``agent`` identifies the caller for fair scheduling.
         """
         used = self._rate if rate is None else int(rate)
-        self._speak_fn(preprocess_text(text), used, voice)
-        return used
+        if self.cache is not None and len(text) >= self.cache.min_chars:
+            spoken = self.cache.prepare(text, self.rules).spoken
+        else:
+            spoken = preprocess_text(text, self.rules)
+        utterance = Utterance(spoken, used, voice, agent=agent, engine=self)
+        with self._lock:
+            self._jobs.push(utterance)
+            self._track(utterance)
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="speedreader-speak", daemon=True)
+                self._worker.start()
+            self._lock.notify()
+        return utterance
+
+    def cancel(self, utterance):
+        """Drop ``utterance`` if it is still waiting (one playing cannot be)."""
+        with self._lock:
+            if not self._jobs.remove(utterance):
+                return
+        utterance._finish(CANCELLED)
+
+    def flush(self):
+        """Cancel every waiting utterance (the GUI's Ctrl+B barge-in)."""
+        with self._lock:
+            dropped = self._jobs.clear()
+        for utterance in dropped:
+            utterance._finish(CANCELLED)
+
+    def get(self, utterance_id):
+        """The handle with ``utterance_id``, or ``None`` if unknown/forgotten."""
+        with self._lock:
+            return self._tracked.get(utterance_id)
+
+    def _track(self, utterance):
+        self._tracked[utterance.id] = utterance
+        excess = len(self._tracked) - MAX_TRACKED
+        for old_id in [i for i, u in self._tracked.items() if u.finished][:max(excess, 0)]:
+            del self._tracked[old_id]
+
+    def _next(self):
+        with self._lock:
+            while True:
+                run = self._jobs.pop_run(self.coalesce_chars)
+                if not run:
+                    self._lock.wait()
+                else:
+                    utterance = merge_utterances(run)
+                    utterance._start()
+                    return utterance
+
+    def _run(self):
+        while True:
+            utterance = self._next()
+            progress = {} if utterance.parts is None else {
+                'on_word': lambda location, length, merged=utterance: merged._reached(location)}
+            try:
+                state = self._speak_fn(utterance.text, utterance.rate, utterance.voice, **progress)
+            except Exception as e:
+                utterance._finish(FAILED, e)
+            else:
+                utterance._finish(CANCELLED if state == CANCELLED else DONE)
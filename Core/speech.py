@@ -1,9 +1,15 @@
+import threading
+
+from Core.speech_engine import SpeechEngine
+
+
 def speak_blocking(text, rate, voice=None, init=None):
     """Speak text aloud and block until finished (headless, no GUI).
 
     A fresh pyttsx3 engine is created per call and driven with ``runAndWait()``,
-    which suits one-shot requests such as an MCP tool invocation (unlike the
-    GUI's long-lived ``startLoop`` engine in ``speech_engine.py``). ``init`` is
+    which suits a true one-shot request. Creating the engine costs far more
+    than a short utterance, so anything that speaks repeatedly (the
+    standalone MCP server) uses :class:`EngineWorker` instead. ``init`` is
     injectable so the lifecycle can be unit tested without pyttsx3.
     """
     if init is None:
@@ -15,3 +21,37 @@ def speak_blocking(text, rate, voice=None, init=None):
         engine.setProperty('voice', voice)
     engine.say(text)
     engine.runAndWait()
+
+
+class EngineWorker:
+    """A blocking ``speak(text, rate, voice)`` backed by one long-lived engine.
+
+    The first call builds a :class:`~Core.speech_engine.SpeechEngine` and
+    starts its run loop on its own thread (the same model as the GUI); every
+    later call reuses it, so only the first utterance pays for creating the
+    engine. Calls from several threads are queued by the engine and play one
+    at a time. Nothing is created until the first call, so merely importing
+    the MCP server does not start an engine. ``init`` is injectable as for
+    :func:`speak_blocking`.
+    """
+
+    def __init__(self, init=None):
+        self._init = init
+        self._speech = None
+        self._lock = threading.Lock()
+
+    def _engine(self, rate):
+        with self._lock:
+            if self._speech is None:
+                speech = SpeechEngine(init=self._init)
+                speech.prime_async(rate)
+                self._speech = speech
+            return self._speech
+
+    def __call__(self, text, rate, voice=None, on_word=None):
+        """Speak and return how it ended (see :meth:`~Core.speech_engine.Utterance.result`).
+
+        ``on_word(location, length)`` is called for each word as it is spoken.
+        """
+        speech = self._engine(rate)
+        return speech.submit(text, rate, voice=voice, on_word=on_word).result(timeout=600)
@@ -1,4 +1,355 @@
+import itertools
 import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+
+# Utterance states.
+QUEUED = "queued"
+SPEAKING = "speaking"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+# Priority lanes, served strictly in this order: the user's own reading, then
+# agents that identified themselves, then anonymous callers.
+LANE_USER = 0
+LANE_AGENT = 1
+LANE_ANONYMOUS = 2
+LANES = (LANE_USER, LANE_AGENT, LANE_ANONYMOUS)
+# Characters of speech each agent may have played per round-robin turn.
+DEFAULT_QUANTUM = 600
+# How many times an utterance may be passed over so that another agent's
+# utterance in the voice already loaded can go first.
+DEFAULT_AFFINITY_WINDOW = 2
+# Rough cost of loading a voice on SAPI5, for the latency-saved estimate.
+VOICE_SWITCH_SECONDS = 0.08
+# "No utterance popped yet" (``None`` is a real voice: the default one).
+_NO_VOICE = object()
+# Longest text that queued utterances are merged into (0 disables merging).
+DEFAULT_COALESCE_CHARS = 1000
+# Longest the loop thread goes between pumping the engine's events while it
+# waits for utterances to issue.
+LOOP_TICK_SECONDS = 0.01
+SENTENCE_END = ".!?:;"
+
+
+class SpeechQueueFull(ValueError):
+    """Raised by :meth:`SpeechScheduler.push` when a caller's queue is full."""
+
+
+@dataclass
+class SpeechStats:
+    """Counters for the engine property calls made and skipped."""
+
+    voice_switches: int = 0  # the voice actually changed between utterances
+    voice_sets_skipped: int = 0  # setProperty('voice') skipped as redundant
+    rate_sets_skipped: int = 0  # setProperty('rate') skipped as redundant
+
+    @property
+    def latency_saved(self):
+        """Estimated seconds saved by not reloading an unchanged voice."""
+        return self.voice_sets_skipped * VOICE_SWITCH_SECONDS
+
+    def summary(self):
+        """One line of the property calls made and skipped."""
+        return "{} voice switches; {} voice and {} rate sets skipped, {:.0f} ms saved".format(
+            self.voice_switches, self.voice_sets_skipped, self.rate_sets_skipped,
+            self.latency_saved * 1000)
+
+
+class Utterance:
+    """Future-like handle for one utterance queued with :meth:`SpeechEngine.submit`.
+
+    ``state`` moves from ``queued`` to ``speaking`` to ``done``, or to
+    ``cancelled`` if it was flushed/cancelled before (or while) playing, or
+    ``failed`` (with the exception in ``error``) if speaking raised.
+    ``queued_at``/``started_at``/``finished_at`` are ``time.time()`` stamps,
+    ``None`` until reached. :meth:`wait` blocks until it has finished either
+    way. ``context`` is opaque caller data, readable from the callbacks via
+    :attr:`SpeechEngine.current` (the GUI stores the chunk's offset there).
+    ``on_word(location, length)``, if given, follows the utterance's words.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, text, rate, voice=None, name=None, context=None, engine=None,
+                 lane=None, agent=None, on_word=None):
+        self.id = next(self._ids)
+        self.text = text
+        self.agent = agent
+        if lane is None:
+            lane = LANE_ANONYMOUS if agent is None else LANE_AGENT
+        self.lane = lane
+        self.rate = rate
+        self.voice = voice
+        self.name = name
+        self.context = context
+        self.on_word = on_word
+        self.state = QUEUED
+        self.error = None
+        # Set on a merged utterance: the original handles and where each ends.
+        self.parts = None
+        self.part_ends = None
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._engine = engine
+        self._finished = threading.Event()
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the utterance has finished; False on timeout."""
+        return self._finished.wait(timeout)
+
+    def result(self, timeout=None):
+        """Wait, then return the final state: ``done`` or ``cancelled``.
+
+        Raises ``error`` if it failed, or ``TimeoutError`` if it has not
+        finished within ``timeout`` seconds.
+        """
+        if not self.wait(timeout):
+            raise TimeoutError("Utterance {} did not finish in time.".format(self.id))
+        if self.state == FAILED:
+            raise self.error
+        return self.state
+
+    def cancel(self):
+        """Drop the utterance if still queued, or stop it if playing.
+
+        Delegates to whatever queued it: a :class:`SpeechEngine`, or a
+        :class:`~Core.speak_service.SpeakService`, which can only drop an
+        utterance that is still waiting.
+        """
+        if self._engine is not None:
+            self._engine.cancel(self)
+        elif self.state == QUEUED:
+            self._finish(CANCELLED)
+
+    def _start(self):
+        self.state = SPEAKING
+        self.started_at = time.time()
+        for part in self.parts or ():
+            part._start()
+
+    def _reached(self, location):
+        """Finish each part read before word ``location`` (a merged utterance)."""
+        for part, end in zip(self.parts or (), self.part_ends or ()):
+            if location >= end and not part.finished:
+                part._finish(DONE)
+
+    def _finish(self, state, error=None):
+        self.state = state
+        self.error = error
+        self.finished_at = time.time()
+        self._finished.set()
+        for part in self.parts or ():
+            if not part.finished:
+                part._finish(state, error)
+
+    def _mergeable_with(self, other):
+        return (other.agent == self.agent and other.lane == self.lane
+                and other.voice == self.voice and other.rate == self.rate
+                and self.name is None and other.name is None
+                and self.context is None and other.context is None
+                and self.on_word is None and other.on_word is None)
+
+
+def merge_utterances(parts, engine=None):
+    """One utterance speaking all of ``parts`` in turn (or the only part).
+
+    The texts are joined as sentences. The merged utterance's ``parts`` are
+    the original handles, which start and finish with it; ``part_ends`` holds
+    where each part's text ends, so an engine reporting word positions can
+    finish each part as soon as it has been read.
+    """
+    if len(parts) == 1:
+        return parts[0]
+    text = ""
+    ends = []
+    for part in parts:
+        piece = part.text.strip()
+        if text:
+            text += " " if text[-1] in SENTENCE_END else ". "
+        text += piece
+        ends.append(len(text))
+    first = parts[0]
+    merged = Utterance(text, first.rate, first.voice, engine=engine, lane=first.lane,
+                       agent=first.agent)
+    merged.parts = list(parts)
+    merged.part_ends = ends
+    return merged
+
+
+class SpeechScheduler:
+    """Queued utterances in priority lanes, shared fairly between agents.
+
+    Lanes are served strictly in :data:`LANES` order. Within a lane each
+    agent (``Utterance.agent``; all anonymous callers count as one) has its
+    own FIFO, and :meth:`pop` picks between them by deficit round-robin: every
+    turn an agent earns ``quantum`` characters of credit and may play
+    utterances while its credit covers their length. A chatty agent therefore
+    gets the same share of speaking time as a quiet one, and with N agents
+    waiting nobody waits more than about N quanta. ``max_depth`` (if set)
+    bounds each agent's FIFO; :meth:`push` raises :class:`SpeechQueueFull`
+    beyond it so callers get backpressure instead of unbounded latency.
+
+    Switching voices is slow on SAPI5, so when another agent in the lane has
+    an utterance in the voice just popped waiting at the head of its queue,
+    that one may go first (voice affinity). A jump plays that one utterance
+    only, paid from its agent's credit (which may go into debt, repaid from
+    its next quanta), and the agent passed over keeps its turn and credit.
+    Only queue heads move, so each agent's own order is kept, and an
+    utterance is passed over at most ``affinity_window`` times; ``grouped``
+    counts the utterances moved up.
+
+    Not thread-safe: the owner serializes access with its own lock.
+    """
+
+    def __init__(self, max_depth=None, quantum=DEFAULT_QUANTUM,
+                 affinity_window=DEFAULT_AFFINITY_WINDOW):
+        self.max_depth = max_depth
+        self.quantum = quantum
+        self.affinity_window = affinity_window
+        self.grouped = 0
+        self._lanes = {lane: OrderedDict() for lane in LANES}
+        self._credit = {}
+        self._passed_over = {}
+        self._last_voice = _NO_VOICE
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for lane in LANES:
+            for pending in self._lanes[lane].values():
+                yield from pending
+
+    def __contains__(self, utterance):
+        pending = self._lanes[utterance.lane].get(utterance.agent)
+        return pending is not None and utterance in pending
+
+    def push(self, utterance):
+        queues = self._lanes[utterance.lane]
+        pending = queues.get(utterance.agent)
+        if pending is None:
+            pending = queues[utterance.agent] = deque()
+        elif self.max_depth is not None and len(pending) >= self.max_depth:
+            raise SpeechQueueFull(
+                "Speech queue is full ({} utterances waiting); wait for one to finish "
+                "and try again.".format(len(pending)))
+        pending.append(utterance)
+        self._size += 1
+
+    def pop(self):
+        """Remove and return the next utterance to play, or ``None``."""
+        for lane in LANES:
+            queues = self._lanes[lane]
+            if queues:
+                agent = self._with_voice_affinity(
+                    lane, queues, self._next_fair_agent(lane, queues))
+                utterance = self._take(lane, queues, agent)
+                self._last_voice = utterance.voice
+                return utterance
+        return None
+
+    def _with_voice_affinity(self, lane, queues, agent):
+        """``agent``, or another whose next utterance reuses the loaded voice."""
+        head = queues[agent][0]
+        if (self.affinity_window <= 0 or self._last_voice is _NO_VOICE
+                or head.voice == self._last_voice
+                or self._passed_over.get(head.id, 0) >= self.affinity_window):
+            return agent
+        for other, pending in queues.items():
+            if pending[0].voice == self._last_voice:
+                self._passed_over[head.id] = self._passed_over.get(head.id, 0) + 1
+                self.grouped += 1
+                # One utterance out of turn, charged to ``other`` by _take;
+                # ``agent`` stays first in the round with the credit it has.
+                return other
+        return agent
+
+    def _next_fair_agent(self, lane, queues):
+        while True:
+            agent, pending = next(iter(queues.items()))
+            key = (lane, agent)
+            credit = self._credit.get(key, 0)
+            if credit >= max(len(pending[0].text), 1):
+                return agent
+            # Out of credit: top up and let the next agent have a turn.
+            self._credit[key] = credit + self.quantum
+            queues.move_to_end(agent)
+
+    def _take(self, lane, queues, agent):
+        pending = queues[agent]
+        key = (lane, agent)
+        utterance = pending.popleft()
+        self._passed_over.pop(utterance.id, None)
+        self._size -= 1
+        # May go negative after a voice-affinity jump; repaid next turns.
+        credit = self._credit.get(key, 0) - max(len(utterance.text), 1)
+        if pending:
+            self._credit[key] = credit
+        else:
+            # An agent with nothing waiting keeps no credit (standard DRR),
+            # but still owes what it spoke out of turn.
+            del queues[agent]
+            if credit < 0:
+                self._credit[key] = credit
+            else:
+                self._credit.pop(key, None)
+        return utterance
+
+    def pop_run(self, max_chars):
+        """Pop the next utterance and the same agent's mergeable followers.
+
+        Followers are taken while they share the first one's voice and rate
+        (and carry no GUI ``name``/``context``) and the joined text stays
+        within ``max_chars``. Returns a list, empty when nothing is queued.
+        """
+        first = self.pop()
+        if first is None:
+            return []
+        run = [first]
+        total = len(first.text)
+        queues = self._lanes[first.lane]
+        while max_chars > 0 and first.agent in queues:
+            following = queues[first.agent][0]
+            total += len(following.text) + 2
+            if total > max_chars or not first._mergeable_with(following):
+                break
+            run.append(self._take(first.lane, queues, first.agent))
+        return run
+
+    def remove(self, utterance):
+        """Drop ``utterance`` if queued; returns whether it was."""
+        queues = self._lanes[utterance.lane]
+        pending = queues.get(utterance.agent)
+        if pending is None or utterance not in pending:
+            return False
+        pending.remove(utterance)
+        self._passed_over.pop(utterance.id, None)
+        self._size -= 1
+        if not pending:
+            del queues[utterance.agent]
+            key = (utterance.lane, utterance.agent)
+            if self._credit.get(key, 0) >= 0:
+                self._credit.pop(key, None)
+        return True
+
+    def clear(self):
+        """Empty every lane; returns what was queued."""
+        dropped = list(self)
+        for queues in self._lanes.values():
+            queues.clear()
+        self._credit.clear()
+        self._passed_over.clear()
+        self._size = 0
+        return dropped
 
 
 class SpeechEngine:
@@ -16,17 +367,29 @@ class SpeechEngine:
     directly: ``get_voices`` waits for the cached voices and ``speak`` waits for
     the engine to be ready, then only queues an utterance.
 
-    ``speak`` is serialized: each utterance applies the rate and (optional)
-    per-utterance voice, then waits for ``finished-utterance`` before the next
-    one runs. This is required because pyttsx3 applies properties at processing
-    time, so different agents' voices would otherwise bleed across queued
-    utterances. Callers run ``speak`` on a worker/daemon thread, never the
-    tkinter main thread.
+    ``speak`` enqueues: utterances wait in a queue owned by this object, and
+    only one is handed to the engine at a time, with its own rate and voice.
+    This is required because pyttsx3 applies properties at processing time, so
+    different agents' voices would otherwise bleed across queued utterances.
+    When the loop is running, every utterance's properties and ``say`` are
+    issued on the loop thread: the next one straight from the
+    ``finished-utterance`` callback, so there is no gap while a parked caller
+    thread wakes up, and the first one after the engine fell idle by the
+    loop itself, which :meth:`submit` wakes. The loop is pyttsx3's external
+    one (``startLoop(False)`` then ``iterate``), so it can run that work
+    between pumps of the engine. Callers need not block at all
+    (``block=False`` returns the :class:`Utterance` handle). A blocking
+    ``speak`` still must not run on the tkinter main thread.
 
     ``init`` is injectable so the lifecycle can be unit tested without pyttsx3.
+    ``max_queue`` bounds each caller's queue (see :class:`SpeechScheduler`).
+    Consecutive queued utterances from one agent in the same voice and rate
+    are spoken as one ``say`` of up to ``coalesce_chars`` characters (see
+    :func:`merge_utterances`), saving the per-utterance start-up pause.
     """
 
-    def __init__(self, on_start=None, on_word=None, on_end=None, init=None):
+    def __init__(self, on_start=None, on_word=None, on_end=None, init=None, max_queue=None,
+                 coalesce_chars=DEFAULT_COALESCE_CHARS):
         if init is None:
             import pyttsx3
             init = pyttsx3.init
@@ -38,12 +401,23 @@ class SpeechEngine:
         self._started = False
         self._voice = None
         self._voices = []
+        # Guards the queue and ``current``. Never held while calling into the
+        # engine: SAPI5 calls from a foreign thread are marshalled to the loop
+        # thread, whose callbacks take this lock.
         self._speak_lock = threading.RLock()
-        self._done = threading.Event()
+        self._queue = SpeechScheduler(max_depth=max_queue)
+        self.coalesce_chars = coalesce_chars
+        self.current = None  # the Utterance handed to the engine, if any
         self._engine_ready = threading.Event()
         self._voices_ready = threading.Event()
         self._loop_requested = False
-        self._flush_generation = 0
+        self._loop_ended = False
+        # Set to wake the loop thread when an utterance is waiting to be issued.
+        self._wake = threading.Event()
+        # What the engine was last told, so unchanged properties are not re-sent.
+        self._applied_rate = None
+        self._applied_voice = None
+        self.stats = SpeechStats()
 
     def _ensure_engine(self):
         """Create + wire the engine. MUST run on the dedicated loop thread.
@@ -57,7 +431,11 @@ class SpeechEngine:
             engine.connect('started-utterance', self._on_start)
             engine.connect('started-word', self._on_word)
             engine.connect('finished-utterance', self._on_end)
-            engine.connect('finished-utterance', self._mark_done)
+            # Connected after the caller's callbacks so e.g. the GUI's onEnd
+            # sees the finished utterance before the next one is issued.
+            engine.connect('started-utterance', self._utterance_started)
+            engine.connect('started-word', self._utterance_word)
+            engine.connect('finished-utterance', self._utterance_finished)
             self.engine = engine
             self._engine_ready.set()
         return self.engine
@@ -69,14 +447,69 @@ class SpeechEngine:
         self._voices_ready.set()
         return self._voices
 
-    def _mark_done(self, name, completed):
-        self._done.set()
+    def _utterance_started(self, name):
+        with self._speak_lock:
+            if self.current is not None and self.current.state == QUEUED:
+                self.current._start()
+
+    def _utterance_finished(self, name, completed):
+        """Resolve the current utterance and issue the next (loop thread)."""
+        with self._speak_lock:
+            finished = self.current
+            if finished is None:
+                return
+            following = self._pop_next()
+            self.current = following
+        finished._finish(DONE if completed else CANCELLED)
+        if following is not None:
+            self._issue(following)
+
+    def _pop_next(self):
+        """The next utterance to play, merged with any it can share a say with."""
+        run = self._queue.pop_run(self.coalesce_chars)
+        return merge_utterances(run, engine=self) if run else None
+
+    def _utterance_word(self, name, location, length):
+        """Report the word to the current utterance and finish parts read."""
+        current = self.current
+        if current is None:
+            return
+        if current.on_word is not None:
+            current.on_word(location, length)
+        current._reached(location)
+
+    def _issue(self, utterance):
+        """Apply the utterance's properties and hand it to the engine."""
+        if utterance.state != QUEUED:
+            return  # cancelled between being dequeued and issued
+        engine = self.engine
+        self._apply_properties(utterance.rate, utterance.voice)
+        if utterance.name is None:
+            engine.say(utterance.text)
+        else:
+            engine.say(utterance.text, utterance.name)
 
     def _apply_properties(self, rate, voice):
-        self.engine.setProperty('rate', rate)
+        """Send the rate and voice for the next utterance, skipping repeats.
+
+        On SAPI5 setting the voice reloads it even when it is unchanged, which
+        is audible between utterances, so only real changes are sent.
+        """
+        if rate != self._applied_rate:
+            self.engine.setProperty('rate', rate)
+            self._applied_rate = rate
+        else:
+            self.stats.rate_sets_skipped += 1
         chosen = voice if voice is not None else self._voice
-        if chosen is not None:
-            self.engine.setProperty('voice', chosen)
+        if chosen is None:
+            return
+        if chosen == self._applied_voice:
+            self.stats.voice_sets_skipped += 1
+            return
+        if self._applied_voice is not None:
+            self.stats.voice_switches += 1
+        self.engine.setProperty('voice', chosen)
+        self._applied_voice = chosen
 
     def _await_engine(self):
         """Return the engine, waiting for the loop thread to build it.
@@ -94,24 +527,142 @@ class SpeechEngine:
     def flush(self):
         """Cancel queued utterances and interrupt the one being spoken now.
 
-        Bumps the flush generation so any callers blocked waiting for the speak
-        lock abort instead of speaking, then stops the engine to interrupt the
-        current utterance. Used by the GUI 'barge in' (Ctrl+B) path. The MCP
-        server never flushes, so agent utterances queue and play in order.
+        Every queued utterance is cancelled (its waiters wake), then the engine
+        is stopped to interrupt the current one. Used by the GUI 'barge in'
+        (Ctrl+B) path. The MCP server never flushes, so agent utterances queue
+        and play in order.
+        """
+        with self._speak_lock:
+            dropped = self._queue.clear()
+            dropped.extend(self._release_unstarted())
+        for utterance in dropped:
+            utterance._finish(CANCELLED)
+        self._stop_engine()
+
+    def prefetch(self, text, rate, voice=None):
+        """Hint that ``text`` will be spoken soon at ``rate``.
+
+        An engine that renders ahead (:class:`~Core.synthesis.RenderedEngine`)
+        starts on it now, so its later ``say`` plays without waiting; the live
+        pyttsx3 engine cannot, and this returns False.
+        """
+        prefetch = getattr(self.engine, 'prefetch', None)
+        if prefetch is None:
+            return False
+        return prefetch(text, rate, voice if voice is not None else self._voice)
+
+    def discard_prefetched(self):
+        """Drop everything passed to :meth:`prefetch` that has not been spoken.
+
+        Not part of :meth:`flush`, since an interrupting reader prefetches
+        its own next chunks before the first one flushes the queue.
+        """
+        discard = getattr(self.engine, 'discard_prefetched', None)
+        if discard is not None:
+            discard()
+
+    def _release_unstarted(self):
+        """Clear ``current`` if it never started (lock held).
+
+        ``engine.stop`` discards a ``say`` still waiting in pyttsx3's own queue
+        without a ``finished-utterance``, so such an utterance must be resolved
+        here or the queue would wait on it forever. One that has started gets
+        its (interrupted) ``finished-utterance`` from the engine instead.
         """
-        self._flush_generation += 1
+        current = self.current
+        if current is not None and current.state == QUEUED:
+            self.current = None
+            return [current]
+        return []
+
+    def _stop_engine(self):
         if self.engine is not None:
             try:
                 self.engine.stop()
             except Exception:
                 pass
 
-    def speak(self, text, rate, voice=None, block=True, interrupt=False, name=None):
-        """Speak one utterance, optionally with a per-call ``voice`` id.
+    def cancel(self, utterance):
+        """Drop ``utterance`` if queued, or interrupt it if it is playing."""
+        with self._speak_lock:
+            current = self.current
+            if self._queue.remove(utterance):
+                stop = False
+            elif current is not None and (utterance is current or utterance in (current.parts or ())):
+                # Part of a merged utterance: the whole say has to stop.
+                stop = True
+                dropped = self._release_unstarted()
+            else:
+                return
+        if not stop:
+            utterance._finish(CANCELLED)
+            return
+        for unstarted in dropped:
+            unstarted._finish(CANCELLED)
+        self._stop_engine()
+        if not dropped:
+            return
+        # The engine was idle (the say it dropped never started): move on.
+        self._issue_soon()
+
+    def cancel_named(self, name):
+        """Cancel every queued or playing utterance tagged ``name``.
+
+        Returns how many were cancelled, so a caller can tell whether the
+        utterance playing now was one of them.
+        """
+        with self._speak_lock:
+            mine = [u for u in self._queue if u.name == name]
+            if self.current is not None and self.current.name == name:
+                mine.append(self.current)
+        for utterance in mine:
+            self.cancel(utterance)
+        return len(mine)
+
+    def _issue_soon(self):
+        """Have the next queued utterance issued, by the loop thread if it runs."""
+        if self._loop_requested and not self._loop_ended:
+            self._wake.set()
+        else:
+            self._issue_next()
+
+    def _issue_next(self):
+        with self._speak_lock:
+            if self.current is not None or not self._queue:
+                return
+            following = self.current = self._pop_next()
+        self._issue(following)
 
-        Serialized via a lock; when ``block`` (default) it waits for the
-        utterance to finish so the next speaker's voice cannot bleed in. Run on
-        a daemon/worker thread — never the tkinter main thread.
+    def pending(self):
+        """Number of utterances queued behind the current one."""
+        with self._speak_lock:
+            return len(self._queue)
+
+    def speak(self, text, rate, voice=None, block=True, interrupt=False, name=None,
+              context=None, lane=None, agent=None):
+        """Queue one utterance and, when ``block`` (default), wait for it.
+
+        The blocking form of :meth:`submit`: a blocking call must run on a
+        daemon/worker thread — never the tkinter main thread. Returns the
+        :class:`Utterance` handle either way.
+        """
+        utterance = self.submit(text, rate, voice, interrupt=interrupt, name=name,
+                                context=context, lane=lane, agent=agent)
+        if block:
+            utterance.wait(timeout=600)
+        return utterance
+
+    def submit(self, text, rate, voice=None, interrupt=False, name=None, context=None,
+               lane=None, agent=None, on_word=None):
+        """Queue one utterance, optionally with a per-call ``voice`` id.
+
+        Returns its :class:`Utterance` handle at once. Utterances play one at
+        a time, each with its own rate and voice, in the order the
+        :class:`SpeechScheduler` picks: ``lane`` first (the GUI reads in
+        :data:`LANE_USER`; by default ``agent`` callers are in
+        :data:`LANE_AGENT` and the rest in :data:`LANE_ANONYMOUS`), then fairly
+        between agents, and in order for each agent. Raises
+        :class:`SpeechQueueFull` if the caller's queue is at ``max_queue``.
 
         When ``interrupt`` is set, the current utterance is stopped and any
         already-queued utterances are cancelled before this one speaks (the GUI
@@ -122,23 +673,33 @@ class SpeechEngine:
         started/word/finished callbacks; the GUI uses it to tag each utterance
         with a session id and ignore callbacks from an interrupted utterance
         that arrive after a new one has already started.
+
+        ``on_word(location, length)`` is called on the loop thread for each
+        word of this utterance, which is then never merged with another (the
+        speak service follows its own merged runs with it).
+
+        Without a primed run loop (headless use, unit tests) nothing would
+        deliver ``finished-utterance`` to advance the queue, so each utterance
+        is handed to the engine straight away, on the calling thread, as
+        pyttsx3 itself would queue it.
         """
         if interrupt:
             self.flush()
-        my_generation = self._flush_generation
+        utterance = Utterance(text, rate, voice, name, context, engine=self,
+                              lane=lane, agent=agent, on_word=on_word)
+        self._await_engine()
         with self._speak_lock:
-            if self._flush_generation != my_generation:
-                # A flush happened while this call waited in the queue — drop it.
-                return
-            engine = self._await_engine()
-            self._apply_properties(rate, voice)
-            self._done.clear()
-            if name is None:
-                engine.say(text)
+            if self._loop_requested and not self._loop_ended:
+                self._queue.push(utterance)
+                issue = False
             else:
-                engine.say(text, name)
-            if block:
-                self._done.wait(timeout=600)
+                self.current = utterance
+                issue = True
+        if issue:
+            self._issue(utterance)
+        else:
+            self._wake.set()
+        return utterance
 
     def prime_async(self, rate):
         """Create the engine and start its run loop on a dedicated daemon thread.
@@ -153,8 +714,8 @@ class SpeechEngine:
     def ensure_loop(self, rate):
         """Build the engine, cache voices, and start the run loop once.
 
-        ``startLoop`` blocks, so this runs on the dedicated daemon thread spawned
-        by ``prime_async``. No-op restart if the loop is already running.
+        The run loop blocks, so this runs on the dedicated daemon thread
+        spawned by ``prime_async``. No-op restart if the loop is already running.
         """
         self._loop_requested = True
         engine = self._ensure_engine()
@@ -162,7 +723,27 @@ class SpeechEngine:
         if not self._started:
             self._apply_properties(rate, None)
             self._started = True
-            engine.startLoop()
+            self._run_loop(engine)
+
+    def _run_loop(self, engine):
+        """Pump ``engine`` and issue waiting utterances until its loop is ended.
+
+        pyttsx3 raises ``RuntimeError`` from ``iterate`` once ``endLoop`` has
+        been called.
+        """
+        engine.startLoop(False)
+        try:
+            while True:
+                try:
+                    engine.iterate()
+                except RuntimeError:
+                    return
+                self._wake.wait(LOOP_TICK_SECONDS)
+                self._wake.clear()
+                self._issue_next()
+        finally:
+            with self._speak_lock:
+                self._loop_ended = True
 
     def get_voices(self):
         """Return ``[(id, name), ...]`` for the voices installed on this system.
@@ -0,0 +1,417 @@
+"""Rendering speech to audio ahead of playback, in a pool of processes.
+
+Live pyttsx3 synthesis runs in real time on one thread, so at high WPM the
+engine itself is the bottleneck. :class:`SynthesisPool` instead renders
+utterances to WAV with ``save_to_file`` in a ``ProcessPoolExecutor``, each
+worker process holding its own engine (SAPI5 and espeak engines are not
+shareable between processes, and pyttsx3 allows one per thread). Several
+upcoming chunks then render on other cores while the current one plays.
+
+:class:`RenderedEngine` puts the pool behind pyttsx3's engine interface, so
+:class:`~Core.speech_engine.SpeechEngine` drives it unchanged: every ``say``
+starts rendering at once, and the engine's loop thread plays the finished
+clips through a sink strictly in ``say`` order, reporting words from the
+clip's word timings.
+"""
+import itertools
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from importlib import metadata
+from types import SimpleNamespace
+
+from Core.audio import default_sink, read_wav
+
+# Memory the finished look-ahead clips waiting to be played may hold.
+DEFAULT_AHEAD_BYTES = 64 * 1024 * 1024
+
+# The engine of this worker process (set by ``_start_worker``).
+_engine = None
+
+
+def _start_worker(init):
+    """Pool initializer: build this process's engine once."""
+    global _engine
+    if init is None:
+        import pyttsx3
+        init = pyttsx3.init
+    _engine = init()
+
+
+def _render(text, rate, voice, path, stretch=1.0, max_pause=None):
+    """Render ``text`` to ``path`` in a worker and return it as an AudioClip.
+
+    Engines with a ``render(text)`` method return the clip themselves.
+
+    Pauses are then cut to ``max_pause`` seconds, if set (see
+    :func:`~Core.audio_processing.compress_silence`), and with ``stretch``
+    above 1 the audio is sped up that much (see
+    :func:`~Core.audio_processing.time_stretch`).
+    """
+    _engine.setProperty('rate', rate)
+    if voice is not None:
+        _engine.setProperty('voice', voice)
+    render = getattr(_engine, "render", None)
+    if render is not None:
+        # Engines that synthesize to memory (EspeakSynth) skip the WAV file
+        # and report exact word positions.
+        clip = render(text)
+    else:
+        _engine.save_to_file(text, path)
+        _engine.runAndWait()
+        try:
+            clip = read_wav(path, text)
+        finally:
+            os.unlink(path)
+    if max_pause:
+        from Core.audio_processing import compress_silence
+        # Before stretching, which is cheaper on the shorter audio and then
+        # shortens the kept pauses to ``max_pause`` too.
+        clip = compress_silence(clip, max_pause * stretch)
+    if stretch != 1.0:
+        from Core.audio_processing import time_stretch
+        clip = time_stretch(clip, stretch)
+    return clip
+
+
+def _list_voices():
+    return [(voice.id, voice.name) for voice in _engine.getProperty('voices')]
+
+
+def engine_version(init=None):
+    """Identifies what renders, for audio cache keys: the engine factory and pyttsx3 release."""
+    try:
+        release = metadata.version("pyttsx3")
+    except metadata.PackageNotFoundError:
+        release = "unknown"
+    if init is None:
+        return "pyttsx3.init/{} {}".format(sys.platform, release)
+    name = getattr(init, "__qualname__", None)
+    name = "{}.{}".format(init.__module__, name) if name else repr(init)
+    return "{} {}".format(name, release)
+
+
+def default_workers():
+    """One process per core, less one left for playback and the UI."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+class SynthesisPool:
+    """Renders utterances to :class:`~Core.audio.AudioClip` in worker processes.
+
+    ``init`` builds a worker's engine (``pyttsx3.init`` by default); it must be
+    picklable, i.e. a module-level function. Rendered WAVs are written under
+    ``directory`` (a fresh temporary directory by default) and deleted as
+    soon as they have been read back. With an
+    :class:`~Core.audio_cache.AudioCache`, text already rendered in the same
+    voice, rate and ``engine_version`` is served from disk without a
+    worker, and new renders are stored.
+
+    :meth:`prefetch` renders text that is expected to be spoken soon (the
+    next chunks of a document); a later :meth:`submit` of the same text,
+    rate and voice picks that render up. Finished look-ahead clips are held
+    in memory, up to ``ahead_bytes``, until submitted or discarded with
+    :meth:`discard_prefetched`.
+
+    Engines sound worse near the top of their rate range and cannot go past
+    it, so with ``max_native_rate`` set, faster text is rendered at that rate
+    and then time-stretched (pitch kept) to the rate asked for. With
+    ``max_pause`` set, pauses longer than that many seconds are shortened.
+    """
+
+    def __init__(self, workers=None, init=None, directory=None, cache=None,
+                 ahead_bytes=DEFAULT_AHEAD_BYTES, max_native_rate=None, max_pause=None):
+        self.workers = workers or default_workers()
+        self.cache = cache
+        self.ahead_bytes = ahead_bytes
+        self.max_native_rate = max_native_rate
+        self.max_pause = max_pause
+        self._ahead = OrderedDict()  # (text, rate, voice) -> Future
+        self._ahead_lock = threading.Lock()
+        self.engine_version = engine_version(init)
+        if max_native_rate:
+            self.engine_version += " stretched above {}".format(max_native_rate)
+        if max_pause:
+            self.engine_version += " pauses up to {}s".format(max_pause)
+        self._owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="speedreader-render-")
+        self._names = itertools.count(1)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_start_worker, initargs=(init,))
+
+    def submit(self, text, rate, voice=None):
+        """Start rendering ``text``; returns a Future of its AudioClip.
+
+        The Future is already done when the clip came from the cache.
+        """
+        with self._ahead_lock:
+            future = self._ahead.pop((text, int(rate), voice), None)
+        if future is not None and not future.cancelled():
+            return future
+        return self._start(text, rate, voice)
+
+    def prefetch(self, text, rate, voice=None):
+        """Start rendering ``text`` for a later :meth:`submit`.
+
+        Returns False, rendering nothing, when the look-ahead clips already
+        finished fill ``ahead_bytes``.
+        """
+        key = (text, int(rate), voice)
+        with self._ahead_lock:
+            if key in self._ahead:
+                return True
+            if self._ahead_held() >= self.ahead_bytes:
+                return False
+            self._ahead[key] = self._start(text, rate, voice)
+        return True
+
+    def discard_prefetched(self):
+        """Cancel every look-ahead render not yet submitted and drop its clip."""
+        with self._ahead_lock:
+            dropped = list(self._ahead.values())
+            self._ahead.clear()
+        for future in dropped:
+            future.cancel()
+        return len(dropped)
+
+    def _ahead_held(self):
+        return sum(len(future.result().frames) for future in self._ahead.values()
+                   if future.done() and not future.cancelled() and future.exception() is None)
+
+    def _start(self, text, rate, voice):
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(text, voice, rate, self.engine_version)
+            clip = self.cache.get(key)
+            if clip is not None:
+                future = Future()
+                future.set_result(clip)
+                return future
+        path = os.path.join(self.directory, "{}.wav".format(next(self._names)))
+        native = rate
+        if self.max_native_rate and rate > self.max_native_rate:
+            native = self.max_native_rate
+        future = self._executor.submit(
+            _render, text, native, voice, path, rate / native, self.max_pause)
+        if key is not None:
+            future.add_done_callback(lambda done: self._store(key, done))
+        return future
+
+    def _store(self, key, future):
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+    def render_in_order(self, texts, rate, voice=None, ahead=None):
+        """Yield the clips of ``texts`` in order, rendering up to ``ahead`` at once.
+
+        ``ahead`` defaults to the number of workers. Renders still in flight
+        are cancelled when the generator is closed.
+        """
+        ahead = max(ahead or self.workers, 1)
+        texts = iter(texts)
+        pending = []
+        try:
+            for text in itertools.islice(texts, ahead):
+                pending.append(self.submit(text, rate, voice))
+            while pending:
+                clip = pending.pop(0).result()
+                for text in itertools.islice(texts, 1):
+                    pending.append(self.submit(text, rate, voice))
+                yield clip
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def voices(self):
+        """``[(id, name), ...]`` of the voices the workers' engine offers."""
+        return self._executor.submit(_list_voices).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class RenderedEngine:
+    """A pyttsx3-compatible engine that plays audio rendered by a pool.
+
+    Like pyttsx3, ``setProperty`` and ``say`` only queue work and the thread
+    in ``startLoop`` (or ``iterate``, or ``runAndWait``) delivers every
+    callback; unlike it,
+    each ``say`` is handed to ``pool`` straight away, with the rate and voice
+    set before it, so queued utterances are rendered while earlier ones
+    play. ``stop`` interrupts the clip playing, and drops queued ones
+    (cancelling their renders) without callbacks, as pyttsx3 does.
+    """
+
+    def __init__(self, pool, sink):
+        self.pool = pool
+        self.sink = sink
+        self._properties = {"rate": 200, "voice": None, "volume": 1.0}
+        self._voices = None
+        self._callbacks = defaultdict(list)
+        self._commands = queue.Queue()
+        self._lock = threading.Lock()
+        self._queued = []  # render futures of says not yet played
+        self._looping = False
+
+    def connect(self, topic, callback):
+        if callable(callback):
+            self._callbacks[topic].append(callback)
+
+    def getProperty(self, name):
+        if name == 'voices':
+            if self._voices is None:
+                self._voices = [SimpleNamespace(id=voice_id, name=voice_name)
+                                for voice_id, voice_name in self.pool.voices()]
+            return self._voices
+        return self._properties[name]
+
+    def setProperty(self, name, value):
+        self._properties[name] = value
+
+    def say(self, text, name=None):
+        future = self.pool.submit(text, self._properties["rate"], self._properties["voice"])
+        with self._lock:
+            self._queued.append(future)
+        self._commands.put(("say", (future, name)))
+
+    def prefetch(self, text, rate, voice=None):
+        """Render ``text`` ahead of its ``say`` (see :meth:`SynthesisPool.prefetch`)."""
+        return self.pool.prefetch(text, rate, voice)
+
+    def discard_prefetched(self):
+        return self.pool.discard_prefetched()
+
+    def stop(self):
+        with self._lock:
+            dropped, self._queued = self._queued, []
+            try:
+                while True:
+                    self._commands.get_nowait()
+            except queue.Empty:
+                pass
+        for future in dropped:
+            future.cancel()
+        self.sink.stop()
+
+    def startLoop(self, useDriverLoop=True):
+        self._looping = True
+        while useDriverLoop:
+            kind, args = self._commands.get()
+            if kind == "end":
+                return
+            self._play(*args)
+
+    def iterate(self):
+        """Play what has been queued so far, for an external run loop."""
+        if not self._looping:
+            raise RuntimeError('run loop not started')
+        self.runAndWait()
+
+    def runAndWait(self):
+        while True:
+            try:
+                kind, args = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            if kind != "end":
+                self._play(*args)
+
+    def endLoop(self):
+        self._looping = False
+        self._commands.put(("end", None))
+
+    def _fire(self, topic, **kwargs):
+        for callback in self._callbacks[topic]:
+            callback(**kwargs)
+
+    def _play(self, future, name):
+        ready = threading.Event()
+        future.add_done_callback(lambda done: ready.set())
+        while not ready.wait(0.05):
+            if future not in self._queued:
+                return  # dropped by ``stop`` before it started
+        with self._lock:
+            if future not in self._queued:
+                return
+            self._queued.remove(future)
+        try:
+            clip = future.result()
+        except Exception as error:
+            print(f"Speech rendering failed: {error}")
+            self._fire('started-utterance', name=name)
+            self._fire('finished-utterance', name=name, completed=False)
+            return
+        self._fire('started-utterance', name=name)
+
+        def on_word(index):
+            self._fire('started-word', name=name, location=clip.word_starts[index],
+                       length=clip.word_lengths[index])
+
+        # The next say is usually issued from the finished callback, so the
+        # sink holds the end of the clip back to crossfade into it, and is
+        # flushed if none came.
+        completed = self.sink.play(clip, on_word, True)
+        self._fire('finished-utterance', name=name, completed=completed)
+        with self._lock:
+            idle = not self._queued
+        if idle:
+            self.sink.flush()
+
+
+def rendered_engine_factory(workers=None, init=None, sink=None, cache=None,
+                            ahead_bytes=DEFAULT_AHEAD_BYTES, max_native_rate=None,
+                            max_pause=None):
+    """An ``init`` for :class:`~Core.speech_engine.SpeechEngine` using a pool.
+
+    Returns ``None`` (use the live engine) when no audio sink is available on
+    this platform. The pool is only started when the engine is built;
+    ``cache`` is its :class:`~Core.audio_cache.AudioCache`, if any.
+    """
+    sink = sink or default_sink()
+    if sink is None:
+        print("Rendered speech needs an audio output; using live speech instead.")
+        return None
+    return lambda: RenderedEngine(
+        SynthesisPool(workers, init, cache=cache, ahead_bytes=ahead_bytes,
+                      max_native_rate=max_native_rate, max_pause=max_pause), sink)
+
+
+def speech_backend(config, cache=None):
+    """The engine ``init`` for a :class:`~Core.config.SpeechConfig`; ``None`` = live pyttsx3."""
+    if config.backend not in ("rendered", "espeak"):
+        return None
+    init = None
+    if config.backend == "espeak":
+        from Core.espeak import EspeakSynth, find_library
+        if find_library() is None:
+            print("espeak-ng is not installed; using live speech instead.")
+            return None
+        init = EspeakSynth
+    return rendered_engine_factory(workers=config.workers or None, init=init, cache=cache,
+                                   ahead_bytes=config.look_ahead_mb * 1024 * 1024,
+                                   max_native_rate=config.max_native_rate or None,
+                                   max_pause=config.max_pause_ms / 1000 or None)
+
+
+def look_ahead(items, count, prefetch):
+    """Yield ``items`` in order, calling ``prefetch`` on each ``count`` items early.
+
+    When an item is yielded, ``prefetch`` has already been called for it and
+    for up to ``count`` items after it.
+    """
+    items = iter(items)
+    window = deque()
+    while True:
+        for item in itertools.islice(items, count + 1 - len(window)):
+            prefetch(item)
+            window.append(item)
+        if not window:
+            return
+        yield window.popleft()
@@ -1,18 +1,467 @@
+import hashlib
 import re
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
 
 URL_PATTERN = re.compile(r'http\S+')
+URL_REPLACEMENT = ' [URL] '
+LINE_BREAK = re.compile(r'\n')
+LEXICON_GROUP = 'lexicon'
 
+# Default upper bound for one engine utterance. Small enough that the engine
+# starts speaking almost immediately, large enough to hold a few sentences so
+# prosody isn't reset mid-thought.
+DEFAULT_CHUNK_CHARS = 600
 
-def preprocess_text(text):
+# A paragraph break always ends a chunk; a sentence end is the preferred place
+# to cut one that would otherwise grow past ``max_chars``.
+PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n')
+SENTENCE_END = re.compile(r'[.!?]["\')\]]*\s+')
+WHITESPACE = re.compile(r'\s+')
+NON_SPACE = re.compile(r'\S')
+WORD = re.compile(r'\S+')
+
+
+@dataclass(frozen=True)
+class NormalizationRule:
+    """One text-normalization rule, as declared under ``normalization.rules``.
+
+    ``pattern`` is a regular expression and ``replace`` its replacement, which
+    may use ``\\1``/``\\g<name>`` group references. ``flags`` is any of
+    ``"i"``, ``"m"``, ``"s"`` (scoped to this rule only).
+    """
+
+    name: str
+    pattern: str
+    replace: str = ""
+    flags: str = ""
+    enabled: bool = True
+
+
+class RuleSet:
+    """Normalization rules compiled into one alternation, applied in one pass.
+
+    Each rule becomes a named group ``(?P<rN>(?flags:pattern))`` of a single
+    combined regex, so the text is scanned once no matter how many rules are
+    declared: at each position the first rule that matches wins. Replacements
+    without group references are used verbatim; the rest are expanded from the
+    rule's own regex matched at the same position. Newlines are folded to
+    spaces afterwards so the result is a single line.
+
+    ``lexicon`` is an optional :class:`~Core.lexicon.LexiconFile`; its trie
+    regex is appended as the last alternative, and the combined regex is
+    recompiled only when the lexicon file has changed.
+    """
+
+    def __init__(self, rules, lexicon=None):
+        self.rules = [rule for rule in rules if rule.enabled]
+        self.lexicon = lexicon
+        self._compiled = {}
+        self._parts = []
+        for index, rule in enumerate(self.rules):
+            group = "r{}".format(index)
+            if set(rule.flags) - set("ims"):
+                raise ValueError("Rule '{}': unsupported flags '{}'".format(rule.name, rule.flags))
+            scoped = "(?{}:{})".format(rule.flags, rule.pattern) if rule.flags else rule.pattern
+            try:
+                compiled = re.compile(scoped)
+            except re.error as exc:
+                raise ValueError("Rule '{}': invalid pattern: {}".format(rule.name, exc))
+            self._compiled[group] = (rule, compiled if '\\' in rule.replace else None)
+            self._parts.append("(?P<{}>{})".format(group, scoped))
+        # (lexicon, combined pattern) swapped as one tuple so concurrent
+        # readers never pair a pattern with the wrong lexicon.
+        self._state = (None, self._combine(None))
+        self._rules_digest = hashlib.blake2b(
+            repr([(r.pattern, r.replace, r.flags) for r in self.rules]).encode("utf-8"),
+            digest_size=8).hexdigest()
+
+    def _combine(self, lexicon):
+        parts = list(self._parts)
+        if lexicon is not None and lexicon.pattern:
+            parts.append("(?P<{}>{})".format(LEXICON_GROUP, lexicon.pattern))
+        return re.compile("|".join(parts)) if parts else None
+
+    @property
+    def pattern(self):
+        """The combined regex, rebuilt first if the lexicon file changed."""
+        state = self._state
+        if self.lexicon is not None:
+            lexicon = self.lexicon.get()
+            if lexicon is not state[0]:
+                state = (lexicon, self._combine(lexicon))
+                self._state = state
+        return state[1]
+
+    @property
+    def version(self):
+        """A short string that changes whenever the rules or lexicon do.
+
+        Anything cached from :meth:`apply` output (e.g. the preprocessed
+        document cache) keys on it so an edited rule or lexicon entry is never
+        served stale.
+        """
+        self.pattern  # picks up a changed lexicon file
+        lexicon = self._state[0]
+        if lexicon is None or not len(lexicon):
+            return self._rules_digest
+        return "{}-{}".format(self._rules_digest, lexicon.digest)
+
+    def replacement(self, match):
+        """Spoken replacement for a match of the combined pattern."""
+        if match.lastgroup == LEXICON_GROUP:
+            lexicon = self._state[0]
+            return lexicon.replacement(match.group()) if lexicon else match.group()
+        rule, compiled = self._compiled[match.lastgroup]
+        if compiled is None:
+            return rule.replace
+        return compiled.match(match.string, match.start()).expand(rule.replace)
+
+    def matches(self, text):
+        """Non-empty matches of the combined pattern, in order."""
+        pattern = self.pattern
+        if pattern is None:
+            return
+        for match in pattern.finditer(text):
+            if match.end() > match.start():
+                yield match
+
+    def apply(self, text):
+        """Return ``text`` normalized by every rule, as a single line."""
+        pattern = self.pattern
+        if pattern is not None:
+            text = pattern.sub(
+                lambda m: self.replacement(m) if m.end() > m.start() else '', text)
+        return text.replace('\n', ' ')
+
+
+# Used when config.json declares no rules: the historical behavior of
+# collapsing URLs to a ``[URL]`` placeholder.
+DEFAULT_RULES = RuleSet([NormalizationRule("url", URL_PATTERN.pattern, URL_REPLACEMENT)])
+
+
+def preprocess_text(text, rules=None):
     """Normalize text for single-line speaking.
 
-    Order matches the original speak() pipeline: newlines are replaced with
-    spaces first, then URLs are collapsed to ``[URL]``. The text is treated as a
-    single line so that the ``"1.{offset}"`` highlight indices stay valid.
+    ``rules`` (a :class:`RuleSet`, default :data:`DEFAULT_RULES`) are applied
+    in one pass, then newlines are replaced with spaces so the text is spoken
+    as a single line.
+    """
+    return (rules or DEFAULT_RULES).apply(text)
+
+
+class OffsetMap:
+    """Maps offsets in normalized (spoken) text back to the source text.
+
+    Only the places where normalization changed the text's length are
+    recorded: parallel ``array('I')`` buffers of segment starts in the spoken
+    and source text, with a flag marking segments that are replacements (e.g.
+    ``[URL]``). Offsets inside a copied segment shift by a constant; offsets
+    inside a replacement snap to the whole replaced source span. Source line
+    starts are indexed too, so a spoken offset converts straight to a tkinter
+    ``line.col`` index without touching the widget.
+    """
+
+    def __init__(self, source_length):
+        self.source_length = source_length
+        self.spoken_starts = array('I', [0])
+        self.source_starts = array('I', [0])
+        self.replaced = array('B', [0])
+        self.line_starts = array('I', [0])
+
+    @classmethod
+    def from_arrays(cls, source_length, spoken_starts, source_starts, replaced, line_starts):
+        """Rebuild a map from its arrays (e.g. loaded from the document cache)."""
+        offsets = cls.__new__(cls)
+        offsets.source_length = source_length
+        offsets.spoken_starts = spoken_starts
+        offsets.source_starts = source_starts
+        offsets.replaced = replaced
+        offsets.line_starts = line_starts
+        return offsets
+
+    def _add_segment(self, spoken_start, source_start, replaced):
+        if self.spoken_starts[-1] == spoken_start:
+            # The previous segment is empty (e.g. back-to-back replacements).
+            self.source_starts[-1] = source_start
+            self.replaced[-1] = replaced
+            return
+        self.spoken_starts.append(spoken_start)
+        self.source_starts.append(source_start)
+        self.replaced.append(replaced)
+
+    def _segment_source_end(self, index):
+        if index + 1 < len(self.source_starts):
+            return self.source_starts[index + 1]
+        return self.source_length
+
+    def to_source(self, offset):
+        """Source offset of the character at spoken ``offset``."""
+        index = bisect_right(self.spoken_starts, offset) - 1
+        if self.replaced[index]:
+            return self.source_starts[index]
+        return min(self.source_starts[index] + offset - self.spoken_starts[index],
+                   self._segment_source_end(index))
+
+    def to_source_end(self, offset):
+        """Source offset for an exclusive spoken end ``offset``."""
+        if offset <= 0:
+            return 0
+        index = bisect_right(self.spoken_starts, offset - 1) - 1
+        if self.replaced[index]:
+            return self._segment_source_end(index)
+        return min(self.source_starts[index] + offset - self.spoken_starts[index],
+                   self._segment_source_end(index))
+
+    def to_spoken(self, source_offset):
+        """Spoken offset for a source offset (e.g. a saved bookmark).
+
+        Offsets inside a replaced span map to the start of its replacement.
+        """
+        index = bisect_right(self.source_starts, source_offset) - 1
+        if index < 0:
+            # Before the first kept character (the text opens with a removal).
+            return 0
+        if self.replaced[index]:
+            return self.spoken_starts[index]
+        spoken = self.spoken_starts[index] + source_offset - self.source_starts[index]
+        if index + 1 < len(self.spoken_starts):
+            spoken = min(spoken, self.spoken_starts[index + 1])
+        return spoken
+
+    def line_col(self, source_offset):
+        """tkinter ``"line.col"`` index for a source offset."""
+        line = bisect_right(self.line_starts, source_offset) - 1
+        return "{}.{}".format(line + 1, source_offset - self.line_starts[line])
+
+
+def normalize_with_offsets(text, rules=None):
+    """Normalize ``text`` like :func:`preprocess_text` and keep an offset map.
+
+    Returns ``(spoken, offset_map)``: the string to hand to the engine plus an
+    :class:`OffsetMap` back to ``text``. It is a single pass over the source,
+    so the original (multi-line) text can stay in the Text widget untouched and
+    highlighting still lands on the right characters.
     """
-    text = text.replace('\n', ' ')
-    text = URL_PATTERN.sub(' [URL] ', text)
-    return text
+    offsets = OffsetMap(len(text))
+    for match in LINE_BREAK.finditer(text):
+        offsets.line_starts.append(match.end())
+    parts = []
+    pos = spoken_pos = 0
+    rules = rules or DEFAULT_RULES
+    for match in rules.matches(text):
+        kept = text[pos:match.start()].replace('\n', ' ')
+        parts.append(kept)
+        spoken_pos += len(kept)
+        offsets._add_segment(spoken_pos, match.start(), 1)
+        replacement = rules.replacement(match).replace('\n', ' ')
+        parts.append(replacement)
+        spoken_pos += len(replacement)
+        pos = match.end()
+        offsets._add_segment(spoken_pos, pos, 0)
+    parts.append(text[pos:].replace('\n', ' '))
+    return ''.join(parts), offsets
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """One utterance-sized slice of a document.
+
+    ``start`` is the offset of ``text`` in the whole document, so an engine
+    word offset inside the chunk maps back with ``start + location``. ``last``
+    is true for the final chunk, letting callers tell a chunk boundary apart
+    from the end of the document.
+    """
+
+    start: int
+    text: str
+    last: bool
+
+    @property
+    def end(self):
+        return self.start + len(self.text)
+
+
+def iter_chunks(text, max_chars=DEFAULT_CHUNK_CHARS, start=0):
+    """Lazily split ``text`` into :class:`Chunk` objects of at most ``max_chars``.
+
+    Chunks end at a paragraph break when one falls inside the window, else at
+    the last sentence end, else at the last whitespace, and only as a last
+    resort mid-word. Each step scans just the next window, so the first chunk
+    is ready in constant time however large the document is. Whitespace-only
+    stretches are skipped rather than spoken. ``start`` begins chunking at that
+    offset (a resume or seek) without copying the text before it.
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be at least 1")
+    size = len(text)
+    match = NON_SPACE.search(text, start)
+    pos = match.start() if match else size
+    while pos < size:
+        limit = min(pos + max_chars, size)
+        end = _chunk_end(text, pos, limit, limit == size)
+        match = NON_SPACE.search(text, end)
+        following = match.start() if match else size
+        yield Chunk(pos, text[pos:end], following >= size)
+        pos = following
+
+
+def window_end(text, min_chars):
+    """Where to cut the first ``min_chars`` or so of ``text`` to prepare them alone.
+
+    The cut follows the first paragraph break after ``min_chars``, else the
+    first sentence end, else whitespace, looking no further than another
+    ``min_chars``, so normalization rules seldom span it. Returns
+    ``len(text)`` when the text is no longer than that or has no such place.
+    """
+    size = len(text)
+    if size <= min_chars:
+        return size
+    limit = min(2 * min_chars, size)
+    for pattern in (PARAGRAPH_BREAK, SENTENCE_END, WHITESPACE):
+        match = pattern.search(text, min_chars, limit)
+        if match:
+            return match.end()
+    return size
+
+
+def iter_stream_chunks(pieces, max_chars=DEFAULT_CHUNK_CHARS):
+    """Like :func:`iter_chunks` but over an iterable of text ``pieces``.
+
+    The pieces (file blocks, paragraphs, chapters...) are concatenated lazily:
+    only a window of about ``2 * max_chars`` is buffered beyond the last cut,
+    so a whole book is chunked without ever being held in one string. Chunk
+    offsets are global across all pieces; the final chunk is held back one
+    step so its ``last`` flag is exact.
+    """
+    buffer = ''
+    base = 0
+    pending = None
+    for piece in pieces:
+        buffer += piece
+        if len(buffer) < 2 * max_chars:
+            continue
+        # Only cut where a whole max_chars window is buffered past the chunk
+        # start, so a stream split never changes where chunks end.
+        safe = len(buffer) - max_chars
+        cut = 0
+        for chunk in iter_chunks(buffer, max_chars):
+            if chunk.end > safe:
+                break
+            if pending is not None:
+                yield pending
+            pending = Chunk(base + chunk.start, chunk.text, False)
+            cut = chunk.end
+        buffer = buffer[cut:]
+        base += cut
+    for chunk in iter_chunks(buffer, max_chars):
+        if pending is not None:
+            yield pending
+        pending = Chunk(base + chunk.start, chunk.text, False)
+    if pending is not None:
+        yield Chunk(pending.start, pending.text, True)
+
+
+def _chunk_end(text, pos, limit, at_end):
+    """Best cut point in ``text[pos:limit]`` (never ``pos`` itself).
+
+    ``at_end`` means the window reaches the end of the document, so only a
+    paragraph break is worth cutting at.
+    """
+    paragraph = PARAGRAPH_BREAK.search(text, pos, limit)
+    if paragraph and paragraph.start() > pos:
+        return paragraph.start()
+    if at_end:
+        return limit
+    cut = None
+    for match in SENTENCE_END.finditer(text, pos, limit):
+        cut = match.end()
+    if cut is None:
+        for match in WHITESPACE.finditer(text, pos, limit):
+            if match.start() > pos:
+                cut = match.start()
+    return cut if cut is not None else limit
+
+
+@dataclass(frozen=True)
+class WordPosition:
+    """Where an engine offset falls in a document, in word units.
+
+    ``number`` is the 0-based index of the word being spoken, so ``number``
+    words are already done and ``remaining`` (including the current one) are
+    left. ``sentence_start``/``sentence_end`` bound the enclosing sentence.
+    """
+
+    number: int
+    total: int
+    remaining: int
+    percent: float
+    sentence_start: int
+    sentence_end: int
+
+
+class WordIndex:
+    """Compact word and sentence offsets for one text, built once per text.
+
+    Word start/end offsets live in ``array('I')`` buffers (4 bytes per entry
+    rather than a Python int object each), and every lookup is a ``bisect`` over
+    them, so the per-word callback cost stays O(log n) and never slices the
+    text, however long the document.
+    """
+
+    def __init__(self, text):
+        self.length = len(text)
+        self.starts = array('I')
+        self.ends = array('I')
+        add_start, add_end = self.starts.append, self.ends.append
+        for match in WORD.finditer(text):
+            add_start(match.start())
+            add_end(match.end())
+        # Sentence starts: 0, then wherever the next word follows a sentence
+        # end or paragraph break.
+        self.sentence_starts = array('I', [0])
+        for match in SENTENCE_END.finditer(text):
+            self.sentence_starts.append(match.end())
+
+    @classmethod
+    def from_arrays(cls, length, starts, ends, sentence_starts):
+        """Rebuild an index from its arrays (e.g. loaded from the document cache)."""
+        index = cls.__new__(cls)
+        index.length = length
+        index.starts = starts
+        index.ends = ends
+        index.sentence_starts = sentence_starts
+        return index
+
+    def __len__(self):
+        return len(self.starts)
+
+    def word_at(self, offset):
+        """0-based number of the word at (or last started before) ``offset``."""
+        return max(bisect_right(self.starts, offset) - 1, 0)
+
+    def word_span(self, number):
+        """``(start, end)`` offsets of word ``number``."""
+        return self.starts[number], self.ends[number]
+
+    def sentence_span(self, offset):
+        """``(start, end)`` offsets of the sentence containing ``offset``."""
+        index = bisect_right(self.sentence_starts, offset) - 1
+        start = self.sentence_starts[max(index, 0)]
+        if index + 1 < len(self.sentence_starts):
+            end = self.sentence_starts[index + 1]
+        else:
+            end = self.length
+        return start, end
+
+    def position(self, offset):
+        """Return the :class:`WordPosition` for an engine ``offset``."""
+        total = len(self.starts)
+        number = self.word_at(offset) if total else 0
+        start, end = self.sentence_span(offset)
+        percent = 100.0 * number / total if total else 0.0
+        return WordPosition(number, total, total - number, percent, start, end)
 
 
 def word_window(spoken_text, location, length, read_trail=100):
@@ -31,6 +480,15 @@ def word_window(spoken_text, location, length, read_trail=100):
     return spoken, current, next_
 
 
-def highlight_indices(location, length):
-    """Single-line tkinter Text indices for the current word."""
-    return "1.{}".format(location), "1.{}".format(location + length)
+def highlight_indices(location, length, offsets=None):
+    """tkinter Text indices for the current word.
+
+    Without ``offsets`` the text is treated as a single line (``"1.{offset}"``).
+    With the :class:`OffsetMap` from :func:`normalize_with_offsets` the spoken
+    offsets are mapped back to ``line.col`` indices in the original text.
+    """
+    if offsets is None:
+        return "1.{}".format(location), "1.{}".format(location + length)
+    start = offsets.to_source(location)
+    end = offsets.to_source_end(location + length)
+    return offsets.line_col(start), offsets.line_col(end)
@@ -0,0 +1,118 @@
+"""Handing speech engine callbacks over to the UI thread.
+
+The engine delivers ``started-utterance``, ``started-word`` and
+``finished-utterance`` on its own loop thread (the pyttsx3 COM/driver pump,
+or the rendered backend's playback thread). Tk widgets must only be touched
+from the main thread, and any time a callback spends on the loop thread
+delays the engine's next event. :class:`EventQueue` makes the loop thread's
+share one append to a ``deque`` (atomic in CPython, so no lock), whatever
+the handler does; the Tk main thread polls the queue with ``after`` and
+runs the handlers there in batches, timing how long each event waited.
+Once the queue has stayed empty for a while it is polled less often, so an
+idle reader costs the UI loop little.
+"""
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# How often the UI thread looks for events, and the most it runs per look
+# before letting Tk handle input and redraw.
+DEFAULT_POLL_MS = 10
+DEFAULT_BATCH = 200
+# After this many empty polls in a row (half a second at 10 ms) the queue
+# is idle and polled every DEFAULT_IDLE_POLL_MS until an event arrives.
+IDLE_POLLS = 50
+DEFAULT_IDLE_POLL_MS = 100
+
+
+class EventQueue:
+    """Runs callbacks :meth:`put` on any thread on the UI thread, in order.
+
+    ``schedule(milliseconds, callback)`` runs a callback on the UI thread
+    later (a Tk widget's ``after``); :meth:`start` begins polling with it.
+    ``applied`` counts events run; ``latency_seconds`` and
+    ``max_latency_seconds`` time them from :meth:`put` to being run, and
+    ``max_batch`` is the most run in one poll.
+    """
+
+    def __init__(self, schedule, poll_ms=DEFAULT_POLL_MS, batch=DEFAULT_BATCH,
+                 clock=time.perf_counter, idle_poll_ms=DEFAULT_IDLE_POLL_MS):
+        self.schedule = schedule
+        self.poll_ms = poll_ms
+        self.idle_poll_ms = idle_poll_ms
+        self.batch = batch
+        self.clock = clock
+        self._events = deque()
+        self._running = False
+        self._empty_polls = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.applied = 0
+        self.latency_seconds = 0.0
+        self.max_latency_seconds = 0.0
+        self.max_batch = 0
+
+    def put(self, callback, *args, **kwargs):
+        """Queue ``callback(*args, **kwargs)`` for the UI thread (any thread, O(1))."""
+        self._events.append((self.clock(), callback, args, kwargs))
+
+    def wrap(self, callback):
+        """``callback`` made to run on the UI thread, for handing to the engine."""
+        return lambda *args, **kwargs: self.put(callback, *args, **kwargs)
+
+    def __len__(self):
+        return len(self._events)
+
+    def start(self):
+        """Poll for events every ``poll_ms`` until :meth:`stop`."""
+        if not self._running:
+            self._running = True
+            self._empty_polls = 0
+            self.schedule(0, self._poll)
+
+    def stop(self):
+        self._running = False
+
+    def _poll(self):
+        if not self._running:
+            return
+        ran = self.drain()
+        self._empty_polls = 0 if ran else self._empty_polls + 1
+        # Come straight back when a backlog is left, else wait for the next poll.
+        if ran == self.batch:
+            delay = 0
+        elif self._empty_polls >= IDLE_POLLS:
+            delay = self.idle_poll_ms
+        else:
+            delay = self.poll_ms
+        self.schedule(delay, self._poll)
+
+    def drain(self, limit=None):
+        """Run up to ``limit`` (default ``batch``) queued events; returns how many ran."""
+        limit = self.batch if limit is None else limit
+        ran = 0
+        while ran < limit:
+            try:
+                posted, callback, args, kwargs = self._events.popleft()
+            except IndexError:
+                break
+            latency = self.clock() - posted
+            self.latency_seconds += latency
+            self.max_latency_seconds = max(self.max_latency_seconds, latency)
+            ran += 1
+            try:
+                callback(*args, **kwargs)
+            except Exception:
+                logger.exception("UI event %s failed", getattr(callback, '__name__', callback))
+        self.applied += ran
+        self.max_batch = max(self.max_batch, ran)
+        return ran
+
+    def summary(self):
+        """One line of event statistics since the last :meth:`reset_stats`."""
+        average = self.latency_seconds / self.applied if self.applied else 0.0
+        return "{} events, latency {:.1f} ms avg, {:.1f} ms max; up to {} per batch".format(
+            self.applied, average * 1000, self.max_latency_seconds * 1000, self.max_batch)
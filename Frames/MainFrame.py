@@ -1,8 +1,11 @@
+import logging
 import threading
 import webbrowser
+from concurrent.futures import Future
+from dataclasses import replace
 import tkinter.ttk as ttk
 from tkinter.constants import END, N, S, E, W, LEFT, RIGHT, CENTER, NORMAL, DISABLED, SEL, INSERT, HORIZONTAL
-from tkinter import Text, StringVar, Toplevel, BooleanVar
+from tkinter import Text, StringVar, Toplevel, BooleanVar, Listbox, filedialog
 import pyttsx3
 from pyttsx3 import engine
 import re
@@ -26,17 +29,45 @@ if platform.system() == 'Windows':
         MEDIA_SESSION_AVAILABLE = False
         print("Windows Media Session API not available - media detection disabled.")
 
-from Core.speech_engine import SpeechEngine
+from Core.speech_engine import LANE_USER, SpeechEngine
 from Core.speak_service import SpeakService
-from Core.config import load_mcp_config, save_enabled_voices
-from Core.text_processing import preprocess_text, word_window, highlight_indices
+from Core.synthesis import look_ahead, speech_backend
+from Core.config import (
+    load_audio_cache, load_document_cache, load_mcp_config, load_normalization_rules,
+    load_speech_config, save_enabled_voices)
+from Core.bookmarks import BookmarkStore, file_key, text_key
+from Core.document_cache import prepare_text
+from Core.document_loader import open_document
+from Core.frame_limiter import FrameLimiter
+from Core.ui_events import EventQueue
+from Core.search_index import SearchIndex
+from Core.sections import Section, SectionIndex, find_headings
+from Core.text_processing import (
+    DEFAULT_CHUNK_CHARS, normalize_with_offsets, iter_chunks, window_end, word_window,
+    highlight_indices, WordIndex)
 from Core.voice_registry import VoiceRegistry
 
+logger = logging.getLogger(__name__)
+
 class MainFrame(ttk.Frame):
     def __init__(self, **kw):
         ttk.Frame.__init__(self, **kw)
-        self.speech = SpeechEngine(self.onStart, self.onStartWord, self.onEnd)
-        self.speak_service = SpeakService(rate=500, speak_fn=self.speak_external)
+        speech_config = load_speech_config()
+        # Engine callbacks arrive on the engine's loop thread; they are queued
+        # there and run on this (Tk main) thread, which polls the queue.
+        self.ui_events = EventQueue(self.after)
+        self.speech = SpeechEngine(self._started_on_engine_thread,
+                                   self.ui_events.wrap(self.onStartWord),
+                                   self.ui_events.wrap(self.onEnd),
+                                   init=speech_backend(speech_config, load_audio_cache()))
+        self.ui_events.start()
+        # Chunks rendered ahead of the one playing (rendered backend only).
+        self.look_ahead = speech_config.look_ahead
+        self.normalization_rules = load_normalization_rules()
+        self.document_cache = load_document_cache()
+        self.speak_service = SpeakService(
+            rate=500, speak_fn=self.speak_external, rules=self.normalization_rules,
+            cache=self.document_cache, max_queue=load_mcp_config().max_queue_depth)
         # Create + pump the pyttsx3 COM engine on ONE dedicated daemon thread.
         # It MUST NOT be created on this (tkinter main) thread, or SAPI5's word
         # callbacks fire on the pump thread with no Python thread state and crash
@@ -46,7 +77,35 @@ class MainFrame(ttk.Frame):
         self.voices = self.speech.get_voices()
         self.voice_registry = self._build_voice_registry()
         self.mcp_host = None  # set by the controller when MCP hosting is enabled
-        self.spoken_text = ''
+        self._spoken_text = ''
+        self.word_index = WordIndex('')
+        # Maps spoken offsets back into the (untouched) Text widget contents;
+        # None while the widget holds exactly the spoken text.
+        self.offset_map = None
+        # Offset of the chunk being spoken within spoken_text (engine word
+        # offsets are chunk-relative), and whether more chunks follow it.
+        self.chunk_offset = 0
+        self.more_chunks = False
+        # The document being streamed by "Open…" (None for pasted text), and
+        # the offset of the chunk on screen within the whole document.
+        self.document = None
+        self.document_offset = 0
+        # Reading positions per document: the content hash of what is being
+        # read (None for agent speech) and the spoken offset last reached.
+        self.bookmarks = BookmarkStore()
+        self.bookmark_key = None
+        self.last_spoken_offset = 0
+        # Inverted index of what is being read, built on a background thread;
+        # search_source is the bookmark key or Document it was built from.
+        self.search_index = None
+        self.search_source = None
+        self.search_hits = []
+        # Headings of what is being read, in the same offset space as the
+        # search index, for next/previous section.
+        self.sections = SectionIndex()
+        # The whole pasted text's preparation while only its first window is
+        # prepared (a Future), else None.
+        self.preparing = None
         self.highlight_index1 = None
         self.highlight_index2 = None
         self.media_was_paused = False  # Track if we paused media playback
@@ -55,10 +114,29 @@ class MainFrame(ttk.Frame):
         self.speech_thread = None
         self.current_session_id = 0
         self.speech_session_id = 0
+        # Word callbacks only record the latest word; this paints it on the
+        # Tk loop at a capped frame rate, skipping words when it falls behind.
+        self.word_renderer = FrameLimiter(self._paint_word, self.after)
         # For test compatibility - engine is None initially, then gets set by speech engine
         self.engine = None
         self.build_frame_content(kw)
 
+    @property
+    def spoken_text(self):
+        return self._spoken_text
+
+    @spoken_text.setter
+    def spoken_text(self, text):
+        # Index the words once per text so each word callback is a bisect, and
+        # size the (word-based) progress bar here rather than on every word.
+        self._set_spoken(text, None, WordIndex(text))
+
+    def _set_spoken(self, text, offset_map, word_index):
+        self._spoken_text = text
+        self.offset_map = offset_map
+        self.word_index = word_index
+        self.progress["maximum"] = max(len(self.word_index), 1)
+
     def _build_voice_registry(self):
         """Build the agent voice registry from system voices + saved config.
 
@@ -81,10 +159,17 @@ class MainFrame(ttk.Frame):
         row_index = 0
 
         self.progress = ttk.Progressbar(self, orient=HORIZONTAL, mode="determinate")
+        # Clicking the progress bar seeks to that point of the document.
+        self.progress.bind("<Button-1>", self.on_progress_click)
         self.progress.grid(row=row_index, columnspan=4, sticky=(W, E))
 
         row_index += 1
 
+        self.progress_label = ttk.Label(self, anchor=CENTER)
+        self.progress_label.grid(row=row_index, column=0, columnspan=4, sticky=(W, E))
+
+        row_index += 1
+
 
         self.grid_rowconfigure(row_index, weight=1)
         self.title = ttk.Label(self, font=("Georgia", "80"), justify=RIGHT, text="Speed Reader", anchor=CENTER)
@@ -167,6 +252,21 @@ class MainFrame(ttk.Frame):
         self.server_status_button.grid(row=2, column=0, columnspan=2, sticky=W, pady=(10, 0))
         row_index += 1
 
+        # Find: type to search the document, pick a hit to read from there.
+        self.search_frame = ttk.Frame(self)
+        self.search_frame.grid(row=row_index, column=0, columnspan=4, sticky=(W, E), pady=(0, 10))
+        self.search_frame.grid_columnconfigure(2, weight=1)
+        self.search_label = ttk.Label(self.search_frame, text="Find: ")
+        self.search_label.grid(row=0, column=0, sticky=N, padx=(0, 5))
+        self.search_var = StringVar()
+        self.search_entry = ttk.Entry(self.search_frame, width=24, textvariable=self.search_var)
+        self.search_entry.grid(row=0, column=1, sticky=N, padx=(0, 10))
+        self.search_var.trace_add("write", self.on_search_changed)
+        self.search_results = Listbox(self.search_frame, height=3, activestyle="none")
+        self.search_results.grid(row=0, column=2, sticky=(W, E))
+        self.search_results.bind("<<ListboxSelect>>", self.on_search_result_selected)
+        row_index += 1
+
 
 
         self.grid_rowconfigure(row_index, weight=1)
@@ -176,6 +276,9 @@ class MainFrame(ttk.Frame):
         self.text_area.grid(row=row_index, column=0, columnspan=4, sticky=(N, S, E, W))
         row_index += 1
 
+        self.open_button = ttk.Button(self, text="Open…", command=self.open_document_dialog)
+        self.open_button.grid(row=row_index, column=0, sticky=E, pady=10)
+
         self.speak_button = ttk.Button(self, text="Speak")
         self.speak_button.grid(row=row_index, column=1, pady=10)
         self.speak_button['state'] = NORMAL
@@ -185,6 +288,22 @@ class MainFrame(ttk.Frame):
         self.stop_button.grid(row=row_index, column=2, pady=10)
         self.stop_button['state'] = DISABLED
         self.stop_button.bind("<Button-1>", self.stop)
+
+        self.resume_button = ttk.Button(self, text="Resume", command=self.resume)
+        self.resume_button.grid(row=row_index, column=3, sticky=W, pady=10)
+        row_index += 1
+
+        self.navigation_frame = ttk.Frame(self)
+        self.navigation_frame.grid(row=row_index, column=0, columnspan=4)
+        self.previous_section_button = ttk.Button(
+            self.navigation_frame, text="◀ Section", command=self.previous_section)
+        self.previous_section_button.grid(row=0, column=0, padx=5)
+        self.repeat_sentence_button = ttk.Button(
+            self.navigation_frame, text="Repeat Sentence", command=self.repeat_sentence)
+        self.repeat_sentence_button.grid(row=0, column=1, padx=5)
+        self.next_section_button = ttk.Button(
+            self.navigation_frame, text="Section ▶", command=self.next_section)
+        self.next_section_button.grid(row=0, column=2, padx=5)
         row_index += 1
 
         self.contribute_button = ttk.Button(self, text="Contribute on GitHub", command=self.open_contribute)
@@ -200,12 +319,19 @@ class MainFrame(ttk.Frame):
         # a single, clean interrupt.
         self.master.bind("<Control-KeyRelease-b>", self.paste_and_speak)
         self.master.bind("<Control-KeyRelease-B>", self.paste_and_speak)
+        # Section navigation; on release for the same auto-repeat reason.
+        self.master.bind("<Alt-KeyRelease-Right>", self.next_section)
+        self.master.bind("<Alt-KeyRelease-Left>", self.previous_section)
+        self.master.bind("<Alt-KeyRelease-r>", self.repeat_sentence)
+        self.master.bind("<Alt-KeyRelease-R>", self.repeat_sentence)
 
         self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def on_closing(self):
-        # Stop any ongoing speech and clean up resources
+        # Stop any ongoing speech and clean up resources (force_stop_and_reset
+        # also saves the reading position).
         self.force_stop_and_reset()
+        self.ui_events.stop()
         self.master.destroy()
         self.master.quit()
 
@@ -360,11 +486,14 @@ class MainFrame(ttk.Frame):
         
         # Start speaking the new text, interrupting (flushing) anything already
         # queued or playing so the pasted text plays now instead of waiting for
-        # the queue to drain.
+        # the queue to drain. Agent utterances still waiting their turn in the
+        # speak service are dropped too.
+        self.speak_service.flush()
         self.speak(event, interrupt=True)
 
     def force_stop_and_reset(self):
         """Force stop current speech and reset engine for fresh start."""
+        self.save_bookmark()
         self.stop_requested = True
         
         # Increment session ID to invalidate any pending callbacks from old session
@@ -382,6 +511,9 @@ class MainFrame(ttk.Frame):
         # Wait briefly for the speech thread to finish
         if self.speech_thread is not None and self.speech_thread.is_alive():
             self.speech_thread.join(timeout=0.5)
+
+        # Chunks rendered ahead for the old position will not be read now.
+        self.speech.discard_prefetched()
         
         # Reset state
         self.is_speaking = False
@@ -391,10 +523,12 @@ class MainFrame(ttk.Frame):
 
     def clear_display_labels(self):
         """Clear all the display labels and progress."""
+        self.word_renderer.cancel()
         self.spoken_words['text'] = ''
         self.current_word_label['text'] = ''
         self.next_words['text'] = ''
         self.progress["value"] = 0
+        self.progress_label['text'] = ''
         
         # Clear highlighting
         if self.highlight_index1 is not None:
@@ -493,7 +627,15 @@ class MainFrame(ttk.Frame):
     def stop(self, event):
         """Stop current speech when stop button is clicked."""
         if self.stop_button['state'].__str__() == NORMAL:
-            self.speech.stop()
+            # Tell the chunk feeder not to queue the rest of the document.
+            self.stop_requested = True
+            self.more_chunks = False
+            self.save_bookmark()
+            # Drop this reading's queued look-ahead chunk along with the one
+            # playing; anything else playing (agent speech) is just stopped.
+            if not self.speech.cancel_named(self.speech_session_id):
+                self.speech.stop()
+            self.speech.discard_prefetched()
             self.speak_button['state'] = NORMAL
             self.stop_button['state'] = DISABLED
 
@@ -509,38 +651,73 @@ class MainFrame(ttk.Frame):
         """
         return isinstance(name, int) and name != self.current_session_id
 
-    def onStart(self, name):
+    def _started_on_engine_thread(self, name):
+        """started-utterance, on the engine thread: queue ``onStart`` with the utterance.
+
+        The utterance is taken now; by the time the UI thread runs ``onStart``
+        the engine may already have moved on to the next one.
+        """
+        self.ui_events.put(self.onStart, name, self.speech.current)
+
+    def onStart(self, name, utterance=None):
         """Called when an utterance starts."""
         # Ignore callbacks from old speech sessions
         if self._is_stale_utterance(name):
             return
         if self.current_session_id != self.speech_session_id:
             return
+        if utterance is None:
+            utterance = self.speech.current
+        if utterance is not None and utterance.context is not None:
+            # A pipelined chunk: word offsets are relative to its start.
+            self.chunk_offset, self.more_chunks = utterance.context
+        already_speaking = self.is_speaking
         self.is_speaking = True
         self.stop_requested = False
         self.speak_button['state'] = DISABLED
         self.stop_button['state'] = NORMAL
         
-        # Pause any system media playing
-        self.pause_system_media()
+        # Pause any system media playing (once per reading, not per chunk)
+        if not already_speaking:
+            self.pause_system_media()
         print(f"onStart: {name}")
 
     def onStartWord(self, name, location, length):
         if self._is_stale_utterance(name):
             return
+        location += self.chunk_offset
+        self.last_spoken_offset = location
+        self.word_renderer.post(self.current_session_id, location, length)
+
+    def _paint_word(self, session, location, length):
+        """Show the word at spoken ``location`` (run by ``word_renderer``)."""
+        if session != self.current_session_id:
+            return
         spoken, current, next_ = word_window(self.spoken_text, location, length)
         self.spoken_words['text'] = spoken
         self.current_word_label['text'] = current
         self.next_words['text'] = next_
+        self._move_highlight(location, length)
+
+        position = self.word_index.position(location)
+        self.progress["value"] = position.number
+        if self.document is not None:
+            read = 100.0 * (self.document_offset + location) / max(self.document.size_hint, 1)
+            self.progress_label['text'] = "{} · about {:.0f}% read".format(
+                self.document.title, min(read, 100.0))
+        else:
+            self.progress_label['text'] = "Word {} of {} ({:.0f}%) · {} left".format(
+                position.number + 1, position.total, position.percent, position.remaining)
+
+    def _move_highlight(self, location, length):
+        """Highlight spoken ``location``/``length`` in the Text widget."""
         if self.highlight_index1 is not None:
             self.text_area.tag_remove(TAG_CURRENT_WORD, self.highlight_index1, self.highlight_index2)
-        self.highlight_index1, self.highlight_index2 = highlight_indices(location, length)
+        self.highlight_index1, self.highlight_index2 = highlight_indices(
+            location, length, self.offset_map)
         self.text_area.see(self.highlight_index1)
         self.text_area.tag_add(TAG_CURRENT_WORD, self.highlight_index1, self.highlight_index2)
 
-        self.progress["maximum"] = self.spoken_text.__len__()
-        self.progress["value"] = location
-
     def onEnd(self, name, completed):
         """Called when an utterance finishes.
         
@@ -555,15 +732,29 @@ class MainFrame(ttk.Frame):
         if is_old_session:
             print(f"onEnd: {name} - ignored (old session)")
             return
+
+        if completed and self.more_chunks:
+            # A chunk boundary, not the end of the document: keep the UI in
+            # its speaking state while the next chunk starts.
+            return
             
         self.is_speaking = False
         self.speak_button['state'] = NORMAL
         self.stop_button['state'] = DISABLED
+        # Show the last word spoken before clearing its highlight.
+        self.word_renderer.flush()
+        logger.debug("Word display: %s", self.word_renderer.summary())
+        logger.debug("Speech events: %s", self.ui_events.summary())
+        logger.debug("Speech engine: %s", self.speech.stats.summary())
+        self.word_renderer.reset_stats()
+        self.ui_events.reset_stats()
         
         if completed:
             # Speech completed normally - update progress to 100%
-            self.progress["maximum"] = self.spoken_text.__len__()
-            self.progress["value"] = self.spoken_text.__len__()
+            self.progress["value"] = self.progress["maximum"]
+            if self.bookmark_key is not None:
+                # Read to the end: the next reading starts from the top.
+                self.bookmarks.clear(self.bookmark_key)
             print(f"onEnd: {name} - completed successfully")
         else:
             # Speech was interrupted/stopped
@@ -612,40 +803,461 @@ class MainFrame(ttk.Frame):
 
     def speak(self, event, interrupt=False):
         if self.speak_button['state'].__str__() == NORMAL:
-            self.spoken_text = preprocess_text(self.text_area.get("1.0", END))
-            self.text_area.delete("1.0", END)
-            self.text_area.insert(END, self.spoken_text)
+            # Only the first window is normalized before the first word: the
+            # rest of a long text is prepared on a worker while it is spoken.
+            text = self.text_area.get("1.0", END)
+            cut = window_end(text, FIRST_WINDOW_CHARS)
+            if cut == len(text):
+                self.prepare_text_area(text)
+                self.speak_from(0, interrupt)
+                return
+            self.prepare_window(text[:cut])
+            self.speak_from(0, interrupt, rest=(cut, self._prepare_async(text)))
+
+    def prepare_text_area(self, text=None):
+        """Normalize and index the Text widget's contents for speaking."""
+        # Normalize into a separate spoken string and leave the widget as
+        # pasted: re-inserting a large document is far slower than mapping
+        # the engine's offsets back through offset_map. A long text read
+        # before comes back from the document cache already indexed.
+        if text is None:
+            text = self.text_area.get("1.0", END)
+        if self.document_cache is not None:
+            prepared = self.document_cache.prepare(text, self.normalization_rules)
+        else:
+            prepared = prepare_text(text, self.normalization_rules)
+        self.document = None
+        self.document_offset = 0
+        self.preparing = None
+        self.text_area.edit_modified(False)
+        key = text_key(text)
+        self._use_prepared(key, prepared, None if self.search_source == key else find_headings(text))
+
+    def prepare_window(self, window):
+        """Prepare just ``window``, the start of the Text widget's contents.
+
+        Search and sections are cleared until the whole text is prepared (the
+        Find box prepares it on demand if asked first).
+        """
+        spoken, offsets = normalize_with_offsets(window, self.normalization_rules)
+        self.document = None
+        self.document_offset = 0
+        self.bookmark_key = None
+        self._set_spoken(spoken, offsets, WordIndex(spoken))
+        self.text_area.edit_modified(False)
+        if self.search_index is not None:
+            self.search_index.cancel()
+        self.search_index = self.search_source = None
+        self.sections = SectionIndex()
+
+    def _prepare_async(self, text):
+        """A Future of ``text`` prepared on a worker, swapped in once ready."""
+        future = Future()
+        self.preparing = future
+        thread = threading.Thread(target=self._prepare_on_thread, args=(text, future))
+        thread.daemon = True
+        thread.start()
+        return future
+
+    def _prepare_on_thread(self, text, future):
+        try:
+            if self.document_cache is not None:
+                prepared = self.document_cache.prepare(text, self.normalization_rules)
+            else:
+                prepared = prepare_text(text, self.normalization_rules)
+            key = text_key(text)
+            headings = find_headings(text)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        # Queued before the result is set, so the swap runs on the UI thread
+        # ahead of any word from the chunks spoken from the whole text.
+        self.ui_events.put(self._swap_prepared, future, key, prepared, headings)
+        future.set_result(prepared)
+
+    def _swap_prepared(self, future, key, prepared, headings):
+        # The window is cut where rules seldom reach across, so its spoken
+        # text is a prefix of the whole text's and words of its chunks still
+        # playing land in the same place.
+        if future is self.preparing:
+            self.preparing = None
+            self._use_prepared(key, prepared, headings)
+
+    def _use_prepared(self, key, prepared, headings):
+        """Make ``prepared`` (keyed ``key``) what is read; ``headings`` if not indexed yet."""
+        self.bookmark_key = key
+        self._set_spoken(prepared.spoken, prepared.offsets, prepared.words)
+        if headings is not None:
+            self._build_search_index(key, [(0, prepared.spoken)])
+            # Headings need the source's line structure; index them in the
+            # spoken text's offsets like everything else for pasted text.
+            self.sections = SectionIndex(
+                Section(prepared.offsets.to_spoken(heading.offset), heading.title, heading.level)
+                for heading in headings)
+
+    def speak_from(self, start, interrupt=False, rest=None):
+        """Speak the prepared ``spoken_text`` from spoken offset ``start`` on.
+
+        ``rest`` is ``(cut, future)`` when ``spoken_text`` is only the text up
+        to source offset ``cut``: reading goes on from there in the whole
+        text's preparation, the ``future``'s result.
+        """
+        self.stop_requested = False
+        self.last_spoken_offset = start
 
-            speech_speed = int(self.speed_entry.get())
-            
-            # Increment session ID for this new speech and mark it active so the
-            # engine callbacks (onStart/onStartWord/onEnd) recognize it instead
-            # of treating it as a stale session and bailing out — that bail-out
-            # is what previously left the Stop button disabled while speaking.
-            self.speech_session_id += 1
-            session_id = self.speech_session_id
-            self.current_session_id = session_id
-
-            self.thread = threading.Thread(target=self.speak_on_thread, args=(speech_speed, self.spoken_text, interrupt, session_id))
-            self.thread.daemon = True
-            self.thread.start()
-
-    def speak_on_thread(self, speech_speed, spoken_text, interrupt=False, name=None):
-        self.speech.speak(spoken_text, speech_speed, interrupt=interrupt, name=name)
-
-    def speak_external(self, text, rate, voice=None):
-        # Entry point for MCP agent speech (called from the server thread).
-        # Update the UI on the tkinter main thread, but run the BLOCKING speak on
-        # this server thread (never inside `after`, which would freeze the UI).
+        speech_speed = int(self.speed_entry.get())
+
+        # Increment session ID for this new speech and mark it active so the
+        # engine callbacks (onStart/onStartWord/onEnd) recognize it instead
+        # of treating it as a stale session and bailing out — that bail-out
+        # is what previously left the Stop button disabled while speaking.
+        self.speech_session_id += 1
+        session_id = self.speech_session_id
+        self.current_session_id = session_id
+
+        self.thread = threading.Thread(
+            target=self.speak_on_thread,
+            args=(speech_speed, self.spoken_text, interrupt, session_id, start, rest))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def save_bookmark(self):
+        """Remember how far the current document was read."""
+        if self.bookmark_key is None or not (self.last_spoken_offset or self.document_offset):
+            return
+        offset = self.last_spoken_offset
+        if self.offset_map is not None:
+            offset = self.offset_map.to_source(offset)
+        title = self.document.title if self.document is not None else None
+        self.bookmarks.set(self.bookmark_key, self.document_offset + offset, title)
+
+    def resume(self, event=None):
+        """Continue the open document (or the text shown) from its bookmark."""
+        self.force_stop_and_reset()
+        if self.document is not None:
+            self.read_document(self.document, resume=True)
+            return
+        self.prepare_text_area()
+        offset = self.bookmarks.get(self.bookmark_key) or 0
+        self._seek_spoken(self.offset_map.to_spoken(offset))
+
+    def on_progress_click(self, event):
+        width = self.progress.winfo_width()
+        if width > 1:
+            self.seek_to_percent(100.0 * event.x / width)
+
+    def seek_to_percent(self, percent):
+        """Restart reading ``percent`` of the way through the document."""
+        percent = min(max(percent, 0.0), 100.0)
+        self.force_stop_and_reset()
+        if self.document is not None:
+            self.read_document(self.document, start=int(self.document.size_hint * percent / 100))
+            return
+        if not self.spoken_text or self.preparing is not None:
+            # Percentages are of the whole text, not just its first window.
+            self.prepare_text_area()
+        total = len(self.word_index)
+        if not total:
+            return
+        number = min(int(total * percent / 100), total - 1)
+        self._seek_spoken(self.word_index.starts[number])
+
+    def _seek_spoken(self, offset):
+        # Back up to the start of the word so speech never begins mid-word;
+        # the word index makes this a bisect, and speak_from re-queues only
+        # the remainder of the already-prepared text.
+        if len(self.word_index):
+            offset = self.word_index.starts[self.word_index.word_at(offset)]
+        self.clear_display_labels()
+        self.speech.discard_prefetched()
+        self.speak_from(offset, interrupt=True)
+
+    def speak_on_thread(self, speech_speed, spoken_text, interrupt=False, name=None, start=0,
+                        rest=None):
+        # Feed the document to the engine one chunk at a time so the first word
+        # plays as soon as the first chunk is ready, however long the text is.
+        # The next chunk is queued while the current one plays, so the engine
+        # starts it straight from the finished callback with no gap; each
+        # chunk carries its offset as context, which onStart picks up so
+        # chunk_offset always belongs to the utterance being spoken. With the
+        # rendered backend, the next few chunks are also rendered ahead.
+        playing = None
+        chunks = look_ahead(self._chunks(spoken_text, start, rest), self.look_ahead,
+                            lambda chunk: self.speech.prefetch(chunk.text, speech_speed))
+        for chunk in chunks:
+            if self.stop_requested or (name is not None and name != self.speech_session_id):
+                break
+            queued = self.speech.speak(chunk.text, speech_speed, block=False, interrupt=interrupt,
+                                       name=name, context=(chunk.start, not chunk.last),
+                                       lane=LANE_USER)
+            interrupt = False
+            if playing is not None:
+                playing.wait(timeout=600)
+            playing = queued
+        if playing is not None:
+            playing.wait(timeout=600)
+        self.ui_events.put(self._reading_finished, name)
+
+    def _reading_finished(self, name):
+        # Nothing more is queued for reading ``name``, whatever its last
+        # chunk's context said (it may have stopped early).
+        if name is None or name == self.speech_session_id:
+            self.more_chunks = False
+
+    @staticmethod
+    def _chunks(spoken_text, start, rest):
+        """Chunks of ``spoken_text`` from ``start``, then of the rest (see :meth:`speak_from`)."""
+        if rest is None:
+            yield from iter_chunks(spoken_text, start=start)
+            return
+        # The window's last chunk is held until the rest is known, so its
+        # ``last`` flag stays exact.
+        held = None
+        for chunk in iter_chunks(spoken_text, start=start):
+            if held is not None:
+                yield replace(held, last=False)
+            held = chunk
+        cut, future = rest
+        try:
+            prepared = future.result()
+        except Exception as e:
+            print(f"Error preparing text: {e}")
+            prepared = None
+        following = iter(()) if prepared is None else iter_chunks(
+            prepared.spoken, start=prepared.offsets.to_spoken(cut))
+        for chunk in following:
+            if held is not None:
+                yield replace(held, last=False)
+                held = None
+            yield chunk
+        if held is not None:
+            yield held
+
+    def open_document_dialog(self):
+        """Ask for a .txt/.html/.epub file and read it aloud as a stream."""
+        path = filedialog.askopenfilename(parent=self, title="Open document", filetypes=[
+            ("Documents", "*.txt *.text *.md *.html *.htm *.xhtml *.epub"),
+            ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            document = open_document(path)
+        except (OSError, ValueError) as e:
+            print(f"Error opening document: {e}")
+            return
+        self.read_document(document)
+
+    def read_document(self, document, start=0, resume=False):
+        """Stop whatever is playing and stream ``document`` chunk by chunk.
+
+        Only the chunk being spoken is ever placed in the Text widget, so a
+        whole book never has to be loaded into Tk (or one Python string).
+        Reading begins at document offset ``start``, or at the document's
+        bookmark when ``resume`` is set.
+        """
+        self.force_stop_and_reset()
+        self.clear_display_labels()
+        if self.search_source is not document:
+            self.sections = SectionIndex()
+            self._build_search_index(document, self._ingest_document(document, self.sections))
+        self.document = document
+        self.document_offset = 0
+        self.last_spoken_offset = 0
+        self.bookmark_key = None
+        self.preparing = None
+        self.speech_session_id += 1
+        session_id = self.speech_session_id
+        self.current_session_id = session_id
+        speech_speed = int(self.speed_entry.get())
+        self.thread = threading.Thread(
+            target=self.read_document_on_thread,
+            args=(document, speech_speed, session_id, start, resume))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def read_document_on_thread(self, document, speech_speed, name, start=0, resume=False):
+        interrupt = True
+        try:
+            # Hash the file here, off the main thread: bookmarks are keyed by
+            # content so a moved or renamed book still resumes.
+            key = file_key(document.path)
+            if name == self.speech_session_id:
+                self.bookmark_key = key
+            if resume:
+                start = self.bookmarks.get(key) or 0
+            pieces = look_ahead(
+                self._document_pieces(document, start), self.look_ahead,
+                lambda piece: self.speech.prefetch(piece[1][piece[3]:], speech_speed))
+            for chunk, spoken_text, offset_map, spoken_start in pieces:
+                if self.stop_requested or name != self.speech_session_id:
+                    break
+                # Tk must only be touched from the main thread: hand the chunk
+                # over behind the previous chunk's queued word callbacks (so
+                # none is painted against it) and wait until it is on screen
+                # before speaking it. Its offset and whether more follow go
+                # with the utterance, for onStart and onEnd.
+                shown = threading.Event()
+                self.ui_events.put(self._show_document_chunk, chunk, spoken_text, offset_map,
+                                   spoken_start, shown)
+                shown.wait(timeout=1)
+                self.speech.speak(spoken_text[spoken_start:], speech_speed,
+                                  interrupt=interrupt, name=name,
+                                  context=(spoken_start, not chunk.last), lane=LANE_USER)
+                interrupt = False
+        except (OSError, ValueError) as e:
+            print(f"Error reading document: {e}")
+        self.ui_events.put(self._reading_finished, name)
+
+    def _document_pieces(self, document, start):
+        """Chunks of ``document`` from ``start`` on, each with its spoken text.
+
+        Yields ``(chunk, spoken_text, offset_map, spoken_start)``; chunks
+        before ``start`` are extracted but never normalized, shown or spoken.
+        """
+        for chunk in document.iter_chunks():
+            if chunk.end <= start and not chunk.last:
+                continue
+            spoken_text, offset_map = normalize_with_offsets(chunk.text, self.normalization_rules)
+            spoken_start = 0
+            if start > chunk.start:
+                spoken_start = offset_map.to_spoken(min(start, chunk.end) - chunk.start)
+                # Back up to the start of that word.
+                spoken_start = spoken_text.rfind(' ', 0, spoken_start) + 1
+            yield chunk, spoken_text, offset_map, spoken_start
+
+    def _show_document_chunk(self, chunk, spoken_text, offset_map, spoken_start, shown):
+        # A word of the previous chunk not painted yet would land on this one.
+        self.word_renderer.cancel()
+        self.text_area.delete("1.0", END)
+        self.text_area.insert(END, chunk.text)
+        self.spoken_text = spoken_text
+        self.offset_map = offset_map
+        self.chunk_offset = spoken_start
+        self.last_spoken_offset = spoken_start
+        self.document_offset = chunk.start
+        shown.set()
+
+    @staticmethod
+    def _ingest_document(document, sections):
+        """Stream ``document`` for the search index, collecting its headings."""
+        headings = []
+        for chunk in document.iter_chunks(headings=headings):
+            for heading in headings:
+                sections.add(heading)
+            del headings[:]
+            yield chunk.start, chunk.text
+
+    def current_position(self):
+        """Offset of the word being read, as the search and section indexes count.
+
+        Source offsets for an opened document, spoken offsets for pasted text.
+        """
+        if self.document is None:
+            return self.last_spoken_offset
+        offset = self.last_spoken_offset
+        if self.offset_map is not None:
+            offset = self.offset_map.to_source(offset)
+        return self.document_offset + offset
+
+    def next_section(self, event=None):
+        """Skip to the start of the next heading."""
+        target = self.sections.next_start(self.current_position())
+        if target is not None:
+            self._restart_at(target)
+
+    def previous_section(self, event=None):
+        """Back to the start of this section, or the previous one if just started."""
+        self._restart_at(self.sections.previous_start(self.current_position()))
+
+    def repeat_sentence(self, event=None):
+        """Read the current sentence again."""
+        start, _ = self.word_index.sentence_span(self.last_spoken_offset)
+        if self.document is not None:
+            if self.offset_map is not None:
+                start = self.offset_map.to_source(start)
+            start += self.document_offset
+        self._restart_at(start)
+
+    def _restart_at(self, offset):
+        # Restart the engine at a section/sentence boundary: the next
+        # utterance begins exactly there, nothing before it is re-queued.
+        if self.document is not None:
+            self.read_document(self.document, start=offset)
+        elif self.spoken_text:
+            self.force_stop_and_reset()
+            self._seek_spoken(offset)
+
+    def _build_search_index(self, source, pieces):
+        """Start indexing ``pieces`` in the background for the search box."""
+        if self.search_index is not None:
+            self.search_index.cancel()
+        self.search_index = SearchIndex()
+        self.search_source = source
+        self.search_hits = []
+        # Refresh the results once indexing finishes (hits found so far are
+        # shown while it runs).
+        self.search_index.build_async(
+            pieces, on_complete=lambda index: self.after(0, self.on_search_changed))
+
+    def on_search_changed(self, *args):
+        """Look up the Find box's text and list the hits."""
+        query = self.search_var.get()
+        if self.document is None and (self.search_index is None or self.text_area.edit_modified()):
+            # Pasted or edited text that has not been indexed yet.
+            self.prepare_text_area()
+        self.search_hits = self.search_index.search(query) if query.strip() else []
+        self.search_results.delete(0, END)
+        for hit in self.search_hits:
+            self.search_results.insert(END, self._describe_hit(hit))
+
+    def _describe_hit(self, hit):
+        if self.document is not None:
+            percent = 100.0 * hit.offset / max(self.document.size_hint, 1)
+            return "about {:.0f}% into {}".format(min(percent, 100.0), self.document.title)
+        start = max(hit.offset - 30, 0)
+        return "…" + self.spoken_text[start:hit.offset + 50].strip() + "…"
+
+    def on_search_result_selected(self, event=None):
+        selection = self.search_results.curselection()
+        if selection and selection[0] < len(self.search_hits):
+            self.jump_to_hit(self.search_hits[selection[0]])
+
+    def jump_to_hit(self, hit):
+        """Move the highlight to a search hit and read on from there."""
+        self.force_stop_and_reset()
+        if self.document is not None:
+            self.read_document(self.document, start=hit.offset)
+            return
+        self.clear_display_labels()
+        start, end = self.word_index.word_span(self.word_index.word_at(hit.offset))
+        self._move_highlight(start, end - start)
+        self.speak_from(start, interrupt=True)
+
+    def speak_external(self, text, rate, voice=None, on_word=None):
+        # Entry point for MCP agent speech (called from the SpeakService worker
+        # thread). Update the UI on the tkinter main thread, but run the BLOCKING
+        # speak on this worker thread (never inside `after`, which would freeze
+        # the UI).
         # Blocking serializes per-utterance voices so agents don't bleed voices.
+        # Returns how the speech ended, for the speak service's handle, and
+        # reports words to ``on_word`` so each part of a merged run finishes
+        # when it has been read.
         self.after(0, lambda: self._render_external(text))
-        self.speech.speak(text, rate, voice=voice, block=True)
+        return self.speech.submit(text, rate, voice=voice, on_word=on_word).result(timeout=600)
 
     def _render_external(self, text):
+        # The shown text is no longer the user's document: keep its place.
+        self.save_bookmark()
+        self.bookmark_key = None
+        self.preparing = None
         self.spoken_text = text
+        self.chunk_offset = 0
         self.text_area.delete("1.0", END)
         self.text_area.insert(END, text)
 
 
 TAG_CURRENT_WORD = "current word"
+# Pasted text is spoken from its first this many characters (about) while
+# the rest is prepared.
+FIRST_WINDOW_CHARS = 8 * DEFAULT_CHUNK_CHARS
 GITHUB_URL = "https://github.com/ChrisLucian/SpeedReader"
@@ -1,3 +1,10 @@
+import multiprocessing
+
 from Controllers.SpeedReaderController import SpeedReaderController
-app = SpeedReaderController()
-app.mainloop()
+
+if __name__ == "__main__":
+    # Rendering processes (Core.synthesis) re-import this module on Windows,
+    # and in the frozen build, so the app must only start here.
+    multiprocessing.freeze_support()
+    app = SpeedReaderController()
+    app.mainloop()
@@ -13,13 +13,18 @@ Either way the server reuses the GUI-free logic in ``Core`` and speaks at the
 rate held by a shared :class:`~Core.speak_service.SpeakService` (kept in sync
 with the UI), so agent speech matches the WPM the user has set.
 """
+import asyncio
 import threading
 
 from mcp.server.fastmcp import FastMCP
 
 from Core.call_detection import microphone_in_use
-from Core.config import load_mcp_config
+from Core.config import (
+    load_audio_cache, load_document_cache, load_mcp_config, load_normalization_rules,
+    load_speech_config)
 from Core.speak_service import SpeakService
+from Core.speech import EngineWorker
+from Core.synthesis import speech_backend
 from Core.voice_registry import VoiceRegistry
 
 
@@ -31,7 +36,10 @@ def build_mcp(service=None, registry=None, host="127.0.0.1", port=8765,
     while a call is detected (``call_active()`` — microphone in use by default)
     and returns a message instead, so agent speech never talks over the user.
     """
-    service = service or SpeakService()
+    service = service or SpeakService(
+        speak_fn=EngineWorker(init=speech_backend(load_speech_config(), load_audio_cache())),
+        rules=load_normalization_rules(), cache=load_document_cache(),
+        max_queue=load_mcp_config().max_queue_depth)
     registry = registry if registry is not None else VoiceRegistry()
     call_active = call_active or microphone_in_use
     server = FastMCP("SpeedReader", host=host, port=port)
@@ -71,9 +79,16 @@ def build_mcp(service=None, registry=None, host="127.0.0.1", port=8765,
         released = registry.release(agent)
         return "Released voice for %s." % agent if released else "No voice was claimed by %s." % agent
 
+    def lookup(utterance_id):
+        utterance = service.get(utterance_id)
+        if utterance is None:
+            raise ValueError("No utterance with id {} (unknown or long finished).".format(
+                utterance_id))
+        return utterance
+
     @server.tool()
-    def speak(text: str, agent: str | None = None, voice: str | None = None,
-              rate: int | None = None) -> str:
+    async def speak(text: str, agent: str | None = None, voice: str | None = None,
+                    rate: int | None = None, wait: bool = True) -> str:
         """Read text aloud on the host machine using the local TTS voice.
 
         Reserve a voice first: call ``claim_voice(agent="<your repo folder or
@@ -82,26 +97,77 @@ def build_mcp(service=None, registry=None, host="127.0.0.1", port=8765,
         more than one voice is enabled.
 
         Args:
-            text: The text to speak. Newlines are collapsed to spaces and URLs
-                are replaced with a ``[URL]`` placeholder before speaking.
+            text: The text to speak. Newlines are collapsed to spaces and the
+                user's normalization rules (URLs, code blocks, paths, hashes...)
+                are applied before speaking.
             agent: Your identity; resolves to the voice you reserved with
                 ``claim_voice``.
             voice: Optional specific voice (name or id) to speak with, overriding
                 the reservation.
             rate: Words per minute. Omit to use the rate set in the UI.
+            wait: Return only once the text has been spoken (default). Pass
+                ``False`` to queue it and return at once with an utterance id
+                for ``speak_status``/``wait_for``, so you can keep working
+                while it plays.
+
+        Agents take turns: while several are speaking, each gets a fair share
+        of speaking time and its own utterances play in order. An agent that
+        already has too many utterances waiting (``mcp.max_queue_depth``) gets
+        an error instead; wait for one (``wait_for``) and try again.
 
         Returns:
-            A short confirmation of what was spoken.
+            A short confirmation of what was spoken, or queued with its id.
         """
         if pause_when_mic_in_use and call_active():
             return "Skipped: a call is in progress (microphone in use); speech was not played."
         chosen = registry.resolve_for_speak(agent=agent, voice=voice)
-        used = service.speak(text, rate, voice=chosen)
+        if not wait:
+            utterance = service.submit(text, rate, voice=chosen, agent=agent)
+            return "Queued utterance {} ({} characters at {} WPM).".format(
+                utterance.id, len(text), utterance.rate)
+        # Off the event loop, so other requests are served while this speaks.
+        used = await asyncio.to_thread(service.speak, text, rate, voice=chosen, agent=agent)
         return "Spoke {} characters at {} WPM.".format(len(text), used)
 
+    @server.tool()
+    def speak_status(utterance_id: int) -> dict:
+        """Report on an utterance queued with ``speak(wait=False)``.
+
+        Returns:
+            ``{id, state, queued_at, started_at, finished_at, error}``, where
+            ``state`` is ``queued``, ``speaking``, ``done``, ``cancelled`` or
+            ``failed`` and the times are Unix timestamps (``None`` until
+            reached).
+        """
+        return describe_utterance(lookup(utterance_id))
+
+    @server.tool()
+    async def wait_for(utterance_id: int, timeout: float = 60) -> dict:
+        """Wait up to ``timeout`` seconds for a queued utterance to finish.
+
+        Returns:
+            The same status as ``speak_status``; ``state`` is still ``queued``
+            or ``speaking`` if the timeout expired first.
+        """
+        utterance = lookup(utterance_id)
+        await asyncio.to_thread(utterance.wait, timeout)
+        return describe_utterance(utterance)
+
     return server, service, registry
 
 
+def describe_utterance(utterance):
+    """The JSON-friendly status of an :class:`~Core.speech_engine.Utterance`."""
+    return {
+        "id": utterance.id,
+        "state": utterance.state,
+        "queued_at": utterance.queued_at,
+        "started_at": utterance.started_at,
+        "finished_at": utterance.finished_at,
+        "error": None if utterance.error is None else str(utterance.error),
+    }
+
+
 def start_http_in_thread(service, registry=None, host="127.0.0.1", port=8765,
                          pause_when_mic_in_use=False):
     """Host the MCP server over HTTP in a daemon thread (for the running GUI).
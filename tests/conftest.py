@@ -1,7 +1,11 @@
 """Pytest configuration and shared fixtures."""
 import pytest
 import gc
+import queue
+import re
+import threading
 import time
+from collections import defaultdict
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
@@ -45,6 +49,164 @@ def mock_pyttsx3():
         yield
 
 
+class FakeEngine:
+    """A pyttsx3-like engine with a real run loop, for speech queue tests.
+
+    Like pyttsx3, ``say`` and ``setProperty`` only queue commands; the thread
+    in ``startLoop`` (or calling ``iterate``) processes them in order,
+    applying properties at processing time and delivering every callback
+    itself. Each utterance
+    "plays" for ``seconds`` plus ``char_seconds`` per character, reporting
+    each word as it goes (cut short by ``stop``, which also discards queued
+    commands), and is recorded in ``spoken`` with the rate and voice it played
+    with and when it started and finished. ``save_to_file`` takes as long as
+    speaking would and writes the text as a tone (see :func:`write_tone`).
+    """
+
+    def __init__(self, seconds=0.0, char_seconds=0.0):
+        self.seconds = seconds
+        self.char_seconds = char_seconds
+        self.properties = {"rate": 200, "voice": None, "voices": [
+            SimpleNamespace(id="voice-1", name="Voice One"),
+            SimpleNamespace(id="voice-2", name="Voice Two"),
+        ]}
+        self.spoken = []
+        self._callbacks = defaultdict(list)
+        self._commands = queue.Queue()
+        self._interrupted = threading.Event()
+        self._looping = False
+
+    def connect(self, topic, callback):
+        if callable(callback):
+            self._callbacks[topic].append(callback)
+
+    def getProperty(self, name):
+        return self.properties[name]
+
+    def setProperty(self, name, value):
+        self._commands.put(("property", (name, value)))
+
+    def say(self, text, name=None):
+        self._commands.put(("say", (text, name)))
+
+    def save_to_file(self, text, filename, name=None):
+        self._commands.put(("save", (text, filename)))
+
+    def stop(self):
+        try:
+            while True:
+                self._commands.get_nowait()
+        except queue.Empty:
+            pass
+        self._interrupted.set()
+
+    def startLoop(self, useDriverLoop=True):
+        self._looping = True
+        while useDriverLoop:
+            kind, args = self._commands.get()
+            if kind == "end":
+                return
+            self._run(kind, args)
+
+    def iterate(self):
+        if not self._looping:
+            raise RuntimeError('run loop not started')
+        self.runAndWait()
+
+    def runAndWait(self):
+        while True:
+            try:
+                kind, args = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            self._run(kind, args)
+
+    def _run(self, kind, args):
+        if kind == "property":
+            self.properties[args[0]] = args[1]
+        elif kind == "say":
+            self._speak(*args)
+        elif kind == "save":
+            self._pause(self.seconds + self.char_seconds * len(args[0]))
+            write_tone(args[1], args[0], self.properties["rate"])
+
+    def endLoop(self):
+        self._looping = False
+        self._commands.put(("end", None))
+
+    def _pause(self, seconds):
+        """Play for ``seconds``; True if ``stop`` interrupted it."""
+        return self._interrupted.wait(seconds) if seconds else self._interrupted.is_set()
+
+    def _fire(self, topic, **kwargs):
+        for callback in self._callbacks[topic]:
+            callback(**kwargs)
+
+    def _speak(self, text, name):
+        self._interrupted.clear()
+        started = time.perf_counter()
+        self._fire("started-utterance", name=name)
+        completed = not self._pause(self.seconds)
+        for match in re.finditer(r"\S+", text):
+            if not completed:
+                break
+            self._fire("started-word", name=name, location=match.start(),
+                       length=len(match.group()))
+            completed = not self._pause(self.char_seconds * (len(match.group()) + 1))
+        self.spoken.append(SimpleNamespace(
+            text=text, name=name, rate=self.properties["rate"], voice=self.properties["voice"],
+            started=started, finished=time.perf_counter()))
+        self._fire("finished-utterance", name=name, completed=completed)
+
+
+TONE_SAMPLE_RATE = 16000
+
+
+def write_tone(path, text, rate):
+    """Write ``text`` as a 16-bit mono WAV: a tone per character, silence per space.
+
+    Each character lasts ``2 / rate`` seconds (10 ms at 200 WPM), so
+    the audio's length follows the text and the rate like real speech.
+    """
+    import wave
+    from array import array
+
+    per_char = max(1, TONE_SAMPLE_RATE * 2 // rate)
+    tone = array('h', [6000, -6000] * (per_char // 2) + [0] * (per_char % 2)).tobytes()
+    silence = bytes(2 * per_char)
+    with wave.open(path, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(TONE_SAMPLE_RATE)
+        handle.writeframes(b"".join(silence if ch.isspace() else tone for ch in text))
+
+
+def tone_engine():
+    """Picklable engine ``init`` for rendering processes: a :class:`FakeEngine`."""
+    return FakeEngine()
+
+
+@pytest.fixture
+def fake_engine():
+    """A :class:`FakeEngine` wrapped in a primed SpeechEngine: ``(speech, engine)``."""
+    from Core.speech_engine import SpeechEngine
+
+    engine = FakeEngine()
+    speech = SpeechEngine(init=lambda: engine)
+    speech.prime_async(200)
+    speech.get_voices()  # wait for the loop thread to build the engine
+    yield speech, engine
+    speech.flush()
+    engine.endLoop()
+
+
+@pytest.fixture(autouse=True)
+def isolated_bookmarks(tmp_path, monkeypatch):
+    """Keep reading-position bookmarks written by tests out of the user's home."""
+    import Core.bookmarks
+    monkeypatch.setattr(Core.bookmarks, "DEFAULT_BOOKMARKS_PATH", str(tmp_path / "bookmarks.json"))
+
+
 @pytest.fixture
 def app():
     """Create a SpeedReaderController instance for testing.
@@ -0,0 +1,141 @@
+import threading
+import time
+from array import array
+
+from Core.audio import (
+    AudioClip, NullSink, StreamSink, estimate_word_frames, pace_words, read_wav, write_wav)
+
+
+def test_estimate_word_frames_places_words_by_character_offset():
+    starts, lengths, frames = estimate_word_frames("ab cd", 100)
+    assert list(starts) == [0, 3]
+    assert list(lengths) == [2, 2]
+    assert list(frames) == [0, 60]
+
+
+def test_wav_round_trip_keeps_pcm_and_estimates_words(tmp_path):
+    clip = AudioClip(array('h', range(-400, 400)).tobytes(), 8000)
+    path = str(tmp_path / "clip.wav")
+
+    write_wav(path, clip)
+    loaded = read_wav(path, "one two three")
+
+    assert loaded.frames == clip.frames
+    assert (loaded.sample_rate, loaded.channels, loaded.sample_width) == (8000, 1, 2)
+    assert loaded.frame_count == 800
+    assert loaded.duration == 0.1
+    assert list(loaded.word_starts) == [0, 4, 8]
+
+
+def test_pace_words_reports_each_word_then_waits_out_the_clip():
+    clip = AudioClip(bytes(2 * 400), 8000, word_starts=array('I', [0, 4]),
+                     word_lengths=array('I', [3, 3]), word_frames=array('I', [0, 200]))
+    heard = []
+    start = time.monotonic()
+
+    completed = pace_words(clip, heard.append, threading.Event(), start)
+
+    assert completed
+    assert heard == [0, 1]
+    assert time.monotonic() - start >= 0.05
+
+
+def test_pace_words_stops_early_when_stopped():
+    clip = AudioClip(bytes(2 * 8000), 8000, word_starts=array('I', [0, 4]),
+                     word_lengths=array('I', [3, 3]), word_frames=array('I', [0, 4000]))
+    stopped = threading.Event()
+    heard = []
+
+    def on_word(index):
+        heard.append(index)
+        stopped.set()
+
+    assert not pace_words(clip, on_word, stopped, time.monotonic())
+    assert heard == [0]
+
+
+def constant_clip(value, frames=1000, rate=8000, words=(0, 500)):
+    return AudioClip(array('h', [value] * frames).tobytes(), rate,
+                     word_starts=array('I', range(len(words))),
+                     word_lengths=array('I', [1] * len(words)), word_frames=array('I', words))
+
+
+class RecordingStream:
+    def __init__(self, *audio_format):
+        self.format = audio_format
+        self.writes = []
+        self.closed = False
+
+    def write(self, data):
+        self.writes.append(data)
+
+    def close(self):
+        self.closed = True
+
+
+def test_stream_sink_writes_zero_copy_slices_to_one_stream():
+    streams = []
+    sink = StreamSink(open_stream=lambda *f: streams.append(RecordingStream(*f)) or streams[-1],
+                      crossfade=0)
+
+    sink.play(constant_clip(100))
+    sink.play(constant_clip(200))
+
+    assert len(streams) == 1 and sink.opened == 1
+    assert all(isinstance(data, memoryview) for data in streams[0].writes)
+    assert sum(len(data) for data in streams[0].writes) == 2 * 2000
+
+
+def test_stream_sink_reopens_only_when_the_format_changes():
+    streams = []
+    sink = StreamSink(open_stream=lambda *f: streams.append(RecordingStream(*f)) or streams[-1])
+
+    sink.play(constant_clip(100))
+    sink.play(constant_clip(100, rate=16000))
+
+    assert [stream.format for stream in streams] == [(8000, 1, 2), (16000, 1, 2)]
+    assert streams[0].closed
+
+
+def test_null_sink_crossfades_consecutive_clips(tmp_path):
+    path = str(tmp_path / "out.wav")
+    sink = NullSink(path, crossfade=0.005)
+    heard = []
+
+    assert sink.play(constant_clip(1000), lambda i: heard.append(("a", i)), more=True)
+    assert sink.play(constant_clip(-1000), lambda i: heard.append(("b", i)))
+    sink.close()
+
+    played = read_wav(path)
+    samples = array('h', played.frames)
+    fade = 40  # 5 ms at 8 kHz
+    assert played.frame_count == 2000 - fade
+    mixed = samples[1000 - fade:1000]
+    assert list(mixed) == sorted(mixed, reverse=True)
+    assert 1000 > mixed[0] > mixed[-1] > -1000
+    assert samples[0] == 1000 and samples[-1] == -1000
+    assert heard == [("a", 0), ("a", 1), ("b", 0), ("b", 1)]
+
+
+def test_null_sink_flush_plays_out_a_held_back_ending(tmp_path):
+    path = str(tmp_path / "out.wav")
+    sink = NullSink(path)
+
+    sink.play(constant_clip(1000), more=True)
+    sink.flush()
+    sink.close()
+
+    assert read_wav(path).frame_count == 1000
+
+
+def test_stopped_sink_drops_the_rest_of_the_clip(tmp_path):
+    path = str(tmp_path / "out.wav")
+    sink = NullSink(path)
+
+    def on_word(index):
+        sink.stop()
+
+    assert not sink.play(constant_clip(1000, frames=8000), on_word, more=True)
+    sink.close()
+
+    assert read_wav(path).frame_count < 8000
@@ -0,0 +1,66 @@
+import os
+from array import array
+
+from Core.audio import AudioClip
+from Core.audio_cache import AudioCache
+
+VERSION = "test-engine 1.0"
+
+
+def make_clip(length=800):
+    return AudioClip(array('h', range(length)).tobytes(), 16000,
+                     word_starts=array('I', [0, 6]), word_lengths=array('I', [5, 5]),
+                     word_frames=array('I', [0, length // 2]))
+
+
+def test_clip_round_trips_through_the_cache(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    clip = make_clip()
+    key = cache.key("Build succeeded", "voice-1", 500, VERSION)
+
+    assert cache.get(key) is None
+    cache.put(key, clip)
+    loaded = cache.get(key)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert loaded == clip
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+def test_key_changes_with_text_voice_rate_and_engine(tmp_path):
+    key = AudioCache.key("Build succeeded", "voice-1", 500, VERSION)
+
+    assert key == AudioCache.key("Build succeeded", "voice-1", 500, VERSION)
+    assert key != AudioCache.key("Build succeeded.", "voice-1", 500, VERSION)
+    assert key != AudioCache.key("Build succeeded", "voice-2", 500, VERSION)
+    assert key != AudioCache.key("Build succeeded", None, 500, VERSION)
+    assert key != AudioCache.key("Build succeeded", "voice-1", 525, VERSION)
+    assert key != AudioCache.key("Build succeeded", "voice-1", 500, "test-engine 1.1")
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    key = cache.key("Waiting for review", None, 300, VERSION)
+    cache.put(key, make_clip())
+    path = tmp_path / (key + ".srclip")
+    path.write_bytes(path.read_bytes()[:-3])
+
+    assert cache.get(key) is None
+
+
+def test_least_recently_used_clips_are_evicted(tmp_path):
+    keys = [AudioCache.key("phrase {}".format(i), None, 300, VERSION) for i in range(3)]
+    cache = AudioCache(str(tmp_path))
+    cache.put(keys[0], make_clip())
+    entry_size = os.path.getsize(cache._path(keys[0]))
+    cache.max_bytes = entry_size * 2 + entry_size // 2
+    cache.put(keys[1], make_clip())
+    os.utime(cache._path(keys[0]), ns=(1, 1))
+    os.utime(cache._path(keys[1]), ns=(2, 2))
+    cache.get(keys[0])  # touch: now the most recently used
+
+    cache.put(keys[2], make_clip())
+
+    assert os.path.exists(cache._path(keys[0]))
+    assert not os.path.exists(cache._path(keys[1]))
+    assert os.path.exists(cache._path(keys[2]))
@@ -0,0 +1,112 @@
+from array import array
+
+import numpy as np
+import pytest
+
+from Core.audio import AudioClip
+from Core.audio_processing import compress_silence, time_stretch
+
+RATE = 16000
+
+
+def voiced_clip(seconds=2.0, channels=1, pitch=150):
+    t = np.arange(int(RATE * seconds)) / RATE
+    wave = 3000 * np.sin(2 * np.pi * pitch * t) + 1500 * np.sin(2 * np.pi * 2 * pitch * t)
+    samples = np.repeat(wave[:, None], channels, axis=1).astype(np.int16)
+    count = len(t)
+    return AudioClip(samples.tobytes(), RATE, channels,
+                     word_starts=array('I', [0, 6, 12]), word_lengths=array('I', [5, 5, 5]),
+                     word_frames=array('I', [0, count // 2, 3 * count // 4]))
+
+
+def dominant_frequency(clip):
+    samples = np.frombuffer(clip.frames, np.int16).reshape(-1, clip.channels)[:, 0]
+    spectrum = np.abs(np.fft.rfft(samples.astype(float)))
+    return np.fft.rfftfreq(len(samples), 1 / clip.sample_rate)[np.argmax(spectrum)]
+
+
+def test_time_stretch_shortens_the_clip_keeping_its_pitch():
+    clip = voiced_clip()
+
+    faster = time_stretch(clip, 2.0)
+
+    assert faster.frame_count == clip.frame_count // 2
+    assert abs(dominant_frequency(faster) - 150) <= 2
+
+
+def test_time_stretch_moves_word_starts_with_the_audio():
+    clip = voiced_clip()
+
+    faster = time_stretch(clip, 1.6)
+
+    expected = [frame / 1.6 for frame in clip.word_frames]
+    assert all(abs(a - b) <= RATE * 0.01 for a, b in zip(faster.word_frames, expected))
+    assert list(faster.word_starts) == list(clip.word_starts)
+
+
+def test_time_stretch_handles_stereo():
+    clip = voiced_clip(channels=2)
+
+    faster = time_stretch(clip, 1.5)
+
+    assert faster.channels == 2
+    assert abs(faster.frame_count - clip.frame_count / 1.5) <= 1
+
+
+def test_time_stretch_by_one_keeps_the_audio():
+    clip = voiced_clip(seconds=0.5)
+
+    assert time_stretch(clip, 1.0) == clip
+
+
+def test_time_stretch_rejects_unsupported_audio():
+    clip = AudioClip(bytes(400), RATE, sample_width=1)
+
+    with pytest.raises(ValueError):
+        time_stretch(clip, 2.0)
+    with pytest.raises(ValueError):
+        time_stretch(voiced_clip(), 0)
+
+
+def speech_with_pauses(*parts):
+    """Alternating tone and silence of the given lengths (seconds), words at each tone."""
+    pieces, words, position = [], [], 0
+    for index, seconds in enumerate(parts):
+        count = int(RATE * seconds)
+        if index % 2 == 0:
+            words.append(position)
+            pieces.append((np.sin(np.arange(count) * 0.2) * 5000).astype(np.int16))
+        else:
+            pieces.append(np.zeros(count, np.int16))
+        position += count
+    return AudioClip(np.concatenate(pieces).tobytes(), RATE,
+                     word_starts=array('I', range(len(words))),
+                     word_lengths=array('I', [1] * len(words)), word_frames=array('I', words))
+
+
+def test_compress_silence_shortens_long_pauses_only():
+    clip = speech_with_pauses(0.5, 1.0, 0.5, 0.1, 0.5)
+
+    shorter = compress_silence(clip, 0.2)
+
+    # The 1 s pause loses 0.8 s; the 0.1 s pause is kept.
+    assert shorter.frame_count == clip.frame_count - int(0.8 * RATE)
+    assert list(shorter.word_frames) == [0, int(1.5 * RATE) - int(0.8 * RATE),
+                                         int(2.1 * RATE) - int(0.8 * RATE)]
+
+
+def test_compress_silence_keeps_speech_samples_intact():
+    clip = speech_with_pauses(0.5, 1.0, 0.5)
+
+    shorter = compress_silence(clip, 0.2)
+
+    samples = np.frombuffer(shorter.frames, np.int16)
+    original = np.frombuffer(clip.frames, np.int16)
+    assert np.array_equal(samples[:int(0.6 * RATE)], original[:int(0.6 * RATE)])
+    assert np.array_equal(samples[-int(0.6 * RATE):], original[-int(0.6 * RATE):])
+
+
+def test_compress_silence_leaves_audio_without_long_pauses_alone():
+    clip = speech_with_pauses(0.5, 0.1, 0.5)
+
+    assert compress_silence(clip, 0.2) is clip
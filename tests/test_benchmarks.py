@@ -0,0 +1,456 @@
+"""Scaling benchmarks for the hot paths.
+
+Each test times an operation at two input sizes and asserts it grows roughly
+linearly (with generous slack for noisy CI machines). Run with ``-s`` to see
+the measured numbers.
+"""
+import os
+import re
+import statistics
+import threading
+import time
+from array import array
+from functools import partial
+
+from Core.audio import AudioClip, NullSink
+from Core.audio_cache import AudioCache
+from Core.audio_processing import compress_silence, time_stretch
+from Core.config import load_normalization_rules
+from Core.document_cache import DocumentCache, prepare_text
+from Core.lexicon import Lexicon
+from Core.text_processing import iter_chunks, normalize_with_offsets, window_end
+from Core.search_index import SearchIndex
+from Core.ui_events import EventQueue
+from Core.speech import EngineWorker, speak_blocking
+from Core.speech_engine import (
+    DEFAULT_AFFINITY_WINDOW, DEFAULT_COALESCE_CHARS, DEFAULT_QUANTUM, VOICE_SWITCH_SECONDS,
+    SpeechScheduler, Utterance)
+from Core.speech_engine import SpeechEngine
+from Core.synthesis import RenderedEngine, SynthesisPool, look_ahead
+from tests.conftest import FakeEngine
+
+REPO_CONFIG = os.path.join(os.path.dirname(__file__), os.pardir, "config.json")
+
+# Comparisons of two timings of threaded code (which of two runs was faster)
+# flip on a loaded CI machine however generous the slack; they are only
+# asserted when this is set. The structure behind them always is.
+STRICT_TIMING = bool(os.environ.get("SPEEDREADER_STRICT_TIMING"))
+
+AGENT_TEXT = (
+    "## Result\nEdited `Core/text_processing.py` at 3f9a2b1c and **all** tests pass.\n"
+    "```python\nprint('hello')\n```\n"
+    "Traceback (most recent call last):\n  File \"a.py\", line 3, in <module>\n"
+    "See https://example.com/build/42 for this_is_a_really_long_identifier_name_ok.\n"
+)
+
+
+def best_time(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def assert_linear(small, large, factor, name):
+    print("\n{}: x1 {:.2f} ms, x{} {:.2f} ms".format(name, small * 1000, factor, large * 1000))
+    assert large < small * factor * 3
+
+
+def test_rule_engine_scales_linearly():
+    rules = load_normalization_rules(path=REPO_CONFIG)
+    small, large = AGENT_TEXT * 500, AGENT_TEXT * 4000
+    assert_linear(best_time(lambda: rules.apply(small)),
+                  best_time(lambda: rules.apply(large)), 8, "rule engine")
+
+
+# Long tokens without whitespace, on which an unanchored or backtracking rule
+# goes quadratic (a path rule used to take 22 s on 40k chars of "ab.").
+PATHOLOGICAL_TOKENS = ("ab.", "a-", "a/", "ab/", "C:", "0a", "`", "*", "http", "```")
+
+
+def test_rule_engine_stays_linear_on_pathological_tokens():
+    rules = load_normalization_rules(path=REPO_CONFIG)
+    for token in PATHOLOGICAL_TOKENS:
+        small, large = token * (5000 // len(token)), token * (40000 // len(token))
+        assert_linear(best_time(lambda: rules.apply(small)),
+                      best_time(lambda: rules.apply(large)), 8, "rules on {!r}".format(token))
+
+
+def test_lexicon_scan_scales_linearly_with_10k_entries():
+    entries = {"TERM{}X".format(i): "term {}".format(i) for i in range(10000)}
+    entries.update({"WPM": "words per minute", "SAPI": "sappy"})
+    pattern = re.compile(Lexicon(entries).pattern)
+    text = "Reading at 500 WPM through SAPI on TERM42X today. "
+    small, large = text * 2000, text * 16000
+    assert_linear(best_time(lambda: sum(1 for _ in pattern.finditer(small))),
+                  best_time(lambda: sum(1 for _ in pattern.finditer(large))), 8, "lexicon")
+
+
+def test_document_cache_reopen_is_much_faster_than_preparing(tmp_path):
+    rules = load_normalization_rules(path=REPO_CONFIG)
+    text = AGENT_TEXT * 4000
+    cache = DocumentCache(str(tmp_path), min_chars=0)
+    cache.prepare(text, rules)
+    fresh = best_time(lambda: prepare_text(text, rules))
+    cached = best_time(lambda: cache.prepare(text, rules))
+    print("\ndocument cache: prepare {:.2f} ms, reopen {:.2f} ms".format(fresh * 1000, cached * 1000))
+    assert cached * 5 < fresh
+
+
+def test_first_chunk_of_a_long_paste_does_not_wait_for_the_whole_text():
+    rules = load_normalization_rules(path=REPO_CONFIG)
+    text = AGENT_TEXT * 4000
+
+    def first_chunk():
+        window, _ = normalize_with_offsets(text[:window_end(text, 4800)], rules)
+        return next(iter_chunks(window))
+
+    first = best_time(first_chunk)
+    whole = best_time(lambda: next(iter_chunks(prepare_text(text, rules).spoken)))
+    print("\nfirst chunk of {:.1f} MB: window {:.2f} ms, whole text {:.2f} ms".format(
+        len(text) / 1e6, first * 1000, whole * 1000))
+    assert first * 20 < whole
+
+
+def test_search_lookups_take_milliseconds_on_a_large_document():
+    words = ["word{}".format(i % 5000) for i in range(400000)]
+    text = " ".join(words) + " needle in the haystack"
+    index = SearchIndex()
+    index.build([(0, text)])
+    lookup = best_time(lambda: index.search("word42"))
+    phrase = best_time(lambda: index.search("in the haystack"))
+    prefix = best_time(lambda: index.search("needl"))
+    print("\nsearch over {:.1f} MB: word {:.3f} ms, phrase {:.3f} ms, prefix {:.3f} ms".format(
+        len(text) / 1e6, lookup * 1000, phrase * 1000, prefix * 1000))
+    assert index.search("in the haystack")[0].offset == text.index("in the haystack")
+    assert max(lookup, phrase, prefix) < 0.05
+
+
+def test_prefix_search_does_not_scan_the_vocabulary_or_every_posting():
+    # A keystroke's prefix over a large vocabulary, and one ("w") matching
+    # every term: both should cost about the hits returned, not the index.
+    words = ["w{}x{}".format(i % 50000, i % 7) for i in range(400000)]
+    index = SearchIndex()
+    index.build([(0, " ".join(words))])
+    narrow = best_time(lambda: index.search("w4242"))
+    broad = best_time(lambda: index.search("w", limit=100))
+    print("\nprefix search over {} terms: narrow {:.3f} ms, every term {:.3f} ms".format(
+        len(set(words)), narrow * 1000, broad * 1000))
+    assert [h.number for h in index.search("w", limit=3)] == [0, 1, 2]
+    assert narrow < 0.005
+
+
+def test_pipelined_speech_queue_closes_inter_utterance_gaps(fake_engine):
+    speech, engine = fake_engine
+    speech.coalesce_chars = 0  # measure the gaps between separate utterances
+    count = 200
+
+    def gaps():
+        spoken = engine.spoken[-count:]
+        return [b.started - a.finished for a, b in zip(spoken, spoken[1:])]
+
+    # One caller thread speaking each utterance after the last has finished,
+    # as the blocking-only engine did.
+    start = time.perf_counter()
+    for i in range(count):
+        speech.speak("sentence {}".format(i), 300)
+    sequential_time = time.perf_counter() - start
+    sequential = statistics.median(gaps())
+
+    issuers = []
+    issue = speech._issue
+
+    def recording_issue(utterance):
+        issuers.append(threading.current_thread())
+        issue(utterance)
+
+    speech._issue = recording_issue
+    says = len(engine.spoken)
+    start = time.perf_counter()
+    handles = [speech.speak("sentence {}".format(i), 300, block=False) for i in range(count)]
+    handles[-1].wait(timeout=30)
+    pipelined_time = time.perf_counter() - start
+    pipelined = statistics.median(gaps())
+
+    print("\nspeech queue: median gap sequential {:.1f} us, pipelined {:.1f} us; "
+          "{:.0f} vs {:.0f} utterances/s".format(
+              sequential * 1e6, pipelined * 1e6, count / sequential_time, count / pipelined_time))
+    assert all(h.state == "done" for h in handles)
+    # One engine round-trip per utterance, every one issued by the loop
+    # thread as the last finished rather than by the callers.
+    assert len(engine.spoken) - says == count
+    assert len(issuers) == count
+    assert len(set(issuers)) == 1 and issuers[0] is not threading.current_thread()
+    if STRICT_TIMING:
+        assert pipelined < sequential
+
+
+def test_fair_scheduler_bounds_latency_with_a_chatty_agent():
+    agents = ["agent{}".format(i) for i in range(6)]
+    sentence = "A sentence of about sixty characters read by the agent now. "
+    scheduler = SpeechScheduler()
+    for _ in range(300):
+        scheduler.push(Utterance(sentence, 300, agent=agents[0]))
+    for agent in agents[1:]:
+        for _ in range(10):
+            scheduler.push(Utterance(sentence, 300, agent=agent))
+    total = len(scheduler)
+
+    start = time.perf_counter()
+    order = [scheduler.pop() for _ in range(total)]
+    elapsed = time.perf_counter() - start
+
+    # Characters spoken before each quiet agent's first utterance starts; a
+    # first-come-first-served queue would make every one wait for all 300.
+    waits = [sum(len(u.text) for u in order[:next(i for i, u in enumerate(order) if u.agent == a)])
+             for a in agents[1:]]
+    print("\nfair scheduler: worst first-utterance wait {} chars (FIFO {}), "
+          "{:.1f} us per pop".format(max(waits), 300 * len(sentence), elapsed / total * 1e6))
+    assert max(waits) <= len(agents) * DEFAULT_QUANTUM
+
+
+def test_voice_affinity_reduces_voice_switches():
+    # Four agents sharing two voices, each with a backlog of sentences and a
+    # turn of one sentence. (A jump is repaid from the jumper's next turn, so
+    # when a turn holds several sentences grouping saves little.)
+    voices = {"agent0": "v1", "agent1": "v2", "agent2": "v1", "agent3": "v2"}
+
+    def switches(affinity_window):
+        scheduler = SpeechScheduler(quantum=25, affinity_window=affinity_window)
+        for i in range(50):
+            for agent, voice in voices.items():
+                scheduler.push(Utterance("Sentence number {} here.".format(i), 300,
+                                         voice=voice, agent=agent))
+        order = [scheduler.pop() for _ in range(len(scheduler))]
+        return sum(a.voice != b.voice for a, b in zip(order, order[1:])), scheduler.grouped
+
+    plain, _ = switches(0)
+    grouped, moved = switches(DEFAULT_AFFINITY_WINDOW)
+    print("\nvoice affinity: {} voice switches without, {} with ({} utterances moved up, "
+          "~{:.1f} s saved)".format(plain, grouped, moved, (plain - grouped) * VOICE_SWITCH_SECONDS))
+    assert grouped < plain
+
+
+def test_coalescing_shortens_a_burst_of_short_agent_messages(fake_engine):
+    speech, engine = fake_engine
+    # A few milliseconds of start-up per say, then time per character.
+    engine.seconds = 0.004
+    engine.char_seconds = 0.00002
+    messages = ["Step {} finished.".format(i) for i in range(40)]
+
+    def burst(coalesce_chars):
+        speech.coalesce_chars = coalesce_chars
+        says = len(engine.spoken)
+        start = time.perf_counter()
+        handles = [speech.speak(text, 300, block=False, agent="builder") for text in messages]
+        handles[-1].wait(timeout=30)
+        return time.perf_counter() - start, len(engine.spoken) - says
+
+    separate, separate_says = burst(0)
+    merged, merged_says = burst(DEFAULT_COALESCE_CHARS)
+    print("\ncoalescing: {} says {:.0f} ms, merged into {} says {:.0f} ms".format(
+        separate_says, separate * 1000, merged_says, merged * 1000))
+    assert separate_says == len(messages)
+    assert merged_says < separate_says
+    if STRICT_TIMING:
+        assert merged < separate
+
+
+def test_engine_worker_removes_per_call_engine_start_up():
+    # Stand-in for pyttsx3.init: building the SAPI5 COM engine and loading a
+    # voice costs on the order of 100 ms; model a conservative 20 ms.
+    def slow_init():
+        time.sleep(0.02)
+        return FakeEngine()
+
+    calls = 10
+    start = time.perf_counter()
+    for i in range(calls):
+        speak_blocking("Tests passed.", 300, init=slow_init)
+    fresh = (time.perf_counter() - start) / calls
+
+    worker = EngineWorker(init=slow_init)
+    worker("Warm up.", 300)
+    start = time.perf_counter()
+    for i in range(calls):
+        worker("Tests passed.", 300)
+    reused = (time.perf_counter() - start) / calls
+    worker._speech.engine.endLoop()
+
+    print("\nstdio speak latency: fresh engine {:.2f} ms/call, persistent worker {:.2f} ms/call".format(
+        fresh * 1000, reused * 1000))
+    assert reused * 5 < fresh
+
+
+def test_synthesis_pool_renders_chunks_in_parallel():
+    # Each render takes 40 ms, like a real engine synthesizing in real time.
+    chunks = ["Chunk number {} of the book.".format(i) for i in range(12)]
+
+    def render(workers):
+        pool = SynthesisPool(workers=workers, init=partial(FakeEngine, seconds=0.04))
+        try:
+            pool.voices()  # start the workers before timing
+            start = time.perf_counter()
+            clips = list(pool.render_in_order(chunks, 500))
+            return time.perf_counter() - start, clips
+        finally:
+            pool.close()
+
+    serial, _ = render(1)
+    parallel, clips = render(4)
+    print("\nsynthesis pool: 12 chunks in {:.0f} ms with 1 worker, {:.0f} ms with 4".format(
+        serial * 1000, parallel * 1000))
+    assert len(clips) == len(chunks)
+    assert parallel * 2 < serial
+
+
+def test_audio_cache_hit_skips_synthesis(tmp_path):
+    # Rendering a short phrase costs 60 ms of engine time.
+    pool = SynthesisPool(workers=1, init=partial(FakeEngine, seconds=0.06),
+                         cache=AudioCache(str(tmp_path)))
+    try:
+        pool.voices()
+        start = time.perf_counter()
+        pool.submit("Build succeeded.", 500).result()
+        rendered = time.perf_counter() - start
+        hit = best_time(lambda: pool.submit("Build succeeded.", 500).result())
+    finally:
+        pool.close()
+    print("\naudio cache: render {:.1f} ms, cache hit {:.2f} ms".format(rendered * 1000, hit * 1000))
+    assert hit * 10 < rendered
+
+
+class SleepSink:
+    """Plays every clip for a fixed time."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def play(self, clip, on_word=None, more=False):
+        time.sleep(self.seconds)
+        return True
+
+    def flush(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+def test_look_ahead_keeps_rendered_reading_gapless():
+    # Rendering a chunk (60 ms) is slower than playing it (30 ms): with only
+    # the queued chunk rendering, every boundary waits for synthesis.
+    chunks = ["Chunk number {} of the book.".format(i) for i in range(10)]
+    pool = SynthesisPool(workers=4, init=partial(FakeEngine, seconds=0.06))
+    speech = SpeechEngine(init=lambda: RenderedEngine(pool, SleepSink(0.03)))
+    speech.prime_async(500)
+    speech.get_voices()
+
+    def read(count):
+        start = time.perf_counter()
+        playing = None
+        for text in look_ahead(chunks, count, lambda text: speech.prefetch(text, 500)):
+            queued = speech.speak(text, 500, block=False, name=count)
+            if playing is not None:
+                playing.wait(timeout=30)
+            playing = queued
+        playing.wait(timeout=30)
+        return time.perf_counter() - start
+
+    try:
+        without = read(0)
+        with_ahead = read(3)
+    finally:
+        speech.engine.endLoop()
+        pool.close()
+    print("\nlook-ahead: 10 chunks in {:.0f} ms with none, {:.0f} ms with 3 ahead".format(
+        without * 1000, with_ahead * 1000))
+    assert with_ahead < without * 0.85
+
+
+def speech_like_clip(seconds, rate=22050):
+    """Voiced stretches (150 Hz plus harmonics) separated by pauses."""
+    import numpy as np
+
+    t = np.arange(int(seconds * rate)) / rate
+    voiced = (np.sin(2 * np.pi * 150 * t) + 0.5 * np.sin(2 * np.pi * 450 * t)) * 5000
+    syllables = (t * 4) % 1.0 < 0.7
+    pauses = (t % 3.0) > 2.4
+    samples = np.where(syllables & ~pauses, voiced, 0).astype(np.int16)
+    words = array('I', range(0, len(samples), rate // 3))
+    return AudioClip(samples.tobytes(), rate, word_starts=array('I', range(len(words))),
+                     word_lengths=array('I', [1] * len(words)), word_frames=words)
+
+
+def test_time_stretch_runs_far_faster_than_real_time():
+    clip = speech_like_clip(60)
+
+    elapsed = best_time(lambda: time_stretch(clip, 2.0), repeat=2)
+
+    print("\ntime stretch: 60 s of audio x2 in {:.0f} ms ({:.0f}x real time)".format(
+        elapsed * 1000, clip.duration / elapsed))
+    assert elapsed < clip.duration / 20
+
+
+def test_silence_compression_runs_far_faster_than_real_time():
+    clip = speech_like_clip(60)
+
+    elapsed = best_time(lambda: compress_silence(clip, 0.1), repeat=2)
+    shorter = compress_silence(clip, 0.1)
+
+    print("\nsilence compression: 60 s of audio in {:.1f} ms ({:.0f}x real time), "
+          "{:.1f} s of pauses removed".format(
+              elapsed * 1000, clip.duration / elapsed, clip.duration - shorter.duration))
+    assert shorter.duration < clip.duration
+    assert elapsed < clip.duration / 100
+
+
+def test_stream_sink_plays_a_reading_through_one_stream(tmp_path):
+    clips = [speech_like_clip(0.5) for _ in range(100)]
+
+    def play_all():
+        sink = NullSink(str(tmp_path / "reading.wav"))
+        for clip in clips:
+            sink.play(clip, more=True)
+        sink.close()
+        return sink
+
+    elapsed = best_time(play_all)
+    sink = play_all()
+
+    print("\nstream sink: 100 chunks in {:.1f} ms through {} stream(s)".format(
+        elapsed * 1000, sink.opened))
+    assert sink.opened == 1
+    assert elapsed < sum(clip.duration for clip in clips) / 100
+
+
+def test_event_queue_keeps_engine_thread_time_per_word_constant():
+    def paint(location):
+        # Stand-in for a word's UI update: ~0.2 ms of work.
+        end = time.perf_counter() + 0.0002
+        while time.perf_counter() < end:
+            pass
+
+    def direct():
+        for location in range(500):
+            paint(location)
+
+    events = EventQueue(lambda milliseconds, callback: None)
+    on_word = events.wrap(paint)
+
+    def queued():
+        for location in range(500):
+            on_word(location=location)
+
+    direct_time = best_time(direct)
+    queued_time = best_time(queued)
+    while events.drain():
+        pass
+
+    print("\nengine thread per word: {:.1f} us painting directly, {:.2f} us queued".format(
+        direct_time / 500 * 1e6, queued_time / 500 * 1e6))
+    assert events.applied == 1500
+    assert queued_time < direct_time / 20
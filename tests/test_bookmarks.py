@@ -0,0 +1,43 @@
+import json
+
+from Core import bookmarks
+from Core.bookmarks import BookmarkStore, file_key, text_key
+
+
+def test_set_get_and_clear_persist_to_disk(tmp_path):
+    path = str(tmp_path / "nested" / "bookmarks.json")
+    store = BookmarkStore(path)
+
+    store.set("abc", 1234, title="Book")
+
+    assert BookmarkStore(path).get("abc") == 1234
+    assert json.load(open(path))["abc"]["title"] == "Book"
+    store.clear("abc")
+    assert BookmarkStore(path).get("abc") is None
+
+
+def test_missing_or_corrupt_file_is_empty(tmp_path):
+    path = tmp_path / "bookmarks.json"
+    assert BookmarkStore(str(path)).get("abc") is None
+    path.write_text("{not json")
+    assert BookmarkStore(str(path)).get("abc") is None
+
+
+def test_oldest_bookmarks_are_dropped_past_the_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(bookmarks, "MAX_BOOKMARKS", 2)
+    store = BookmarkStore(str(tmp_path / "bookmarks.json"))
+    for index, key in enumerate(["a", "b", "c"]):
+        store.set(key, index)
+        store._entries[key]["updated"] = index
+
+    store.set("c", 5)
+
+    assert [store.get(k) for k in "abc"] == [None, 1, 5]
+
+
+def test_keys_depend_on_content_only(tmp_path):
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_text("same book")
+    second.write_text("same book")
+    assert file_key(str(first)) == file_key(str(second))
+    assert text_key("same book") != text_key("same book!")
@@ -1,7 +1,13 @@
 import json
 import os
 
-from Core.config import load_mcp_config, save_enabled_voices, McpConfig, save_media_pause_setting
+import pytest
+
+from Core.config import (
+    load_mcp_config, save_enabled_voices, McpConfig, save_media_pause_setting,
+    load_normalization_rules, load_document_cache, load_speech_config,
+    load_audio_cache)
+from Core.text_processing import DEFAULT_RULES
 
 
 def test_defaults_are_disabled_when_no_file(tmp_path):
@@ -87,3 +93,84 @@ def test_save_mcp_port_persists_and_preserves_config(tmp_path):
 
     # round-trips through the loader
     assert load_mcp_config(path=str(path)).port == 9100
+
+
+def test_normalization_rules_default_to_url_rule_without_section(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"mcp": {"enabled": True}}))
+    for rules in (load_normalization_rules(path=str(path)),
+                  load_normalization_rules(path=str(tmp_path / "missing.json"))):
+        assert rules.rules == DEFAULT_RULES.rules
+
+
+def test_normalization_rules_pick_up_lexicon_next_to_config(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({}))
+    (tmp_path / "lexicon.json").write_text(json.dumps({"WPM": "words per minute"}))
+    rules = load_normalization_rules(path=str(path))
+    assert rules.apply("500 WPM") == "500 words per minute"
+
+
+def test_normalization_rules_load_in_declared_order(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"normalization": {"rules": [
+        {"name": "hash", "pattern": "[0-9a-f]{7,}", "replace": "[hash]"},
+        {"pattern": "TODO", "enabled": False},
+        {"name": "caps", "pattern": "shout", "flags": "i", "replace": "say"},
+    ]}}))
+    rules = load_normalization_rules(path=str(path))
+    assert [r.name for r in rules.rules] == ["hash", "caps"]
+    assert rules.apply("SHOUT abcdef12 TODO") == "say [hash] TODO"
+
+
+def test_repo_config_rules_compile():
+    repo_config = os.path.join(os.path.dirname(__file__), os.pardir, "config.json")
+    rules = load_normalization_rules(path=repo_config)
+    assert "code_fence" in [r.name for r in rules.rules]
+
+
+def test_document_cache_is_on_by_default_and_configurable(tmp_path):
+    path = tmp_path / "config.json"
+    assert load_document_cache(path=str(path)) is not None
+    path.write_text(json.dumps({"document_cache": {
+        "directory": str(tmp_path / "docs"), "max_mb": 1, "min_chars": 10}}))
+    cache = load_document_cache(path=str(path))
+    assert cache.directory == str(tmp_path / "docs")
+    assert (cache.max_bytes, cache.min_chars) == (1024 * 1024, 10)
+    path.write_text(json.dumps({"document_cache": {"enabled": False}}))
+    assert load_document_cache(path=str(path)) is None
+
+
+def test_max_queue_depth_defaults_and_loads(tmp_path):
+    from Core.speak_service import DEFAULT_MAX_QUEUE
+    assert load_mcp_config(path=str(tmp_path / "nope.json")).max_queue_depth == DEFAULT_MAX_QUEUE
+    path = tmp_path / "c.json"
+    path.write_text(json.dumps({"mcp": {"max_queue_depth": 4}}))
+    assert load_mcp_config(path=str(path)).max_queue_depth == 4
+
+
+def test_speech_backend_defaults_to_live_and_loads(tmp_path):
+    assert load_speech_config(path=str(tmp_path / "nope.json")).backend == "live"
+    path = tmp_path / "c.json"
+    path.write_text(json.dumps({"speech": {"backend": "rendered", "workers": 3,
+                                           "look_ahead": 4, "look_ahead_mb": 16,
+                                           "max_native_rate": 300, "max_pause_ms": 120}}))
+    cfg = load_speech_config(path=str(path))
+    assert (cfg.backend, cfg.workers) == ("rendered", 3)
+    assert (cfg.look_ahead, cfg.look_ahead_mb, cfg.max_native_rate) == (4, 16, 300)
+    assert cfg.max_pause_ms == 120
+    path.write_text(json.dumps({"speech": {"backend": "espeak"}}))
+    assert load_speech_config(path=str(path)).backend == "espeak"
+    path.write_text(json.dumps({"speech": {"backend": "cloud"}}))
+    with pytest.raises(ValueError):
+        load_speech_config(path=str(path))
+
+
+def test_audio_cache_is_on_by_default_and_configurable(tmp_path):
+    assert load_audio_cache(path=str(tmp_path / "nope.json")) is not None
+    path = tmp_path / "c.json"
+    path.write_text(json.dumps({"audio_cache": {"directory": str(tmp_path / "clips"), "max_mb": 2}}))
+    cache = load_audio_cache(path=str(path))
+    assert (cache.directory, cache.max_bytes) == (str(tmp_path / "clips"), 2 * 1024 * 1024)
+    path.write_text(json.dumps({"audio_cache": {"enabled": False}}))
+    assert load_audio_cache(path=str(path)) is None
@@ -0,0 +1,78 @@
+import os
+
+from Core.document_cache import DocumentCache, prepare_text
+from Core.text_processing import NormalizationRule, RuleSet
+
+TEXT = "Line one at http://example.com/x\nLine two. Another sentence!\n" * 50
+
+
+def assert_same(a, b):
+    assert a.spoken == b.spoken
+    assert a.offsets.source_length == b.offsets.source_length
+    for name in ("spoken_starts", "source_starts", "replaced", "line_starts"):
+        assert getattr(a.offsets, name) == getattr(b.offsets, name)
+    assert a.words.length == b.words.length
+    for name in ("starts", "ends", "sentence_starts"):
+        assert getattr(a.words, name) == getattr(b.words, name)
+
+
+def test_prepare_round_trips_through_the_cache(tmp_path):
+    cache = DocumentCache(str(tmp_path), min_chars=0)
+
+    first = cache.prepare(TEXT)
+    second = cache.prepare(TEXT)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    fresh = prepare_text(TEXT)
+    assert_same(first, fresh)
+    assert_same(second, fresh)
+    assert second.offsets.line_col(second.offsets.to_source(20)) == \
+        fresh.offsets.line_col(fresh.offsets.to_source(20)) == "2.0"
+
+
+def test_short_texts_bypass_the_cache(tmp_path):
+    cache = DocumentCache(str(tmp_path / "cache"), min_chars=len(TEXT) + 1)
+
+    cache.prepare(TEXT)
+
+    assert (cache.misses, cache.hits) == (0, 0)
+    assert not os.path.exists(str(tmp_path / "cache"))
+
+
+def test_key_changes_with_the_rules(tmp_path):
+    other = RuleSet([NormalizationRule("two", "two", "2")])
+    cache = DocumentCache(str(tmp_path), min_chars=0)
+
+    assert cache.key(TEXT) != cache.key(TEXT, other)
+    assert cache.key(TEXT) != cache.key(TEXT + " ")
+    assert "Line 2." in cache.prepare(TEXT, other).spoken
+    assert "Line two." in cache.prepare(TEXT).spoken
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = DocumentCache(str(tmp_path), min_chars=0)
+    key = cache.key(TEXT)
+    cache.prepare(TEXT)
+    path = tmp_path / (key + ".srdoc")
+    path.write_bytes(path.read_bytes()[:-3])
+
+    assert cache.get(key) is None
+    assert_same(cache.prepare(TEXT), prepare_text(TEXT))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    texts = [TEXT + str(i) for i in range(3)]
+    cache = DocumentCache(str(tmp_path), min_chars=0)
+    cache.prepare(texts[0])
+    entry_size = os.path.getsize(cache._path(cache.key(texts[0])))
+    cache.max_bytes = entry_size * 2 + entry_size // 2
+    cache.prepare(texts[1])
+    os.utime(cache._path(cache.key(texts[0])), ns=(1, 1))
+    os.utime(cache._path(cache.key(texts[1])), ns=(2, 2))
+    cache.get(cache.key(texts[0]))  # touch: now the most recently used
+
+    cache.prepare(texts[2])
+
+    assert os.path.exists(cache._path(cache.key(texts[0])))
+    assert not os.path.exists(cache._path(cache.key(texts[1])))
+    assert os.path.exists(cache._path(cache.key(texts[2])))
@@ -0,0 +1,160 @@
+import zipfile
+
+import pytest
+
+from Core import document_loader
+from Core.document_loader import (
+    Document, EpubDocument, HtmlDocument, TextDocument, open_document)
+
+
+def read_all(document):
+    return "".join(document.pieces())
+
+
+def write_epub(path, chapters, title="A Book"):
+    with zipfile.ZipFile(path, "w") as book:
+        book.writestr("mimetype", "application/epub+zip")
+        book.writestr("META-INF/container.xml", (
+            '<?xml version="1.0"?><container xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+            '<rootfiles><rootfile full-path="OEBPS/content.opf"/></rootfiles></container>'))
+        items = "".join(
+            '<item id="c{0}" href="text/ch{0}.xhtml" media-type="application/xhtml+xml"/>'.format(i)
+            for i in range(len(chapters)))
+        # Spine order is deliberately the reverse of the manifest order.
+        refs = "".join('<itemref idref="c{}"/>'.format(i) for i in reversed(range(len(chapters))))
+        book.writestr("OEBPS/content.opf", (
+            '<package xmlns="http://www.idpf.org/2007/opf" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            '<metadata><dc:title>{}</dc:title></metadata><manifest>{}</manifest>'
+            '<spine>{}</spine></package>').format(title, items, refs))
+        for i, body in enumerate(chapters):
+            book.writestr("OEBPS/text/ch{}.xhtml".format(i),
+                          "<html><body>{}</body></html>".format(body))
+
+
+def test_open_document_picks_loader_by_extension(tmp_path):
+    (tmp_path / "a.txt").write_text("hi")
+    (tmp_path / "b.html").write_text("<p>hi</p>")
+    assert isinstance(open_document(str(tmp_path / "a.txt")), TextDocument)
+    assert isinstance(open_document(str(tmp_path / "b.html")), HtmlDocument)
+    with pytest.raises(ValueError):
+        open_document(str(tmp_path / "c.pdf"))
+
+
+def test_text_document_streams_blocks_and_normalizes_line_endings(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_loader, "BLOCK_SIZE", 7)
+    path = tmp_path / "book.txt"
+    path.write_bytes("Line one\r\nLine two\r\n\r\nCafé end\r".encode("utf-8"))
+
+    pieces = list(TextDocument(str(path)).pieces())
+
+    assert len(pieces) > 1  # streamed, not read in one go
+    assert "".join(pieces) == "Line one\nLine two\n\nCafé end\n"
+
+
+def test_text_document_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(TextDocument(str(path)).iter_chunks()) == []
+
+
+def test_text_document_chunks_have_global_offsets(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_loader, "BLOCK_SIZE", 64)
+    text = "A sentence to read. " * 200
+    path = tmp_path / "book.txt"
+    path.write_text(text)
+
+    chunks = list(TextDocument(str(path)).iter_chunks(max_chars=100))
+
+    assert all(text[c.start:c.end] == c.text for c in chunks)
+    assert chunks[-1].last and not any(c.last for c in chunks[:-1])
+
+
+def test_html_document_extracts_readable_text(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text(
+        "<html><head><title>My Page</title><style>p {}</style></head><body>"
+        "<h1>Heading</h1><p>First\n   para &amp; more.</p><script>var x;</script>"
+        "<p>Second<br>line</p></body></html>")
+    document = HtmlDocument(str(path))
+
+    text = read_all(document)
+
+    assert "Heading" in text
+    assert "First para & more." in text
+    assert "Second\nline" in text
+    assert "var x" not in text and "p {}" not in text
+    assert [c.text for c in document.iter_chunks()][:2] == ["Heading", "First para & more."]
+    assert document.title == "My Page"
+
+
+def test_epub_document_reads_chapters_in_spine_order(tmp_path):
+    path = tmp_path / "book.epub"
+    write_epub(path, ["<p>Chapter zero.</p>", "<p>Chapter one.</p>"], title="Great Book")
+
+    document = open_document(str(path))
+
+    assert isinstance(document, EpubDocument)
+    assert document.title == "Great Book"
+    text = read_all(document)
+    assert text.index("Chapter one.") < text.index("Chapter zero.")
+
+
+def test_epub_document_rejects_non_epub_zip(tmp_path):
+    path = tmp_path / "fake.epub"
+    with zipfile.ZipFile(path, "w") as book:
+        book.writestr("hello.txt", "hi")
+    with pytest.raises(ValueError):
+        EpubDocument(str(path))
+    (tmp_path / "junk.epub").write_text("not a zip")
+    with pytest.raises(ValueError):
+        EpubDocument(str(tmp_path / "junk.epub"))
+
+
+def test_a_document_must_provide_its_pieces():
+    class Untitled(Document):
+        pass
+
+    class Fixed(Document):
+        def pieces(self, headings=None):
+            yield "Some text."
+
+    with pytest.raises(TypeError):
+        Untitled("untitled.txt")
+    assert [chunk.text for chunk in Fixed("fixed.txt").iter_chunks()] == ["Some text."]
+
+
+def test_html_headings_are_collected_with_global_offsets(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text("<h1>Intro <b>one</b></h1><p>Text.</p><script>x</script><h2>Next</h2><p>More.</p>")
+    document = HtmlDocument(str(path))
+    headings = []
+
+    chunks = list(document.iter_chunks(headings=headings))
+
+    text = read_all(document)
+    assert [(h.title, h.level) for h in headings] == [("Intro one", 1), ("Next", 2)]
+    assert [text[h.offset:].lstrip().split("\n")[0] for h in headings] == ["Intro one", "Next"]
+    assert chunks
+
+
+def test_epub_heading_offsets_count_earlier_chapters(tmp_path):
+    path = tmp_path / "book.epub"
+    write_epub(path, ["<h1>Second</h1><p>b</p>", "<h1>First</h1><p>a</p>"])
+    document = open_document(str(path))
+    headings = []
+
+    list(document.iter_chunks(headings=headings))
+
+    text = read_all(document)
+    assert [h.title for h in headings] == ["First", "Second"]
+    assert all(text[h.offset:].lstrip().startswith(h.title) for h in headings)
+
+
+def test_text_document_headings_use_line_heuristics(tmp_path):
+    path = tmp_path / "book.txt"
+    path.write_text("Preface.\n\nChapter 1\n\nIt begins.\n\n# Notes\n")
+    headings = []
+
+    list(TextDocument(str(path)).iter_chunks(headings=headings))
+
+    assert [h.title for h in headings] == ["Chapter 1", "Notes"]
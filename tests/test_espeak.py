@@ -0,0 +1,138 @@
+import ctypes
+from array import array
+from types import SimpleNamespace
+
+import pytest
+
+import Core.espeak
+from Core.config import SpeechConfig
+from Core.espeak import EspeakSynth, _Event, _Voice
+from Core.synthesis import SynthesisPool, speech_backend
+
+SAMPLE_RATE = 16000
+# The fake speaks each character for 5 ms.
+CHARACTER_FRAMES = 80
+
+
+def fake_espeak(calls=None):
+    """A libespeak-ng stand-in with the functions :class:`EspeakSynth` calls.
+
+    Plain functions rather than methods, so ``argtypes`` can be set on them.
+    Synthesis delivers the PCM (a tone per character, silence per space)
+    and word events through the callback in two parts, like the library.
+    """
+    calls = [] if calls is None else calls
+    state = SimpleNamespace(callback=None)
+    voices = [_Voice(name=b"English"), _Voice(name=b"Deutsch")]
+    voice_list = (ctypes.POINTER(_Voice) * 3)(*[ctypes.pointer(voice) for voice in voices])
+
+    def espeak_Initialize(output, buffer_length, path, options):
+        calls.append(("initialize", output))
+        return SAMPLE_RATE
+
+    def espeak_SetSynthCallback(callback):
+        state.callback = callback
+
+    def espeak_SetParameter(parameter, value, relative):
+        calls.append(("parameter", parameter, value))
+        return 0
+
+    def espeak_SetVoiceByName(name):
+        calls.append(("voice", name))
+        return 0 if name in (b"English", b"Deutsch") else 2
+
+    def espeak_ListVoices(spec):
+        return voice_list
+
+    def espeak_Synth(text, size, position, position_type, end, flags, identifier, user_data):
+        text = text[:-1].decode("utf-8")
+        samples = array('h')
+        events = []
+        for index, character in enumerate(text):
+            if character != " " and (index == 0 or text[index - 1] == " "):
+                length = len(text[index:].split(" ", 1)[0])
+                events.append(_Event(type=Core.espeak.EVENT_WORD, text_position=index + 1,
+                                     length=length, audio_position=len(samples) * 1000 // SAMPLE_RATE))
+            samples.extend([0 if character == " " else 1000] * CHARACTER_FRAMES)
+        half = len(samples) // 2 // CHARACTER_FRAMES * CHARACTER_FRAMES
+        first = [event for event in events if event.audio_position * SAMPLE_RATE // 1000 < half]
+        for part, part_events in ((samples[:half], first), (samples[half:], events[len(first):])):
+            buffer = (ctypes.c_short * len(part))(*part)
+            listed = (_Event * (len(part_events) + 1))(*part_events)
+            state.callback(buffer, len(part), listed)
+        state.callback(None, 0, (_Event * 1)())
+        return 0
+
+    return SimpleNamespace(**{name: function for name, function in locals().items()
+                              if name.startswith("espeak_")})
+
+
+def fake_espeak_synth():
+    """Picklable engine ``init`` for rendering processes."""
+    return EspeakSynth(fake_espeak())
+
+
+def test_render_returns_the_pcm_with_exact_word_positions():
+    synth = EspeakSynth(fake_espeak())
+
+    clip = synth.render("héllo big world")
+
+    assert clip.sample_rate == SAMPLE_RATE
+    assert clip.frame_count == 15 * CHARACTER_FRAMES
+    assert array('h', clip.frames)[:2].tolist() == [1000, 1000]
+    assert list(clip.word_starts) == [0, 6, 10]
+    assert list(clip.word_lengths) == [5, 3, 5]
+    assert list(clip.word_frames) == [0, 6 * CHARACTER_FRAMES, 10 * CHARACTER_FRAMES]
+
+
+def test_properties_are_only_sent_to_espeak_when_they_change():
+    calls = []
+    synth = EspeakSynth(fake_espeak(calls))
+
+    synth.setProperty('rate', 300)
+    synth.setProperty('rate', 300)
+    synth.setProperty('voice', "English")
+    synth.setProperty('voice', "English")
+    synth.setProperty('volume', 0.5)
+
+    assert calls == [("initialize", Core.espeak.AUDIO_OUTPUT_SYNCHRONOUS),
+                     ("parameter", Core.espeak.PARAMETER_RATE, 300),
+                     ("voice", b"English"),
+                     ("parameter", Core.espeak.PARAMETER_VOLUME, 50)]
+    assert synth.getProperty('rate') == 300
+
+
+def test_unknown_voice_raises_value_error():
+    synth = EspeakSynth(fake_espeak())
+
+    with pytest.raises(ValueError):
+        synth.setProperty('voice', "Klingon")
+
+
+def test_voices_are_listed_by_name():
+    synth = EspeakSynth(fake_espeak())
+
+    voices = synth.getProperty('voices')
+
+    assert [(voice.id, voice.name) for voice in voices] == [
+        ("English", "English"), ("Deutsch", "Deutsch")]
+
+
+def test_pool_workers_render_with_espeak_directly():
+    pool = SynthesisPool(workers=1, init=fake_espeak_synth)
+    try:
+        clip = pool.submit("one two", 250, "Deutsch").result(timeout=30)
+        voices = pool.voices()
+    finally:
+        pool.close()
+
+    # EspeakSynth has no save_to_file: the worker took the clip from render.
+    assert clip.frame_count == 7 * CHARACTER_FRAMES
+    assert list(clip.word_frames) == [0, 4 * CHARACTER_FRAMES]
+    assert ("Deutsch", "Deutsch") in voices
+
+
+def test_espeak_backend_falls_back_to_live_speech_without_the_library(monkeypatch):
+    monkeypatch.setattr(Core.espeak, "find_library", lambda: None)
+
+    assert speech_backend(SpeechConfig(backend="espeak")) is None
@@ -0,0 +1,44 @@
+import os
+
+from Core.file_cache import FileCache
+
+
+class BytesCache(FileCache):
+    suffix = ".bin"
+    name = "Test cache"
+
+
+def test_entries_round_trip_and_unreadable_ones_are_none(tmp_path):
+    cache = BytesCache(str(tmp_path), max_bytes=1000)
+
+    def corrupt(buffer):
+        raise ValueError("not an entry")
+
+    cache._store("a", b"hello")
+
+    assert cache._load("a", bytes) == b"hello"
+    assert cache._load("missing", bytes) is None
+    assert cache._load("a", corrupt) is None
+
+
+def test_a_failed_write_leaves_no_temp_file_behind(tmp_path, capsys):
+    cache = BytesCache(str(tmp_path), max_bytes=1000)
+    os.mkdir(cache._path("a"))  # os.replace cannot overwrite a directory
+
+    cache._store("a", b"hello")
+
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+    assert "Test cache write failed" in capsys.readouterr().out
+
+
+def test_eviction_only_counts_and_removes_the_caches_own_entries(tmp_path):
+    (tmp_path / "notes.txt").write_bytes(b"x" * 500)
+    cache = BytesCache(str(tmp_path), max_bytes=25)
+    cache._store("old", b"o" * 10)
+    os.utime(cache._path("old"), ns=(1, 1))
+    cache._store("new", b"n" * 10)
+
+    cache._store("newest", b"m" * 10)
+    cache._store("too big", b"h" * 26)
+
+    assert sorted(os.listdir(tmp_path)) == ["new.bin", "newest.bin", "notes.txt"]
@@ -0,0 +1,82 @@
+from Core.frame_limiter import FrameLimiter
+
+
+class FakeLoop:
+    """Collects scheduled callbacks and runs them on demand, with a fake clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.jobs = []
+
+    def clock(self):
+        return self.now
+
+    def schedule(self, milliseconds, callback):
+        self.jobs.append((self.now + milliseconds / 1000, callback))
+
+    def run_due(self):
+        due = [job for job in self.jobs if job[0] <= self.now]
+        self.jobs = [job for job in self.jobs if job[0] > self.now]
+        for _, callback in due:
+            callback()
+
+
+def limiter(painted, loop, fps=10):
+    return FrameLimiter(lambda *args: painted.append(args), loop.schedule, fps=fps,
+                        clock=loop.clock)
+
+
+def test_first_update_is_painted_on_the_next_loop_turn():
+    loop, painted = FakeLoop(), []
+    frames = limiter(painted, loop)
+
+    frames.post("a", 1)
+    loop.run_due()
+
+    assert painted == [("a", 1)]
+
+
+def test_updates_faster_than_the_frame_rate_paint_only_the_latest():
+    loop, painted = FakeLoop(), []
+    frames = limiter(painted, loop, fps=10)
+    frames.post(0)
+    loop.run_due()
+
+    for word in range(1, 6):
+        loop.now += 0.02
+        frames.post(word)
+        loop.run_due()
+    loop.now = 0.1
+    loop.run_due()
+
+    # One paint per 100 ms frame: words 1-4 were superseded before it.
+    assert painted == [(0,), (5,)]
+    assert (frames.posted, frames.painted, frames.dropped) == (6, 2, 4)
+    assert len(loop.jobs) == 0
+
+
+def test_flush_paints_at_once_and_cancel_drops():
+    loop, painted = FakeLoop(), []
+    frames = limiter(painted, loop)
+
+    frames.post("a")
+    frames.flush()
+    frames.post("b")
+    frames.cancel()
+    loop.run_due()
+
+    assert painted == [("a",)]
+    assert frames.dropped == 1
+
+
+def test_summary_reports_paint_times():
+    loop = FakeLoop()
+
+    def slow_paint(word):
+        loop.now += 0.004
+
+    frames = FrameLimiter(slow_paint, loop.schedule, clock=loop.clock)
+    frames.post("a")
+    frames.flush()
+
+    assert frames.summary() == "1 of 1 updates painted, 0 skipped; paint 4.0 ms avg, 4.0 ms max"
@@ -0,0 +1,84 @@
+import json
+import os
+import re
+
+from Core.lexicon import Lexicon, LexiconFile, lexicon_file, trie_pattern
+from Core.text_processing import (
+    NormalizationRule, RuleSet, normalize_with_offsets, preprocess_text)
+
+
+def lexicon_rules(entries, rules=()):
+    class Fixed:
+        def __init__(self):
+            self.lexicon = Lexicon(entries)
+
+        def get(self):
+            return self.lexicon
+    return RuleSet(list(rules), lexicon=Fixed())
+
+
+def test_trie_pattern_matches_whole_words_only():
+    pattern = re.compile(trie_pattern(["SAPI", "API"]))
+    assert [m.group() for m in pattern.finditer("SAPI and API but not APIs")] == ["SAPI", "API"]
+
+
+def test_trie_pattern_prefers_the_longest_term():
+    pattern = re.compile(trie_pattern(["New", "New York", "New York City"]))
+    assert pattern.search("in New York City now").group() == "New York City"
+    assert pattern.search("in New York now").group() == "New York"
+    assert pattern.search("New Yorker").group() == "New"
+
+
+def test_trie_pattern_handles_punctuation_terms():
+    pattern = re.compile(trie_pattern(["e.g.", "C++"]))
+    assert [m.group() for m in pattern.finditer("e.g. C++ code")] == ["e.g.", "C++"]
+
+
+def test_empty_lexicon_has_no_pattern():
+    assert trie_pattern([]) == ""
+    assert lexicon_rules({}).apply("text") == "text"
+
+
+def test_preprocess_text_applies_lexicon_entries():
+    rules = lexicon_rules({"WPM": "words per minute", "e.g.": "for example"})
+    assert preprocess_text("e.g. 500 WPM", rules) == "for example 500 words per minute"
+
+
+def test_rules_take_precedence_over_lexicon_at_the_same_position():
+    rules = lexicon_rules({"http": "H T T P"}, [NormalizationRule("url", r"http\S+", "[URL]")])
+    assert rules.apply("http://x http") == "[URL] H T T P"
+
+
+def test_lexicon_replacements_keep_offsets_mappable():
+    rules = lexicon_rules({"TTS": "text to speech"})
+    source = "TTS rocks"
+    spoken, offsets = normalize_with_offsets(source, rules)
+    at = spoken.index("rocks")
+    assert source[offsets.to_source(at):offsets.to_source_end(at + 5)] == "rocks"
+
+
+def test_lexicon_file_rebuilds_only_when_the_file_changes(tmp_path):
+    path = tmp_path / "lexicon.json"
+    path.write_text(json.dumps({"a": "alpha"}))
+    lexicon = LexiconFile(str(path))
+
+    first = lexicon.get()
+    assert lexicon.get() is first  # unchanged file -> cached automaton
+
+    path.write_text(json.dumps({"a": "alpha", "b": "bravo"}))
+    os.utime(path, ns=(1, 10 ** 18))
+    second = lexicon.get()
+    assert second is not first
+    assert second.entries == {"a": "alpha", "b": "bravo"}
+
+
+def test_lexicon_file_missing_or_invalid_is_empty(tmp_path):
+    assert len(LexiconFile(str(tmp_path / "missing.json")).get()) == 0
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+    assert len(LexiconFile(str(bad)).get()) == 0
+
+
+def test_lexicon_file_is_shared_per_path(tmp_path):
+    path = str(tmp_path / "lexicon.json")
+    assert lexicon_file(path) is lexicon_file(path)
@@ -163,6 +163,7 @@ class TestMainFrameWordHighlighting:
 
         # Act
         frame.onStartWord("test", 0, 5)
+        frame.word_renderer.flush()
 
         # Assert
         assert frame.current_word_label['text'] == "Hello"
@@ -175,6 +176,7 @@ class TestMainFrameWordHighlighting:
 
         # Act
         frame.onStartWord("test", 0, 5)
+        frame.word_renderer.flush()
 
         # Assert
         assert " World Test" in frame.next_words['text']
@@ -187,22 +189,37 @@ class TestMainFrameWordHighlighting:
 
         # Act
         frame.onStartWord("test", 6, 5)  # "World" starts at 6
+        frame.word_renderer.flush()
 
         # Assert
         assert "Hello " in frame.spoken_words['text']
 
     def test_on_start_word_updates_progress_bar(self, frame):
-        """onStartWord should update progress bar value."""
+        """onStartWord should update progress bar value, counted in words."""
         # Arrange
         frame.spoken_text = "Hello World Test"
         frame.text_area.insert(END, frame.spoken_text)
 
         # Act
         frame.onStartWord("test", 6, 5)
+        frame.word_renderer.flush()
 
         # Assert
-        assert frame.progress["value"] == 6
-        assert frame.progress["maximum"] == len(frame.spoken_text)
+        assert frame.progress["value"] == 1  # one word ("Hello") done
+        assert frame.progress["maximum"] == 3
+
+    def test_on_start_word_shows_word_number_and_remaining(self, frame):
+        """onStartWord should report the word number and words left."""
+        # Arrange
+        frame.spoken_text = "Hello World Test"
+
+        # Act
+        frame.onStartWord("test", 6, 5)
+        frame.word_renderer.flush()
+
+        # Assert
+        assert frame.progress_label['text'].startswith("Word 2 of 3")
+        assert "2 left" in frame.progress_label['text']
 
     def test_on_start_word_sets_highlight_indices(self, frame):
         """onStartWord should set highlight indices for current word."""
@@ -212,12 +229,78 @@ class TestMainFrameWordHighlighting:
 
         # Act
         frame.onStartWord("test", 0, 5)
+        frame.word_renderer.flush()
 
         # Assert
         assert frame.highlight_index1 == "1.0"
         assert frame.highlight_index2 == "1.5"
 
 
+    def test_on_start_word_defers_painting_to_the_renderer(self, frame):
+        """Word callbacks only record the word; the renderer paints the latest."""
+        # Arrange
+        frame.spoken_text = "Hello World Test"
+        frame.text_area.insert(END, frame.spoken_text)
+
+        # Act
+        frame.onStartWord("test", 0, 5)
+        frame.onStartWord("test", 6, 5)
+        before = frame.current_word_label['text']
+        frame.word_renderer.flush()
+
+        # Assert
+        assert before == ""
+        assert frame.current_word_label['text'] == "World"
+        assert (frame.word_renderer.painted, frame.word_renderer.dropped) == (1, 1)
+
+    def test_word_from_an_earlier_session_is_not_painted(self, frame):
+        """A word still pending when a new reading starts is skipped."""
+        # Arrange
+        frame.spoken_text = "Hello World Test"
+        frame.onStartWord("test", 0, 5)
+
+        # Act
+        frame.current_session_id += 1
+        frame.word_renderer.flush()
+
+        # Assert
+        assert frame.current_word_label['text'] == ""
+
+
+class TestMainFrameEngineEvents:
+    """Tests for handing engine callbacks over to the Tk main thread."""
+
+    def test_engine_word_callback_runs_when_the_ui_thread_drains_it(self, frame):
+        """The engine thread only queues the word; draining applies it."""
+        # Arrange
+        frame.spoken_text = "Hello World Test"
+
+        # Act
+        frame.speech._on_word(name="test", location=6, length=5)
+        queued = len(frame.ui_events)
+        frame.ui_events.drain()
+        frame.word_renderer.flush()
+
+        # Assert
+        assert queued == 1
+        assert frame.current_word_label['text'] == "World"
+        assert frame.ui_events.applied == 1
+
+    def test_started_callback_keeps_the_utterance_current_when_emitted(self, frame):
+        """onStart uses the chunk that started, even if the engine moved on."""
+        # Arrange
+        frame.current_session_id = frame.speech_session_id = 1
+        frame.speech.current = Mock(context=(120, True))
+
+        # Act
+        frame.speech._on_start(name=1)
+        frame.speech.current = Mock(context=(999, False))
+        frame.ui_events.drain()
+
+        # Assert
+        assert frame.chunk_offset == 120
+        assert frame.more_chunks is True
+
 class TestMainFrameProgressBar:
     """Tests for progress bar behavior."""
 
@@ -230,8 +313,8 @@ class TestMainFrameProgressBar:
         frame.onEnd("test", True)
 
         # Assert
-        assert frame.progress["value"] == len(frame.spoken_text)
-        assert frame.progress["maximum"] == len(frame.spoken_text)
+        assert frame.progress["value"] == 2  # both words
+        assert frame.progress["maximum"] == 2
 
 
 class TestMainFrameTextProcessing:
@@ -267,6 +350,37 @@ class TestMainFrameTextProcessing:
         assert "\n" not in frame.spoken_text.rstrip()
         assert "Hello World" in frame.spoken_text
 
+    @patch('Frames.MainFrame.threading.Thread')
+    def test_speak_leaves_the_pasted_text_untouched(self, mock_thread, frame):
+        """The widget keeps the original multi-line text; only spoken_text is normalized."""
+        # Arrange
+        mock_thread.return_value.daemon = True
+        mock_thread.return_value.start = Mock()
+        frame.text_area.insert(END, "Hello\nhttps://example.com World")
+
+        # Act
+        frame.speak(None)
+
+        # Assert
+        assert frame.text_area.get("1.0", "end-1c") == "Hello\nhttps://example.com World"
+
+    @patch('Frames.MainFrame.threading.Thread')
+    def test_highlight_maps_into_the_original_lines(self, mock_thread, frame):
+        """Word highlighting uses line.col indices into the unmodified text."""
+        # Arrange
+        mock_thread.return_value.daemon = True
+        mock_thread.return_value.start = Mock()
+        frame.text_area.insert(END, "Hello\nWorld")
+        frame.speak(None)
+
+        # Act
+        frame.onStartWord(frame.speech_session_id, 6, 5)
+        frame.word_renderer.flush()
+
+        # Assert
+        assert frame.highlight_index1 == "2.0"
+        assert frame.highlight_index2 == "2.5"
+
     @patch('Frames.MainFrame.threading.Thread')
     def test_speak_uses_speed_from_entry(self, mock_thread, frame):
         """Speech should use the speed value from the entry field."""
@@ -449,6 +563,21 @@ class TestMainFramePasteAndSpeak:
         # Assert
         assert "Clipboard text" in frame.text_area.get("1.0", END)
 
+    @patch('Frames.MainFrame.threading.Thread')
+    def test_paste_and_speak_drops_waiting_agent_speech(self, mock_thread, app, frame):
+        """Ctrl+B also cancels agent utterances still waiting their turn."""
+        # Arrange
+        mock_thread.return_value.start = Mock()
+        frame.speak_service.flush = Mock()
+        app.clipboard_clear()
+        app.clipboard_append("Clipboard text")
+
+        # Act
+        frame.paste_and_speak(None)
+
+        # Assert
+        frame.speak_service.flush.assert_called_once_with()
+
     def test_paste_and_speak_bound_to_key_release_not_key_press(self, frame):
         """Ctrl+B must fire on key RELEASE, not press, so holding it down does
         not auto-repeat into a storm of interrupting speech sessions."""
@@ -799,4 +928,409 @@ class TestMainFrameMediaControl:
         result = frame._is_media_playing()
 
         # Assert
-        assert result is False
\ No newline at end of file
+        assert result is False
+
+class TestMainFrameChunkedReading:
+    """Tests for feeding long documents to the engine chunk by chunk."""
+
+    def test_speak_on_thread_feeds_chunks_with_session_name(self, frame):
+        """Each chunk is spoken separately, tagged with the session id."""
+        # Arrange
+        frame.speech.speak = Mock()
+        frame.speech_session_id = 3
+        text = "First sentence here. " * 60
+
+        # Act
+        frame.speak_on_thread(500, text, name=3)
+
+        # Assert
+        calls = frame.speech.speak.call_args_list
+        assert len(calls) > 1
+        assert "".join(c[0][0] for c in calls).split() == text.split()
+        assert all(c[1]['name'] == 3 for c in calls)
+        assert frame.more_chunks is False
+
+    def test_speak_on_thread_only_interrupts_with_first_chunk(self, frame):
+        """Only the first chunk flushes the queue; later chunks just queue."""
+        # Arrange
+        frame.speech.speak = Mock()
+        frame.speech_session_id = 1
+
+        # Act
+        frame.speak_on_thread(500, "Sentence. " * 200, interrupt=True, name=1)
+
+        # Assert
+        interrupts = [c[1]['interrupt'] for c in frame.speech.speak.call_args_list]
+        assert interrupts[0] is True
+        assert not any(interrupts[1:])
+
+    def test_speak_on_thread_stops_feeding_after_stop_requested(self, frame):
+        """A stop between chunks prevents the rest of the document from queueing."""
+        # Arrange
+        frame.speech_session_id = 1
+
+        def speak(*args, **kwargs):
+            frame.stop_requested = True
+        frame.speech.speak = Mock(side_effect=speak)
+
+        # Act
+        frame.speak_on_thread(500, "Sentence. " * 200, name=1)
+
+        # Assert
+        frame.speech.speak.assert_called_once()
+
+    def test_on_start_word_offsets_by_current_chunk(self, frame):
+        """Chunk-relative word offsets map back into the whole document."""
+        # Arrange
+        frame.spoken_text = "Hello World Test"
+        frame.text_area.insert(END, frame.spoken_text)
+        frame.chunk_offset = 6
+
+        # Act
+        frame.onStartWord("test", 0, 5)
+        frame.word_renderer.flush()
+
+        # Assert
+        assert frame.current_word_label['text'] == "World"
+        assert frame.progress["value"] == 6
+
+    def test_speak_on_thread_queues_the_next_chunk_before_waiting(self, frame):
+        """The next chunk is queued while the previous one is still playing."""
+        # Arrange
+        frame.speech_session_id = 1
+        events = []
+        handle = Mock()
+        handle.wait.side_effect = lambda timeout=None: events.append("wait")
+
+        def speak(text, *args, **kwargs):
+            events.append(("speak", kwargs['context']))
+            return handle
+        frame.speech.speak = Mock(side_effect=speak)
+
+        # Act
+        frame.speak_on_thread(500, "Sentence. " * 200, name=1)
+
+        # Assert
+        assert events[:3] == [("speak", (0, True)), ("speak", events[1][1]), "wait"]
+        assert all(not c[1]['block'] for c in frame.speech.speak.call_args_list)
+        assert events[-2][1][1] is False and events[-1] == "wait"
+
+    def test_on_start_takes_chunk_offset_from_the_utterance(self, frame):
+        """A pipelined chunk's offset arrives with its own started callback."""
+        # Arrange
+        frame.current_session_id = frame.speech_session_id = 1
+        frame.speech.current = Mock(context=(120, False))
+
+        # Act
+        frame.onStart(1)
+
+        # Assert
+        assert frame.chunk_offset == 120
+        assert frame.more_chunks is False
+
+    def test_stop_cancels_this_readings_queued_chunks(self, frame):
+        """Stop drops the look-ahead chunk instead of letting it play."""
+        # Arrange
+        frame.speech_session_id = 2
+        frame.stop_button['state'] = NORMAL
+        frame.speech.cancel_named = Mock(return_value=2)
+        frame.speech.stop = Mock()
+
+        # Act
+        frame.stop(None)
+
+        # Assert
+        frame.speech.cancel_named.assert_called_once_with(2)
+        frame.speech.stop.assert_not_called()
+
+    def test_speak_on_thread_prefetches_the_next_chunks(self, frame):
+        """Upcoming chunks are handed to the engine to render ahead."""
+        # Arrange
+        frame.speech_session_id = 1
+        frame.look_ahead = 2
+        events = []
+        frame.speech.prefetch = Mock(side_effect=lambda text, rate: events.append(("prefetch", text)))
+        frame.speech.speak = Mock(side_effect=lambda text, *a, **k: events.append(("speak", text)))
+
+        # Act
+        frame.speak_on_thread(500, "Sentence. " * 200, name=1)
+
+        # Assert
+        spoken = [text for kind, text in events if kind == "speak"]
+        assert [text for kind, text in events if kind == "prefetch"] == spoken
+        assert [kind for kind, _ in events[:4]] == ["prefetch"] * 3 + ["speak"]
+
+    def test_force_stop_and_reset_discards_prefetched_chunks(self, frame):
+        """Chunks rendered ahead for the old position are dropped."""
+        # Arrange
+        frame.speech.discard_prefetched = Mock()
+
+        # Act
+        frame.force_stop_and_reset()
+
+        # Assert
+        frame.speech.discard_prefetched.assert_called_once_with()
+
+    def test_on_end_at_chunk_boundary_keeps_speaking_state(self, frame):
+        """A completed chunk with more to come must not reset the buttons."""
+        # Arrange
+        frame.current_session_id = 1
+        frame.speech_session_id = 1
+        frame.onStart(1)
+        frame.more_chunks = True
+
+        # Act
+        frame.onEnd(1, True)
+
+        # Assert
+        assert frame.is_speaking is True
+        assert str(frame.stop_button['state']) == NORMAL
+
+    def test_read_document_on_thread_shows_and_speaks_each_chunk(self, frame, tmp_path):
+        """A streamed document is shown and spoken one chunk at a time."""
+        # Arrange
+        from Core.document_loader import open_document
+        path = tmp_path / "book.txt"
+        path.write_text("Paragraph one.\n\n" + "Second paragraph words. " * 60)
+        document = open_document(str(path))
+        frame.document = document
+        frame.speech_session_id = 2
+        frame.ui_events.put = lambda callback, *args: callback(*args)
+        shown = []
+        frame.speech.speak = Mock(
+            side_effect=lambda *a, **k: shown.append(frame.text_area.get("1.0", END).strip()))
+
+        # Act
+        frame.read_document_on_thread(document, 500, 2)
+
+        # Assert
+        calls = frame.speech.speak.call_args_list
+        assert len(calls) > 1
+        assert shown[0] == "Paragraph one."
+        assert [c[0][0].strip() for c in calls] == shown
+        assert calls[0][1]['interrupt'] is True and calls[1][1]['interrupt'] is False
+        assert [c[1]['context'][1] for c in calls] == [True] * (len(calls) - 1) + [False]
+        assert frame.more_chunks is False
+
+    def test_words_queued_before_the_next_document_chunk_are_not_painted_on_it(self, frame):
+        """The next chunk is shown in order with the engine callbacks, dropping stale words."""
+        # Arrange
+        import threading
+        from Core.text_processing import Chunk, normalize_with_offsets
+        frame.current_session_id = frame.speech_session_id = 2
+        frame.spoken_text = "old chunk words"
+        frame.ui_events.put(frame.onStartWord, 2, 4, 5)
+        chunk = Chunk(100, "new text here", False)
+        spoken_text, offset_map = normalize_with_offsets(chunk.text)
+        shown = threading.Event()
+        frame.ui_events.put(frame._show_document_chunk, chunk, spoken_text, offset_map, 0, shown)
+
+        # Act
+        frame.ui_events.drain()
+        frame.word_renderer.flush()
+
+        # Assert
+        assert shown.is_set()
+        assert frame.last_spoken_offset == 0
+        assert frame.current_word_label['text'] == ""
+
+    def test_document_chunk_context_keeps_the_ui_speaking_until_the_last_chunk(self, frame):
+        """onEnd of a chunk with more to come does not tear the UI down."""
+        # Arrange
+        frame.current_session_id = frame.speech_session_id = 2
+        frame.onStart(2, Mock(context=(0, True)))
+
+        # Act
+        frame.onEnd(2, True)
+        speaking_between_chunks = frame.is_speaking
+        frame.onStart(2, Mock(context=(0, False)))
+        frame.onEnd(2, True)
+
+        # Assert
+        assert speaking_between_chunks is True
+        assert frame.is_speaking is False
+
+
+class TestMainFrameFirstWindow:
+    """Tests for speaking a long paste before all of it is prepared."""
+
+    LONG_TEXT = ("A paragraph of several words here. " * 20 + "\n\n") * 30
+
+    @patch('Frames.MainFrame.threading.Thread')
+    def test_speak_prepares_only_the_first_window_of_a_long_text(self, mock_thread, frame):
+        """The first chunks are normalized without waiting for the whole text."""
+        # Arrange
+        from Frames.MainFrame import FIRST_WINDOW_CHARS
+        frame.text_area.insert(END, self.LONG_TEXT)
+
+        # Act
+        frame.speak(None)
+
+        # Assert
+        assert FIRST_WINDOW_CHARS <= len(frame.spoken_text) < len(self.LONG_TEXT) / 2
+        assert frame.preparing is not None
+        cut, future = mock_thread.call_args[1]['args'][-1]
+        assert self.LONG_TEXT[:cut].replace('\n', ' ') == frame.spoken_text
+
+    def test_speak_on_thread_goes_on_into_the_whole_text(self, frame):
+        """After the window, reading continues in the whole text's preparation."""
+        # Arrange
+        from concurrent.futures import Future
+        from Core.document_cache import prepare_text
+        frame.speech.speak = Mock()
+        frame.speech_session_id = 1
+        cut = self.LONG_TEXT.index("\n\n", 5000) + 2
+        future = Future()
+        future.set_result(prepare_text(self.LONG_TEXT))
+
+        # Act
+        frame.speak_on_thread(500, self.LONG_TEXT[:cut].replace('\n', ' '), name=1,
+                              rest=(cut, future))
+
+        # Assert
+        calls = frame.speech.speak.call_args_list
+        assert "".join(c[0][0] for c in calls).split() == self.LONG_TEXT.split()
+        assert [c[1]['context'][1] for c in calls].count(False) == 1
+        assert calls[-1][1]['context'] == (calls[-1][1]['context'][0], False)
+
+    def test_whole_text_is_swapped_in_on_the_ui_thread(self, frame):
+        """The worker's preparation replaces the window's once the UI thread runs it."""
+        # Arrange
+        from Core.bookmarks import text_key
+        frame.text_area.insert(END, self.LONG_TEXT)
+        text = frame.text_area.get("1.0", END)
+        frame.prepare_window(text[:5000])
+
+        # Act
+        frame._prepare_async(text).result(timeout=10)
+        frame.ui_events.drain()
+
+        # Assert
+        assert frame.spoken_text == text.replace('\n', ' ')
+        assert frame.bookmark_key == text_key(text)
+        assert frame.preparing is None
+
+
+class TestMainFrameBookmarks:
+    """Tests for resuming and seeking within a document."""
+
+    def test_resume_restarts_from_the_saved_word(self, frame):
+        """Resume re-queues only the text after the bookmarked word."""
+        # Arrange
+        frame.text_area.insert(END, "alpha beta gamma delta epsilon")
+        frame.prepare_text_area()
+        frame.last_spoken_offset = frame.spoken_text.index("gamma") + 2
+        frame.save_bookmark()
+        frame.speak_from = Mock()
+
+        # Act
+        frame.resume()
+
+        # Assert
+        frame.speak_from.assert_called_once_with(frame.spoken_text.index("gamma"), interrupt=True)
+
+    def test_seek_to_percent_starts_at_that_word(self, frame):
+        """Seeking maps a percentage to a word start through the word index."""
+        # Arrange
+        frame.text_area.insert(END, " ".join("w{}".format(i) for i in range(100)))
+        frame.prepare_text_area()
+        frame.speak_from = Mock()
+
+        # Act
+        frame.seek_to_percent(50)
+
+        # Assert
+        frame.speak_from.assert_called_once_with(frame.spoken_text.index("w50"), interrupt=True)
+
+    def test_speak_on_thread_starts_at_offset(self, frame):
+        """Only the remainder after ``start`` is fed to the engine."""
+        # Arrange
+        frame.speech.speak = Mock()
+        frame.speech_session_id = 1
+
+        # Act
+        frame.speak_on_thread(500, "One two. Three four.", name=1, start=9)
+
+        # Assert
+        assert frame.speech.speak.call_args[0][0] == "Three four."
+
+    def test_reading_to_the_end_clears_the_bookmark(self, frame):
+        """A completed reading forgets its bookmark so the next starts at the top."""
+        # Arrange
+        frame.text_area.insert(END, "alpha beta gamma")
+        frame.prepare_text_area()
+        frame.last_spoken_offset = 6
+        frame.save_bookmark()
+        frame.current_session_id = frame.speech_session_id = 1
+
+        # Act
+        frame.onEnd(1, True)
+
+        # Assert
+        assert frame.bookmarks.get(frame.bookmark_key) is None
+
+
+class TestMainFrameSearch:
+    """Tests for the Find box and jumping to a hit."""
+
+    def test_search_lists_hits_and_jump_speaks_from_the_word(self, frame):
+        """Hits come from the index; picking one reads on from that word."""
+        # Arrange
+        frame.text_area.insert(END, "alpha beta gamma delta gamma")
+        frame.prepare_text_area()
+        frame.search_index.complete.wait(timeout=5)
+        frame.speak_from = Mock()
+
+        # Act
+        frame.search_var.set("gamma")
+        frame.jump_to_hit(frame.search_hits[1])
+
+        # Assert
+        assert frame.search_results.size() == 2
+        frame.speak_from.assert_called_once_with(frame.spoken_text.rindex("gamma"), interrupt=True)
+        assert frame.text_area.get(frame.highlight_index1, frame.highlight_index2) == "gamma"
+
+
+class TestMainFrameSectionNavigation:
+    """Tests for next/previous section and repeat sentence."""
+
+    def prepare(self, frame):
+        frame.text_area.insert(END, "# One\nFirst part. Still one.\n# Two\nSecond part here with quite a few more words to read through.")
+        frame.prepare_text_area()
+        frame.speak_from = Mock()
+
+    def test_next_section_restarts_at_the_following_heading(self, frame):
+        """Skipping forward starts the next utterance at the heading."""
+        # Arrange
+        self.prepare(frame)
+        frame.last_spoken_offset = frame.spoken_text.index("Still")
+
+        # Act
+        frame.next_section()
+
+        # Assert
+        frame.speak_from.assert_called_once_with(frame.spoken_text.index("Two"), interrupt=True)
+
+    def test_previous_section_goes_to_the_current_heading(self, frame):
+        """Going back from mid-section returns to that section's start."""
+        # Arrange
+        self.prepare(frame)
+        frame.last_spoken_offset = frame.spoken_text.index("through")
+
+        # Act
+        frame.previous_section()
+
+        # Assert
+        frame.speak_from.assert_called_once_with(frame.spoken_text.index("Two"), interrupt=True)
+
+    def test_repeat_sentence_restarts_the_current_sentence(self, frame):
+        """Repeat goes back to the start of the sentence being read."""
+        # Arrange
+        self.prepare(frame)
+        frame.last_spoken_offset = frame.spoken_text.index("one.")
+
+        # Act
+        frame.repeat_sentence()
+
+        # Assert
+        frame.speak_from.assert_called_once_with(frame.spoken_text.index("Still"), interrupt=True)
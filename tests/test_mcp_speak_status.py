@@ -0,0 +1,61 @@
+import asyncio
+import json
+import threading
+
+import mcp_server
+from Core.speak_service import SpeakService
+
+
+class _FakeRegistry:
+    def resolve_for_speak(self, agent=None, voice=None):
+        return None
+
+
+def _build(speak_fn):
+    service = SpeakService(rate=500, speak_fn=speak_fn)
+    server, _, _ = mcp_server.build_mcp(service=service, registry=_FakeRegistry())
+    return server, service
+
+
+def _call(server, tool, arguments):
+    result = asyncio.run(server.call_tool(tool, arguments))
+    content = result[0] if isinstance(result, tuple) else result
+    return content[0].text
+
+
+def _status(server, tool, arguments):
+    return json.loads(_call(server, tool, arguments))
+
+
+def test_speak_without_wait_returns_an_id_before_speaking():
+    release = threading.Event()
+    server, service = _build(lambda *a: release.wait(5))
+
+    message = _call(server, "speak", {"text": "hello", "wait": False})
+
+    utterance_id = int(message.split()[2])
+    assert service.get(utterance_id).state in ("queued", "speaking")
+    release.set()
+
+
+def test_wait_for_returns_the_finished_status():
+    server, service = _build(lambda *a: None)
+    utterance = service.submit("hello")
+
+    status = _status(server, "wait_for", {"utterance_id": utterance.id, "timeout": 5})
+
+    assert status["id"] == utterance.id
+    assert status["state"] == "done"
+    assert status["finished_at"] >= status["started_at"]
+
+
+def test_speak_status_reports_a_queued_utterance():
+    release = threading.Event()
+    server, service = _build(lambda *a: release.wait(5))
+    service.submit("playing")
+    queued = service.submit("waiting")
+
+    status = _status(server, "speak_status", {"utterance_id": queued.id})
+
+    assert status["state"] == "queued" and status["started_at"] is None
+    release.set()
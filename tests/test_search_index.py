@@ -0,0 +1,77 @@
+from Core.search_index import SearchIndex, normalize_term
+
+
+def build(text):
+    index = SearchIndex()
+    index.build([(0, text)])
+    return index
+
+
+def test_single_word_hits_are_in_document_order_with_offsets():
+    text = "The cat sat. A Cat, the CAT!"
+    index = build(text)
+
+    hits = index.search("cat")
+
+    assert [h.offset for h in hits] == [4, 15, 24]
+    assert [h.number for h in hits] == [1, 4, 6]
+    assert index.complete.is_set()
+
+
+def test_phrase_must_be_consecutive():
+    index = build("red fish blue fish red blue fish")
+
+    assert [h.number for h in index.search("blue fish")] == [2, 5]
+    assert [h.number for h in index.search("fish red blue")] == [3]
+    assert index.search("green fish") == []
+
+
+def test_single_word_falls_back_to_prefix():
+    index = build("photosynthesis and photons")
+
+    assert [h.number for h in index.search("photo")] == [0, 2]
+    assert index.search("") == []
+
+
+def test_prefix_hits_stop_at_the_limit_in_document_order():
+    index = build("photon photos photons zebra photograph photon")
+
+    assert [h.number for h in index.search("phot", limit=4)] == [0, 1, 2, 4]
+    assert [h.number for h in index.search("photo", limit=10)] == [0, 1, 2, 4, 5]
+    assert index.search("photonic") == []
+
+
+def test_prefix_search_sees_terms_added_after_the_first_query():
+    index = SearchIndex()
+    index.add("banana band")
+    assert [h.number for h in index.search("ban")] == [0, 1]
+
+    index.add("bandana apple", base=12)
+
+    assert [h.number for h in index.search("ban")] == [0, 1, 2]
+    assert [h.offset for h in index.search("app")] == [20]
+
+
+def test_pieces_keep_their_base_offsets():
+    index = SearchIndex()
+    index.build([(0, "alpha beta"), (1000, "gamma alpha")])
+
+    assert [h.offset for h in index.search("alpha")] == [0, 1006]
+    assert len(index) == 4
+
+
+def test_build_async_reports_completion_and_cancel_stops_it():
+    done = []
+    index = SearchIndex()
+    index.build_async([(0, "one two")], on_complete=done.append).join()
+    assert done == [index]
+
+    cancelled = SearchIndex()
+    cancelled.cancel()
+    cancelled.build_async([(0, "one two")], on_complete=done.append).join()
+    assert len(cancelled) == 0 and done == [index]
+
+
+def test_normalize_term_strips_punctuation_and_case():
+    assert normalize_term("“Hello,”") == "hello"
+    assert normalize_term("e.g.") == "eg"
@@ -0,0 +1,43 @@
+from Core.sections import Section, SectionIndex, find_headings
+
+
+def test_find_headings_markdown_and_chapter_lines():
+    text = "# Title\n\nIntro.\n\n## Part two ##\n\nChapter 12: The End\nA chapter 3 mention.\nBOOK IV\n"
+
+    headings = find_headings(text, base=100)
+
+    assert [(h.title, h.level) for h in headings] == [
+        ("Title", 1), ("Part two", 2), ("Chapter 12: The End", 1), ("BOOK IV", 1)]
+    assert headings[2].offset == 100 + text.index("Chapter 12")
+
+
+def test_find_headings_ignores_long_lines_and_mentions():
+    text = "Chapter 1 " + "x" * 100 + "\nSee chapter 4 for details.\n"
+    assert find_headings(text) == []
+
+
+def make_index():
+    return SectionIndex(Section(offset, "s{}".format(offset), 1) for offset in (0, 100, 500))
+
+
+def test_section_at_and_next_start():
+    index = make_index()
+
+    assert index.section_at(250).offset == 100
+    assert index.next_start(250) == 500
+    assert index.next_start(500) is None
+    assert SectionIndex().section_at(5) is None
+
+
+def test_previous_start_goes_back_a_section_only_near_a_start():
+    index = make_index()
+
+    assert index.previous_start(300) == 100
+    assert index.previous_start(110) == 0
+    assert index.previous_start(5) == 0
+
+
+def test_out_of_order_headings_are_ignored():
+    index = make_index()
+    index.add(Section(100, "again", 2))
+    assert len(index) == 3
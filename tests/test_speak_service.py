@@ -1,6 +1,13 @@
+import threading
+import time
 from unittest.mock import MagicMock
 
+import pytest
+
+from Core.document_cache import DocumentCache
 from Core.speak_service import SpeakService
+from Core.speech_engine import SpeechQueueFull
+from Core.text_processing import NormalizationRule, RuleSet
 
 
 def test_speak_uses_current_rate_and_preprocesses():
@@ -41,3 +48,172 @@ def test_voice_is_passed_through_to_speak_fn():
     service.speak('hi', voice='voice-id-1')
 
     speak_fn.assert_called_once_with('hi', 500, 'voice-id-1')
+
+
+def test_speak_applies_the_services_normalization_rules():
+    speak_fn = MagicMock()
+    rules = RuleSet([NormalizationRule("fence", r"```.*?```", " code. ", flags="s")])
+    service = SpeakService(rate=500, speak_fn=speak_fn, rules=rules)
+
+    service.speak('Run\n```\nmake\n```\nnow')
+
+    speak_fn.assert_called_once_with('Run  code.  now', 500, None)
+
+
+def test_long_texts_are_prepared_through_the_document_cache(tmp_path):
+    speak_fn = MagicMock()
+    cache = DocumentCache(str(tmp_path), min_chars=20)
+    service = SpeakService(rate=500, speak_fn=speak_fn, cache=cache)
+
+    service.speak('short')
+    service.speak('see http://x.y\n' * 5)
+    service.speak('see http://x.y\n' * 5)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert speak_fn.call_args[0][0] == 'see  [URL]  ' * 5
+
+
+def test_submit_returns_before_speech_finishes():
+    release = threading.Event()
+    service = SpeakService(rate=500, speak_fn=lambda *a: release.wait(5))
+
+    utterance = service.submit('hello')
+
+    assert not utterance.finished
+    assert service.get(utterance.id) is utterance
+    release.set()
+    assert utterance.wait(timeout=5)
+    assert utterance.state == 'done'
+    assert utterance.queued_at <= utterance.started_at <= utterance.finished_at
+
+
+def test_submitted_utterances_are_spoken_in_order():
+    spoken = []
+    service = SpeakService(rate=500, speak_fn=lambda text, rate, voice: spoken.append(text),
+                           coalesce_chars=0)
+
+    handles = [service.submit('text {}'.format(i)) for i in range(5)]
+    handles[-1].wait(timeout=5)
+
+    assert spoken == ['text {}'.format(i) for i in range(5)]
+
+
+def test_cancelled_queued_utterance_is_not_spoken():
+    release = threading.Event()
+    spoken = []
+
+    def speak_fn(text, rate, voice):
+        release.wait(5)
+        spoken.append(text)
+    service = SpeakService(rate=500, speak_fn=speak_fn)
+
+    first = service.submit('first')
+    second = service.submit('second')
+    second.cancel()
+    release.set()
+    first.wait(timeout=5)
+    service.speak('third')
+
+    assert second.state == 'cancelled'
+    assert spoken == ['first', 'third']
+
+
+def test_speak_reraises_a_failure_from_speak_fn():
+    service = SpeakService(rate=500, speak_fn=MagicMock(side_effect=RuntimeError("no audio")))
+
+    with pytest.raises(RuntimeError):
+        service.speak('hello')
+
+
+def test_utterance_stopped_while_playing_ends_cancelled():
+    service = SpeakService(rate=500, speak_fn=lambda text, rate, voice: 'cancelled')
+
+    utterance = service.submit('hello')
+
+    assert utterance.wait(timeout=5)
+    assert utterance.state == 'cancelled'
+
+
+def test_failure_from_speak_fn_fails_the_utterance():
+    service = SpeakService(rate=500, speak_fn=MagicMock(side_effect=RuntimeError("no audio")))
+
+    utterance = service.submit('hello')
+
+    assert utterance.wait(timeout=5)
+    assert utterance.state == 'failed' and str(utterance.error) == "no audio"
+
+
+def test_agents_take_turns_instead_of_first_come_first_served():
+    release = threading.Event()
+    spoken = []
+
+    def speak_fn(text, rate, voice):
+        release.wait(5)
+        spoken.append(text)
+    service = SpeakService(rate=500, speak_fn=speak_fn)
+
+    busy = service.submit('busy', agent='chatty')
+    while busy.state != 'speaking':
+        time.sleep(0.001)
+    for i in range(3):
+        service.submit('chatty {} '.format(i) * 100, agent='chatty')
+    service.submit('quiet', agent='quiet')
+    release.set()
+    while len(spoken) < 5:
+        time.sleep(0.001)
+
+    assert spoken[:2] == ['busy', 'quiet']
+
+
+def test_submit_pushes_back_when_an_agents_queue_is_full():
+    release = threading.Event()
+    service = SpeakService(rate=500, speak_fn=lambda *a: release.wait(5), max_queue=1)
+    playing = service.submit('playing', agent='a')
+    while playing.state != 'speaking':
+        time.sleep(0.001)
+    service.submit('waiting', agent='a')
+
+    try:
+        with pytest.raises(SpeechQueueFull):
+            service.submit('one too many', agent='a')
+        service.submit('other agent', agent='b')
+    finally:
+        release.set()
+
+
+def test_flush_cancels_waiting_utterances():
+    release = threading.Event()
+    service = SpeakService(rate=500, speak_fn=lambda *a: release.wait(5))
+    service.submit('playing')
+    waiting = service.submit('waiting')
+
+    service.flush()
+    release.set()
+
+    assert waiting.wait(timeout=1) and waiting.state == 'cancelled'
+
+
+def test_a_burst_waiting_together_is_spoken_in_one_call():
+    release = threading.Event()
+    spoken = []
+    done_after_first_word = []
+
+    def speak_fn(text, rate, voice, on_word=None):
+        release.wait(5)
+        spoken.append(text)
+        if on_word is not None:
+            on_word(len('Running tests. '), len('3'))
+            done_after_first_word.extend(u.state for u in burst)
+    service = SpeakService(rate=500, speak_fn=speak_fn)
+    playing = service.submit('Working', agent='a')
+    while playing.state != 'speaking':
+        time.sleep(0.001)
+
+    burst = [service.submit(text, agent='a') for text in ('Running tests', '3 passed', 'Done.')]
+    release.set()
+    burst[-1].wait(timeout=5)
+
+    assert spoken == ['Working', 'Running tests. 3 passed. Done.']
+    # Each part finishes once its words are spoken, not when the run ends.
+    assert done_after_first_word == ['done', 'speaking', 'speaking']
+    assert all(u.state == 'done' for u in burst)
@@ -1,6 +1,8 @@
+import threading
 from unittest.mock import MagicMock
 
-from Core.speech import speak_blocking
+from Core.speech import EngineWorker, speak_blocking
+from tests.conftest import FakeEngine
 
 
 def test_speak_blocking_initializes_sets_rate_says_and_waits():
@@ -37,3 +39,43 @@ def test_speak_blocking_sets_voice_when_given():
     fake_engine.setProperty.assert_any_call('voice', 'voice-id-1')
     fake_engine.say.assert_called_once_with('hi')
     fake_engine.runAndWait.assert_called_once_with()
+
+
+def test_engine_worker_builds_one_engine_and_reuses_it():
+    engine = FakeEngine()
+    init = MagicMock(return_value=engine)
+    worker = EngineWorker(init=init)
+
+    first = worker('first', 300)
+    worker('second', 500, voice='voice-2')
+
+    init.assert_called_once_with()
+    assert [(s.text, s.rate, s.voice) for s in engine.spoken] == [
+        ('first', 300, None), ('second', 500, 'voice-2')]
+    assert first == 'done'
+    engine.endLoop()
+
+
+def test_engine_worker_creates_nothing_until_first_call():
+    init = MagicMock()
+
+    EngineWorker(init=init)
+
+    init.assert_not_called()
+
+
+def test_engine_worker_serializes_concurrent_callers():
+    engine = FakeEngine(seconds=0.01)
+    init = MagicMock(return_value=engine)
+    worker = EngineWorker(init=init)
+
+    threads = [threading.Thread(target=worker, args=('text {}'.format(i), 300)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    init.assert_called_once_with()
+    spoken = sorted(engine.spoken, key=lambda s: s.started)
+    assert all(a.finished <= b.started for a, b in zip(spoken, spoken[1:]))
+    engine.endLoop()
@@ -1,15 +1,30 @@
+import threading
+import time
 from unittest.mock import MagicMock, call
 
-from Core.speech_engine import SpeechEngine
+import pytest
+
+from Core.speech_engine import (
+    LANE_USER, SpeechEngine, SpeechQueueFull, SpeechScheduler, Utterance, VOICE_SWITCH_SECONDS,
+    merge_utterances)
 
 
 def make_engine():
     fake_engine = MagicMock()
+    # A run loop that ends at once, so ensure_loop returns.
+    fake_engine.iterate.side_effect = RuntimeError('run loop not started')
     init = MagicMock(return_value=fake_engine)
     speech = SpeechEngine(on_start='S', on_word='W', on_end='E', init=init)
     return speech, init, fake_engine
 
 
+def wait_until_started(utterance):
+    """Wait for the loop thread to have issued ``utterance`` and the engine to start it."""
+    while utterance.state == 'queued':
+        time.sleep(0.001)
+    return utterance
+
+
 def test_first_speak_initializes_connects_and_says_without_starting_loop():
     speech, init, fake_engine = make_engine()
 
@@ -61,7 +76,7 @@ def test_ensure_loop_starts_loop_once_without_speaking():
     speech.ensure_loop(500)
 
     init.assert_called_once_with()
-    fake_engine.startLoop.assert_called_once_with()
+    fake_engine.startLoop.assert_called_once_with(False)
     fake_engine.say.assert_not_called()
 
 
@@ -151,20 +166,14 @@ def test_interrupt_speak_stops_current_utterance_before_speaking():
 
 
 def test_flush_cancels_a_queued_speak():
-    # A speak whose flush generation is stale (a flush happened while it was
-    # queued) is dropped instead of speaking. The MCP server never flushes, so
-    # its utterances keep their generation and still play.
+    # A speak not started yet when a flush happens is dropped instead of
+    # speaking. The MCP server never flushes, so its utterances still play.
     speech, init, fake_engine = make_engine()
-    speech.speak('prime', 500, block=False)  # create the engine
-    fake_engine.say.reset_mock()
+    queued = speech.speak('prime', 500, block=False)
 
-    my_generation = speech._flush_generation
     speech.flush()  # simulate Ctrl+B emptying the queue
 
-    # A caller that recorded the pre-flush generation must not speak.
-    with speech._speak_lock:
-        cancelled = speech._flush_generation != my_generation
-    assert cancelled
+    assert queued.state == 'cancelled'
     fake_engine.stop.assert_called_once_with()
 
 
@@ -174,7 +183,6 @@ def test_flush_before_engine_exists_is_safe():
     speech.flush()  # no engine yet
 
     fake_engine.stop.assert_not_called()
-    assert speech._flush_generation == 1
 
 
 def test_non_interrupt_speak_does_not_flush():
@@ -206,3 +214,348 @@ def test_speak_without_name_omits_say_name_argument():
     fake_engine.say.assert_called_once_with('hello')
 
 
+
+
+def test_queued_utterances_play_in_order_with_their_own_properties(fake_engine):
+    speech, engine = fake_engine
+    engine.seconds = 0.01
+
+    first = speech.speak('one', 300, voice='voice-1', block=False)
+    second = speech.speak('two', 400, voice='voice-2', block=False)
+    third = speech.speak('three', 500, block=False, name=4)
+
+    assert third.wait(timeout=5)
+    assert [u.state for u in (first, second, third)] == ['done'] * 3
+    assert [(s.text, s.rate, s.voice, s.name) for s in engine.spoken] == [
+        ('one', 300, 'voice-1', None), ('two', 400, 'voice-2', None), ('three', 500, 'voice-2', 4)]
+
+
+def test_next_utterance_is_issued_from_the_finished_callback(fake_engine):
+    speech, engine = fake_engine
+    engine.seconds = 0.01
+    issuers = []
+    issue = speech._issue
+    speech._issue = lambda u: (issuers.append(threading.current_thread()), issue(u))
+
+    wait_until_started(speech.speak('one', 300, block=False))
+    last = speech.speak('two', 300, block=False)
+    last.wait(timeout=5)
+
+    # Both on the loop thread: the first woken by submit, the second from
+    # the first one's finished callback.
+    assert len(issuers) == 2
+    assert issuers[0] is issuers[1] is not threading.current_thread()
+
+
+def test_blocking_speak_waits_for_the_utterance(fake_engine):
+    speech, engine = fake_engine
+    engine.seconds = 0.01
+
+    utterance = speech.speak('hello', 300)
+
+    assert utterance.finished and utterance.state == 'done'
+    assert [s.text for s in engine.spoken] == ['hello']
+
+
+def test_flush_cancels_queued_utterances_and_wakes_their_waiters(fake_engine):
+    speech, engine = fake_engine
+    engine.seconds = 5
+
+    playing = speech.speak('long', 300, block=False)
+    queued = speech.speak('queued', 300, block=False)
+    speech.flush()
+
+    assert queued.wait(timeout=1) and queued.state == 'cancelled'
+    assert playing.wait(timeout=1) and playing.state == 'cancelled'
+    assert 'queued' not in [s.text for s in engine.spoken]
+
+
+def test_cancel_named_drops_only_that_callers_utterances(fake_engine):
+    speech, engine = fake_engine
+    engine.seconds = 0.05
+
+    wait_until_started(speech.speak('agent', 300, block=False))
+    mine = speech.speak('chunk', 300, block=False, name=3)
+    after = speech.speak('agent again', 300, block=False)
+
+    assert speech.cancel_named(3) == 1
+    assert after.wait(timeout=5)
+    assert mine.state == 'cancelled'
+    assert [s.text for s in engine.spoken] == ['agent', 'agent again']
+
+
+def test_context_is_visible_on_current_from_the_start_callback(fake_engine):
+    speech, engine = fake_engine
+    seen = []
+    engine.connect('started-utterance', lambda name: seen.append(speech.current.context))
+
+    speech.speak('one', 300, block=False, context=0)
+    speech.speak('two', 300, context=4)
+
+    assert seen == [0, 4]
+
+
+def test_submit_returns_a_handle_with_timestamps(fake_engine):
+    speech, engine = fake_engine
+
+    utterance = speech.submit('hello', 300)
+
+    assert utterance.wait(timeout=5)
+    assert utterance.state == 'done'
+    assert utterance.queued_at <= utterance.started_at <= utterance.finished_at
+
+
+def test_result_reports_how_the_utterance_ended(fake_engine):
+    speech, engine = fake_engine
+    engine.seconds = 5
+    failed = Utterance('x', 300)
+    failed._finish('failed', RuntimeError("no audio"))
+
+    playing = speech.submit('long', 300)
+    with pytest.raises(TimeoutError):
+        playing.result(timeout=0)
+    speech.flush()
+
+    engine.seconds = 0
+
+    assert playing.result(timeout=1) == 'cancelled'
+    assert speech.submit('short', 300).result(timeout=5) == 'done'
+    with pytest.raises(RuntimeError):
+        failed.result()
+
+
+def _utterance(text, agent=None, lane=None):
+    return Utterance(text, 300, agent=agent, lane=lane)
+
+
+def test_scheduler_serves_lanes_in_priority_order():
+    scheduler = SpeechScheduler()
+    anonymous = _utterance('anonymous')
+    agent = _utterance('agent', agent='repo-a')
+    user = _utterance('user', lane=LANE_USER)
+    for utterance in (anonymous, agent, user):
+        scheduler.push(utterance)
+
+    assert [scheduler.pop() for _ in range(3)] == [user, agent, anonymous]
+    assert scheduler.pop() is None
+
+
+def test_scheduler_takes_turns_between_agents_by_length():
+    scheduler = SpeechScheduler(quantum=100)
+    for i in range(6):
+        scheduler.push(_utterance('c' * 50, agent='chatty'))
+    for i in range(2):
+        scheduler.push(_utterance('q' * 50, agent='quiet'))
+
+    order = [scheduler.pop().agent for _ in range(8)]
+
+    # Two 50-character utterances per 100-character quantum, alternating.
+    assert order[:4] == ['chatty', 'chatty', 'quiet', 'quiet']
+    assert order[4:] == ['chatty'] * 4
+
+
+def test_scheduler_keeps_each_agents_order():
+    scheduler = SpeechScheduler(quantum=10)
+    texts = ['a{}'.format(i) for i in range(5)]
+    for text in texts:
+        scheduler.push(_utterance(text, agent='a'))
+        scheduler.push(_utterance('b', agent='b'))
+
+    popped = [scheduler.pop() for _ in range(10)]
+
+    assert [u.text for u in popped if u.agent == 'a'] == texts
+
+
+def test_scheduler_rejects_beyond_max_depth_per_agent():
+    scheduler = SpeechScheduler(max_depth=2)
+    scheduler.push(_utterance('one', agent='a'))
+    scheduler.push(_utterance('two', agent='a'))
+
+    with pytest.raises(SpeechQueueFull):
+        scheduler.push(_utterance('three', agent='a'))
+    scheduler.push(_utterance('other', agent='b'))  # other agents are unaffected
+    assert len(scheduler) == 3
+
+
+def test_scheduler_remove_and_clear():
+    scheduler = SpeechScheduler()
+    first, second = _utterance('one', agent='a'), _utterance('two', agent='b')
+    scheduler.push(first)
+    scheduler.push(second)
+
+    assert scheduler.remove(first) and not scheduler.remove(first)
+    assert first not in scheduler and second in scheduler
+    assert scheduler.clear() == [second]
+    assert len(scheduler) == 0
+
+
+def test_user_reading_is_spoken_before_queued_agent_speech(fake_engine):
+    speech, engine = fake_engine
+    engine.seconds = 0.02
+    speech.coalesce_chars = 0
+
+    wait_until_started(speech.speak('playing', 300, block=False, agent='repo-a'))
+    speech.speak('agent', 300, block=False, agent='repo-a')
+    last = speech.speak('user', 300, block=False, lane=LANE_USER)
+    speech.speak('agent', 300, agent='repo-a')
+
+    assert last.finished
+    assert [s.text for s in engine.spoken] == ['playing', 'user', 'agent', 'agent']
+
+
+def test_unchanged_rate_and_voice_are_not_sent_again():
+    speech, init, fake_engine = make_engine()
+
+    speech.speak('one', 300, voice='v1', block=False)
+    speech.speak('two', 300, voice='v1', block=False)
+    speech.speak('three', 400, voice='v2', block=False)
+
+    assert fake_engine.setProperty.call_args_list == [
+        call('rate', 300), call('voice', 'v1'), call('rate', 400), call('voice', 'v2')]
+    assert speech.stats.voice_sets_skipped == 1
+    assert speech.stats.rate_sets_skipped == 1
+    assert speech.stats.voice_switches == 1
+    assert speech.stats.latency_saved > 0
+    assert speech.stats.summary() == (
+        "1 voice switches; 1 voice and 1 rate sets skipped, {:.0f} ms saved".format(
+            VOICE_SWITCH_SECONDS * 1000))
+
+
+def test_scheduler_groups_a_waiting_utterance_in_the_loaded_voice():
+    scheduler = SpeechScheduler(quantum=1000)
+    a1 = Utterance('a1', 300, voice='v1', agent='a')
+    b1 = Utterance('b1', 300, voice='v2', agent='b')
+    c1 = Utterance('c1', 300, voice='v1', agent='c')
+    for utterance in (a1, b1, c1):
+        scheduler.push(utterance)
+
+    assert [scheduler.pop() for _ in range(3)] == [a1, c1, b1]
+    assert scheduler.grouped == 1
+
+
+def test_scheduler_affinity_passes_an_utterance_over_a_bounded_number_of_times():
+    # One two-character utterance per turn, so without affinity a and b alternate.
+    scheduler = SpeechScheduler(quantum=2, affinity_window=2)
+    scheduler.push(Utterance('a0', 300, voice='v1', agent='a'))
+    waiting = Utterance('b0', 300, voice='v2', agent='b')
+    scheduler.push(waiting)
+    for i in range(1, 6):
+        scheduler.push(Utterance('a{}'.format(i), 300, voice='v1', agent='a'))
+
+    order = [scheduler.pop() for _ in range(7)]
+
+    assert order.index(waiting) == 3  # passed over twice, then its turn
+    assert [u.text for u in order if u.agent == 'a'] == ['a{}'.format(i) for i in range(6)]
+
+
+def test_scheduler_affinity_jump_plays_one_utterance_not_a_quantum():
+    # Three 200-character utterances per 600-character quantum: without
+    # affinity b's head plays fourth; each jump may only add one before it.
+    scheduler = SpeechScheduler(quantum=600, affinity_window=2)
+    waiting = Utterance('b' * 200, 300, voice='v2', agent='b')
+    scheduler.push(Utterance('a' * 200, 300, voice='v1', agent='a'))
+    scheduler.push(waiting)
+    for _ in range(20):
+        scheduler.push(Utterance('a' * 200, 300, voice='v1', agent='a'))
+        scheduler.push(Utterance('b' * 200, 300, voice='v2', agent='b'))
+
+    order = [scheduler.pop() for _ in range(len(scheduler))]
+
+    assert order.index(waiting) == 3 + 2
+
+
+def test_scheduler_affinity_keeps_each_agents_share_of_speaking_time():
+    def shares(affinity_window):
+        scheduler = SpeechScheduler(quantum=600, affinity_window=affinity_window)
+        for _ in range(60):
+            scheduler.push(Utterance('l' * 2000, 300, voice='v1', agent='long'))
+            scheduler.push(Utterance('s' * 200, 300, voice='v2', agent='short'))
+        spoken = {'long': 0, 'short': 0}
+        for _ in range(40):
+            utterance = scheduler.pop()
+            spoken[utterance.agent] += len(utterance.text)
+        return spoken
+
+    fair = shares(0)
+    grouped = shares(2)
+
+    assert grouped['long'] <= fair['long'] + 2000  # at most one utterance ahead
+    assert grouped['short'] >= fair['short'] - 2 * 200
+
+
+def test_pop_run_takes_one_agents_following_utterances_in_the_same_voice():
+    scheduler = SpeechScheduler()
+    texts = ['Running tests', '3 passed.', 'Done.']
+    for text in texts:
+        scheduler.push(Utterance(text, 300, voice='v1', agent='a'))
+    scheduler.push(Utterance('Other voice.', 300, voice='v2', agent='a'))
+
+    run = scheduler.pop_run(1000)
+
+    assert [u.text for u in run] == texts
+    assert [u.text for u in scheduler.pop_run(1000)] == ['Other voice.']
+
+
+def test_pop_run_respects_the_size_cap_and_gui_utterances():
+    scheduler = SpeechScheduler()
+    for i in range(4):
+        scheduler.push(Utterance('x' * 40, 300, agent='a'))
+    scheduler.push(Utterance('chunk', 300, name=1, lane=LANE_USER))
+    scheduler.push(Utterance('chunk', 300, name=1, lane=LANE_USER))
+
+    assert len(scheduler.pop_run(1000)) == 1  # the user's chunks are never merged
+    assert len(scheduler.pop_run(1000)) == 1
+    assert len(scheduler.pop_run(100)) == 2
+    assert len(scheduler.pop_run(0)) == 1
+
+
+def test_merge_utterances_joins_parts_as_sentences():
+    parts = [Utterance('Running tests', 300, agent='a'), Utterance('Done.', 300, agent='a')]
+
+    merged = merge_utterances(parts)
+
+    assert merged.text == 'Running tests. Done.'
+    assert merged.part_ends == [len('Running tests'), len(merged.text)]
+    assert merge_utterances(parts[:1]) is parts[0]
+
+
+def test_queued_burst_is_spoken_as_one_say_with_per_part_completion(fake_engine):
+    speech, engine = fake_engine
+    engine.seconds = 0.02
+    engine.char_seconds = 0.001
+
+    wait_until_started(speech.speak('Starting.', 300, block=False, agent='a'))
+    parts = [speech.speak(text, 300, block=False, agent='a')
+             for text in ('Running tests.', '3 passed.', 'Done.')]
+    parts[-1].wait(timeout=5)
+
+    assert [s.text for s in engine.spoken] == ['Starting.', 'Running tests. 3 passed. Done.']
+    assert [p.state for p in parts] == ['done'] * 3
+    assert parts[0].finished_at < parts[1].finished_at < parts[2].finished_at
+
+
+def test_on_word_follows_one_utterance_that_is_never_merged(fake_engine):
+    speech, engine = fake_engine
+    words = []
+
+    wait_until_started(speech.speak('Starting.', 300, block=False, agent='a'))
+    followed = speech.submit('Running tests.', 300, agent='a',
+                              on_word=lambda location, length: words.append((location, length)))
+    speech.speak('Done.', 300, block=False, agent='a').wait(timeout=5)
+
+    assert [s.text for s in engine.spoken] == ['Starting.', 'Running tests.', 'Done.']
+    assert followed.state == 'done'
+    assert words == [(0, 7), (8, 6)]
+
+
+def test_cancelling_a_part_stops_the_merged_say(fake_engine):
+    speech, engine = fake_engine
+    engine.seconds = 0.5
+
+    speech.speak('Starting.', 300, block=False, agent='a')
+    first = speech.speak('One.', 300, block=False, agent='a')
+    second = speech.speak('Two.', 300, block=False, agent='a')
+    speech.flush()
+
+    assert first.wait(timeout=1) and second.wait(timeout=1)
+    assert first.state == second.state == 'cancelled'
@@ -0,0 +1,239 @@
+import os
+import threading
+
+import pytest
+
+from Core.audio import NullSink, read_wav
+from Core.audio_cache import AudioCache
+from Core.speak_service import SpeakService
+from Core.speech import EngineWorker
+from Core.speech_engine import CANCELLED, DONE, SpeechEngine
+from Core.synthesis import RenderedEngine, SynthesisPool, look_ahead
+from tests.conftest import TONE_SAMPLE_RATE, tone_engine
+
+
+class ListSink:
+    """Plays clips instantly, reporting every word; ``hold`` blocks until stopped."""
+
+    def __init__(self, hold=False):
+        self.hold = hold
+        self.played = []
+        self.stopped = threading.Event()
+
+    def play(self, clip, on_word=None, more=False):
+        self.stopped.clear()
+        self.played.append(clip)
+        if self.hold:
+            self.stopped.wait(5)
+            return False
+        for index in range(len(clip.word_frames)):
+            on_word(index)
+        return True
+
+    def flush(self):
+        pass
+
+    def stop(self):
+        self.stopped.set()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = SynthesisPool(workers=2, init=tone_engine)
+    yield pool
+    pool.close()
+
+
+def rendered_speech(pool, sink, words):
+    speech = SpeechEngine(on_word=lambda name, location, length: words.append(location),
+                          init=lambda: RenderedEngine(pool, sink))
+    speech.prime_async(200)
+    speech.get_voices()
+    return speech
+
+
+def test_pool_renders_text_to_a_clip_in_a_worker_process(pool):
+    clip = pool.submit("ab cd", 200).result(timeout=30)
+
+    # The tone engine gives each character 10 ms at 200 WPM.
+    assert clip.sample_rate == TONE_SAMPLE_RATE
+    assert clip.frame_count == 5 * TONE_SAMPLE_RATE // 100
+    assert list(clip.word_starts) == [0, 3]
+    assert os.listdir(pool.directory) == []
+
+
+def test_pool_lists_the_workers_voices(pool):
+    assert pool.voices() == [("voice-1", "Voice One"), ("voice-2", "Voice Two")]
+
+
+def test_render_in_order_yields_clips_in_text_order(pool):
+    texts = ["a" * n for n in (9, 1, 5, 3, 7)]
+
+    clips = list(pool.render_in_order(texts, 200, ahead=3))
+
+    assert [clip.frame_count for clip in clips] == [
+        len(text) * TONE_SAMPLE_RATE // 100 for text in texts]
+
+
+def test_cached_renders_are_served_without_a_worker(tmp_path):
+    pool = SynthesisPool(workers=1, init=tone_engine, cache=AudioCache(str(tmp_path)))
+    try:
+        rendered = pool.submit("Build succeeded", 500).result(timeout=30)
+        pool._executor.shutdown()  # any further render would now raise
+
+        repeat = pool.submit("Build succeeded", 500)
+
+        assert repeat.done()
+        assert repeat.result() == rendered
+        assert (pool.cache.misses, pool.cache.hits) == (1, 1)
+    finally:
+        pool.close()
+
+
+def test_submit_picks_up_a_prefetched_render(pool):
+    assert pool.prefetch("next chunk", 300, "voice-1")
+
+    future = pool._ahead[("next chunk", 300, "voice-1")]
+
+    assert pool.submit("next chunk", 300, "voice-1") is future
+    assert pool._ahead == {}
+    assert pool.submit("next chunk", 300, "voice-2") is not future
+
+
+def test_discard_prefetched_cancels_renders_not_yet_submitted(pool):
+    for i in range(3):
+        pool.prefetch("chunk {}".format(i), 300)
+
+    assert pool.discard_prefetched() == 3
+    assert pool._ahead == {}
+
+
+def test_prefetch_stops_at_the_memory_budget(pool):
+    pool.ahead_bytes = 1
+    try:
+        assert pool.prefetch("first", 300)
+        pool._ahead[("first", 300, None)].result(timeout=30)
+
+        assert not pool.prefetch("second", 300)
+    finally:
+        pool.ahead_bytes = 64 * 1024 * 1024
+        pool.discard_prefetched()
+
+
+def test_look_ahead_prefetches_count_items_early():
+    events = []
+
+    for item in look_ahead(range(5), 2, lambda item: events.append(("prefetch", item))):
+        events.append(("yield", item))
+
+    assert events[:4] == [("prefetch", 0), ("prefetch", 1), ("prefetch", 2), ("yield", 0)]
+    assert events.index(("prefetch", 4)) < events.index(("yield", 2))
+    assert [item for kind, item in events if kind == "yield"] == [0, 1, 2, 3, 4]
+
+
+def test_speech_engine_prefetch_only_reaches_engines_that_render_ahead(pool, fake_engine):
+    speech, _ = fake_engine
+    assert speech.prefetch("soon", 300) is False
+    rendered = rendered_speech(pool, ListSink(), [])
+    rendered.set_voice("voice-2")
+
+    assert rendered.prefetch("soon", 300)
+
+    assert ("soon", 300, "voice-2") in pool._ahead
+    rendered.discard_prefetched()
+    assert pool._ahead == {}
+    rendered.engine.endLoop()
+
+
+def test_rates_above_the_native_maximum_are_time_stretched():
+    pool = SynthesisPool(workers=1, init=tone_engine, max_native_rate=200)
+    text = "stretch this sentence " * 4
+    try:
+        native = pool.submit(text, 200).result(timeout=30)
+        faster = pool.submit(text, 400).result(timeout=30)
+    finally:
+        pool.close()
+
+    assert abs(faster.frame_count - native.frame_count / 2) <= 1
+    assert list(faster.word_starts) == list(native.word_starts)
+    assert faster.word_frames[-1] < native.word_frames[-1]
+
+
+def test_long_pauses_are_compressed_in_the_worker():
+    pool = SynthesisPool(workers=1, init=tone_engine, max_pause=0.1)
+    text = "go" + " " * 50 + "on"
+    try:
+        clip = pool.submit(text, 200).result(timeout=30)
+    finally:
+        pool.close()
+
+    # 54 characters of 10 ms, of which 50 are a pause cut from 0.5 s to 0.1 s.
+    assert clip.frame_count == (54 - 40) * TONE_SAMPLE_RATE // 100
+    assert clip.word_frames[1] == 12 * TONE_SAMPLE_RATE // 100
+
+
+def test_speak_service_rate_reaches_the_stretched_render():
+    pool = SynthesisPool(workers=1, init=tone_engine, max_native_rate=200)
+    sink = ListSink()
+    service = SpeakService(rate=800, speak_fn=EngineWorker(init=lambda: RenderedEngine(pool, sink)))
+    try:
+        service.speak("agents hear the same speed")
+    finally:
+        pool.close()
+
+    native_frames = len("agents hear the same speed") * TONE_SAMPLE_RATE // 100
+    assert abs(sink.played[0].frame_count - native_frames / 4) <= 1
+
+
+def test_rendered_engine_plays_says_in_order_with_their_own_rate(pool):
+    sink = ListSink()
+    words = []
+    speech = rendered_speech(pool, sink, words)
+
+    first = speech.speak("one two", 200, block=False)
+    second = speech.speak("three", 400, block=False)
+    second.wait(timeout=30)
+
+    assert (first.state, second.state) == (DONE, DONE)
+    assert [clip.frame_count for clip in sink.played] == [
+        7 * TONE_SAMPLE_RATE // 100, 5 * TONE_SAMPLE_RATE // 200]
+    assert words == [0, 4, 0]
+    speech.engine.endLoop()
+
+
+def test_rendered_engine_flush_stops_playback_and_drops_queued_renders(pool):
+    sink = ListSink(hold=True)
+    speech = rendered_speech(pool, sink, [])
+    playing = speech.speak("first", 200, block=False)
+    queued = [speech.speak("later", 200, block=False) for _ in range(3)]
+    while not sink.played:
+        sink.stopped.wait(0.01)
+
+    speech.flush()
+
+    assert playing.wait(timeout=5)
+    assert playing.state == CANCELLED
+    assert all(u.state == CANCELLED for u in queued)
+    assert len(sink.played) == 1
+    speech.engine.endLoop()
+
+
+def test_rendered_engine_streams_utterances_gaplessly(pool, tmp_path):
+    path = str(tmp_path / "reading.wav")
+    sink = NullSink(path)
+    # Two separate utterances, as the reader's chunks are (never merged).
+    speech = SpeechEngine(init=lambda: RenderedEngine(pool, sink), coalesce_chars=0)
+    loop = threading.Thread(target=speech.ensure_loop, args=(200,))
+    loop.start()
+
+    handles = [speech.speak(text, 200, block=False) for text in ("first chunk", "second chunk")]
+    handles[-1].wait(timeout=30)
+    speech.engine.endLoop()
+    loop.join(timeout=30)
+    sink.close()
+
+    # One stream holding both clips, overlapped by one crossfade.
+    fade = int(TONE_SAMPLE_RATE * 0.005)
+    rendered = len("first chunk" + "second chunk") * TONE_SAMPLE_RATE // 100
+    assert sink.opened == 1
+    assert read_wav(path).frame_count == rendered - fade
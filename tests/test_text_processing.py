@@ -1,4 +1,8 @@
-from Core.text_processing import preprocess_text, word_window, highlight_indices
+import pytest
+
+from Core.text_processing import (
+    preprocess_text, normalize_with_offsets, iter_chunks, word_window, highlight_indices,
+    WordIndex, NormalizationRule, RuleSet, iter_stream_chunks, window_end)
 
 
 def test_preprocess_replaces_newlines_with_spaces():
@@ -42,3 +46,206 @@ def test_word_window_respects_read_trail():
 
 def test_highlight_indices_single_line_format():
     assert highlight_indices(4, 5) == ('1.4', '1.9')
+
+
+def test_iter_chunks_offsets_map_back_into_the_document():
+    text = 'One sentence here. Another sentence there! A third one? ' * 20
+    chunks = list(iter_chunks(text, max_chars=80))
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(chunk.text) <= 80
+        assert text[chunk.start:chunk.end] == chunk.text
+
+
+def test_iter_chunks_prefers_sentence_ends():
+    chunks = list(iter_chunks('First one. Second one. Third one here.', max_chars=25))
+    assert chunks[0].text == 'First one. Second one. '
+
+
+def test_iter_chunks_breaks_at_paragraphs():
+    chunks = list(iter_chunks('Para one\n\nPara two', max_chars=100))
+    assert [c.text for c in chunks] == ['Para one', 'Para two']
+    assert chunks[1].start == 10
+
+
+def test_iter_chunks_falls_back_to_whitespace_then_hard_cut():
+    assert [c.text for c in iter_chunks('aaaa bbbb cccc', max_chars=10)] == ['aaaa bbbb', 'cccc']
+    assert [c.text for c in iter_chunks('abcdefghij', max_chars=4)] == ['abcd', 'efgh', 'ij']
+
+
+def test_iter_chunks_marks_only_the_final_chunk_last():
+    chunks = list(iter_chunks('One. Two. Three.   ', max_chars=6))
+    assert [c.last for c in chunks] == [False, False, True]
+
+
+def test_iter_chunks_skips_blank_input():
+    assert list(iter_chunks('  \n\n  ')) == []
+
+
+def test_iter_chunks_is_lazy():
+    chunks = iter_chunks('word ' * 1000000, max_chars=50)
+    first = next(chunks)
+    assert first.start == 0 and len(first.text) <= 50
+
+
+def test_word_index_stores_offsets_in_compact_arrays():
+    index = WordIndex('the quick  brown fox')
+    assert index.starts.typecode == 'I'
+    assert list(index.starts) == [0, 4, 11, 17]
+    assert list(index.ends) == [3, 9, 16, 20]
+    assert len(index) == 4
+
+
+def test_word_index_word_at_engine_offsets():
+    index = WordIndex('the quick brown fox')
+    assert index.word_at(0) == 0
+    assert index.word_at(4) == 1
+    assert index.word_at(6) == 1  # inside 'quick'
+    assert index.word_at(9) == 1  # trailing space belongs to the word before
+    assert index.word_span(2) == (10, 15)
+
+
+def test_word_index_position_reports_progress_in_words():
+    position = WordIndex('one two three four').position(8)
+    assert position.number == 2
+    assert position.total == 4
+    assert position.remaining == 2
+    assert position.percent == 50.0
+
+
+def test_word_index_sentence_span():
+    text = 'First one. Second one here! Third.'
+    index = WordIndex(text)
+    start, end = index.sentence_span(text.index('one here'))
+    assert text[start:end] == 'Second one here! '
+    assert index.sentence_span(0) == (0, 11)
+    assert index.sentence_span(len(text) - 1)[1] == len(text)
+
+
+def test_word_index_of_empty_text():
+    position = WordIndex('').position(0)
+    assert position.total == 0
+    assert position.percent == 0.0
+
+
+def test_normalize_with_offsets_matches_preprocess_text():
+    source = 'line1\nsee http://e.com/x and\nhttps://b.org done'
+    spoken, _ = normalize_with_offsets(source)
+    assert spoken == preprocess_text(source)
+
+
+def test_offset_map_shifts_offsets_after_a_replacement():
+    source = 'go http://example.com/page now'
+    spoken, offsets = normalize_with_offsets(source)
+    at = spoken.index('now')
+    assert source[offsets.to_source(at):offsets.to_source_end(at + 3)] == 'now'
+
+
+def test_offset_map_snaps_placeholder_to_the_whole_url():
+    source = 'go http://example.com/page now'
+    spoken, offsets = normalize_with_offsets(source)
+    at = spoken.index('[URL]')
+    assert source[offsets.to_source(at):offsets.to_source_end(at + 5)] == 'http://example.com/page'
+
+
+def test_offset_map_only_records_length_changes():
+    _, offsets = normalize_with_offsets('a\nb\nc ' * 100)
+    assert len(offsets.spoken_starts) == 1
+
+
+def test_highlight_indices_map_back_to_multi_line_source():
+    source = 'first line\nsecond http://x.io line\nthird'
+    spoken, offsets = normalize_with_offsets(source)
+    assert highlight_indices(spoken.index('second'), 6, offsets) == ('2.0', '2.6')
+    assert highlight_indices(spoken.index('third'), 5, offsets) == ('3.0', '3.5')
+    assert highlight_indices(spoken.index('line', 12), 4, offsets) == ('2.19', '2.23')
+
+
+def test_rule_set_applies_rules_in_one_pass():
+    rules = RuleSet([
+        NormalizationRule("hash", r"\b[0-9a-f]{7,}\b", " [hash] "),
+        NormalizationRule("bold", r"\*\*", ""),
+    ])
+    assert rules.apply('**fixed** in 3f9a2b1c\nok') == 'fixed in  [hash]  ok'
+
+
+def test_rule_set_first_declared_rule_wins_at_a_position():
+    rules = RuleSet([
+        NormalizationRule("specific", r"foo\.py", "the file"),
+        NormalizationRule("generic", r"\w+\.py", "a file"),
+    ])
+    assert rules.apply('foo.py bar.py') == 'the file a file'
+
+
+def test_rule_set_expands_group_references_and_scoped_flags():
+    rules = RuleSet([
+        NormalizationRule("code", r"`([^`]+)`", r"\1"),
+        NormalizationRule("heading", r"^#+ ", "", flags="m"),
+    ])
+    assert rules.apply('# Title\nuse `pytest` now') == 'Title use pytest now'
+
+
+def test_rule_set_skips_disabled_and_empty_matches():
+    rules = RuleSet([
+        NormalizationRule("stars", r"\**", "X"),
+        NormalizationRule("off", r"word", "nope", enabled=False),
+    ])
+    assert rules.apply('a word **') == 'a word X'
+
+
+def test_rule_set_rejects_invalid_patterns():
+    with pytest.raises(ValueError, match="broken"):
+        RuleSet([NormalizationRule("broken", r"(unclosed", "")])
+
+
+def test_normalize_with_offsets_maps_through_rule_replacements():
+    rules = RuleSet([NormalizationRule("path", r"(?:\w+/)+(\w+\.py)", r"\1")])
+    source = 'edit src/core/text.py today'
+    spoken, offsets = normalize_with_offsets(source, rules)
+    assert spoken == 'edit text.py today'
+    at = spoken.index('today')
+    assert source[offsets.to_source(at):offsets.to_source_end(at + 5)] == 'today'
+    at = spoken.index('text.py')
+    assert source[offsets.to_source(at):offsets.to_source_end(at + 7)] == 'src/core/text.py'
+
+
+def test_iter_stream_chunks_matches_iter_chunks_across_piece_splits():
+    text = 'Some words here. And more\n\nParagraph two has text! ' * 40
+    pieces = [text[i:i + 37] for i in range(0, len(text), 37)]
+    expected = list(iter_chunks(text, max_chars=60))
+    assert list(iter_stream_chunks(pieces, max_chars=60)) == expected
+
+
+def test_offset_map_to_spoken_inverts_to_source():
+    text = 'See http://a.b now\nthen done'
+    spoken, offsets = normalize_with_offsets(text)
+    assert spoken[offsets.to_spoken(text.index('now')):].startswith('now then')
+    # Inside a replaced span: the start of its replacement.
+    assert offsets.to_spoken(text.index('a.b')) == spoken.index(' [URL] ')
+    assert offsets.to_spoken(0) == 0
+
+
+def test_iter_chunks_from_start_offset():
+    text = 'One. Two. Three. Four.'
+    chunks = list(iter_chunks(text, max_chars=10, start=text.index('Three')))
+    assert chunks[0].start == text.index('Three')
+    assert ''.join(c.text for c in chunks).split() == ['Three.', 'Four.']
+
+
+def test_offset_map_to_spoken_when_text_opens_with_a_removal():
+    rules = RuleSet([NormalizationRule("heading", r"^#+ ", "", flags="m")])
+    text = "# One\nbody\n# Two\nend"
+    spoken, offsets = normalize_with_offsets(text, rules)
+    assert offsets.to_spoken(0) == 0
+    assert spoken[offsets.to_spoken(text.index("# Two")):].startswith("Two")
+
+
+def test_window_end_cuts_after_a_paragraph_break():
+    text = 'One two. Three four.\n\nFive six. Seven eight.'
+    assert window_end(text, 15) == text.index('Five')
+    assert window_end(text, 22) == text.index('Seven')
+
+
+def test_window_end_keeps_short_texts_whole():
+    assert window_end('Short text.', 100) == len('Short text.')
+    assert window_end('a' * 50, 10) == 50
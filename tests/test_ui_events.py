@@ -0,0 +1,142 @@
+import threading
+
+from Core.ui_events import IDLE_POLLS, EventQueue
+
+
+class FakeLoop:
+    """Collects scheduled callbacks, with a clock the test moves."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.jobs = []
+
+    def clock(self):
+        return self.now
+
+    def schedule(self, milliseconds, callback):
+        self.jobs.append((milliseconds, callback))
+
+    def run_next(self):
+        _, callback = self.jobs.pop(0)
+        callback()
+
+
+def test_events_run_in_order_with_their_arguments_on_drain():
+    loop, ran = FakeLoop(), []
+    events = EventQueue(loop.schedule, clock=loop.clock)
+
+    events.put(ran.append, "a")
+    events.wrap(lambda name, location: ran.append((name, location)))(name="w", location=3)
+
+    assert ran == []
+    assert events.drain() == 2
+    assert ran == ["a", ("w", 3)]
+
+
+def test_polling_runs_batches_and_comes_back_at_once_for_a_backlog():
+    loop, ran = FakeLoop(), []
+    events = EventQueue(loop.schedule, poll_ms=10, batch=3, clock=loop.clock)
+    for index in range(5):
+        events.put(ran.append, index)
+
+    events.start()
+    loop.run_next()
+    first_batch, next_poll = list(ran), loop.jobs[0][0]
+    loop.run_next()
+
+    assert first_batch == [0, 1, 2] and next_poll == 0
+    assert ran == [0, 1, 2, 3, 4] and loop.jobs[0][0] == 10
+    assert events.max_batch == 3
+
+
+def test_put_only_queues_and_polling_stays_on_the_ui_loop():
+    scheduled_from = []
+    events = EventQueue(lambda milliseconds, callback: scheduled_from.append(
+        threading.current_thread()))
+    events.start()
+
+    thread = threading.Thread(target=lambda: [events.put(print) for _ in range(3)])
+    thread.start()
+    thread.join()
+
+    assert scheduled_from == [threading.current_thread()]
+    assert len(events) == 3
+
+
+def test_an_idle_queue_is_polled_less_often_until_an_event_arrives():
+    loop, ran = FakeLoop(), []
+    events = EventQueue(loop.schedule, poll_ms=10, idle_poll_ms=100, clock=loop.clock)
+    events.start()
+    delays = []
+    for _ in range(IDLE_POLLS + 1):
+        loop.run_next()
+        delays.append(loop.jobs[0][0])
+
+    events.put(ran.append, "a")
+    loop.run_next()
+
+    assert delays[:IDLE_POLLS - 1] == [10] * (IDLE_POLLS - 1)
+    assert delays[IDLE_POLLS - 1:] == [100, 100]
+    assert ran == ["a"] and loop.jobs == [(10, events._poll)]
+
+
+def test_stop_ends_polling():
+    loop, ran = FakeLoop(), []
+    events = EventQueue(loop.schedule, clock=loop.clock)
+    events.start()
+    events.put(ran.append, "a")
+
+    events.stop()
+    loop.run_next()
+
+    assert ran == [] and loop.jobs == []
+
+
+def test_latency_is_measured_from_put_to_run():
+    loop = FakeLoop()
+    events = EventQueue(loop.schedule, clock=loop.clock)
+    events.put(lambda: None)
+    loop.now = 0.004
+    events.put(lambda: None)
+    loop.now = 0.010
+
+    events.drain()
+
+    assert events.summary() == "2 events, latency 8.0 ms avg, 10.0 ms max; up to 2 per batch"
+
+
+def test_a_failing_handler_does_not_stop_the_rest(caplog):
+    loop, ran = FakeLoop(), []
+    events = EventQueue(loop.schedule, clock=loop.clock)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    events.put(fail)
+    events.put(ran.append, "after")
+    events.drain()
+
+    assert ran == ["after"]
+    assert "fail" in caplog.records[0].getMessage()
+    assert "boom" in caplog.text  # with the traceback
+
+
+def test_puts_from_many_threads_are_all_delivered():
+    loop, ran = FakeLoop(), []
+    events = EventQueue(loop.schedule)
+
+    def produce(thread):
+        for index in range(1000):
+            events.put(ran.append, (thread, index))
+
+    threads = [threading.Thread(target=produce, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    while events.drain():
+        pass
+
+    assert len(ran) == 4000
+    for thread in range(4):
+        assert [index for owner, index in ran if owner == thread] == list(range(1000))